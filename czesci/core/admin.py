@@ -1,3 +1,16 @@
 from django.contrib import admin
+from django.utils import timezone
 
-# Register your models here.
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("name", "status", "attempts", "max_attempts", "run_after", "created_at")
+    list_filter = ("status", "name")
+    readonly_fields = ("last_error", "locked_at", "created_at", "updated_at")
+    actions = ("retry_jobs",)
+
+    @admin.action(description="Retry selected jobs")
+    def retry_jobs(self, request, queryset):
+        queryset.update(status=Job.Status.PENDING, attempts=0, run_after=timezone.now(), locked_at=None)
@@ -0,0 +1,79 @@
+"""Small helpers shared by the ``bench_*`` management commands."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Iterable
+
+from django.db import connections
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+
+def percentile(samples: Iterable[float], pct: float) -> float:
+    """Return the *pct* percentile (0-100) of *samples* using nearest-rank."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def measure(fn: Callable[[], object], iterations: int) -> dict:
+    """Call *fn* ``iterations`` times and return latency/CPU statistics in ms."""
+    wall = []
+    cpu_start = time.process_time()
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        wall.append((time.perf_counter() - started) * 1000)
+    cpu_total = (time.process_time() - cpu_start) * 1000
+    return {
+        "iterations": iterations,
+        "p50_ms": percentile(wall, 50),
+        "p99_ms": percentile(wall, 99),
+        "cpu_ms_per_call": cpu_total / iterations if iterations else 0.0,
+    }
+
+
+@contextmanager
+def scratch_databases():
+    """Run the block against freshly migrated test databases, dropped afterwards.
+
+    Benchmarks create accounts in bulk; doing that in a throwaway database
+    means they never collide with or clean up real data. Each run gets its
+    own test database name, so a benchmark never drops the database of a
+    concurrent ``manage.py test`` or of another benchmark.
+    """
+    suffix = f"bench_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+    test_settings = {}
+    for alias in connections:
+        settings_dict = connections[alias].settings_dict
+        test_settings[alias] = dict(settings_dict["TEST"])
+        if settings_dict["TEST"].get("MIRROR"):
+            continue
+        if settings_dict["ENGINE"] == "django.db.backends.sqlite3":
+            name = os.path.join(tempfile.gettempdir(), f"czesci-{suffix}.sqlite3")
+        else:
+            name = f"test_{settings_dict['NAME']}_{suffix}"
+        settings_dict["TEST"]["NAME"] = name
+
+    setup_test_environment()
+    try:
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            yield
+        finally:
+            teardown_databases(old_config, verbosity=0)
+    finally:
+        teardown_test_environment()
+        for alias, test in test_settings.items():
+            connections[alias].settings_dict["TEST"] = test
@@ -0,0 +1,72 @@
+"""Streaming readers for the CSV and JSONL files of the import commands.
+
+A ``.jsonl``/``.ndjson`` file holds one JSON object per line; any other file
+is read as CSV with a header row. Rows are yielded one at a time with their
+line number, so an import never holds the whole file in memory. JSON values
+may be numbers or ``null``; ``cell`` reads any of them as text.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from typing import Callable, Iterator, Tuple
+
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+
+
+def parse_line(line: str) -> dict:
+    """The JSON object on a JSONL *line*; ``ValueError`` when it is not one."""
+    row = json.loads(line)
+    if not isinstance(row, dict):
+        raise ValueError(f"Expected a JSON object, got {type(row).__name__}.")
+    return row
+
+
+def read_rows(path: str, on_error: Callable[[int, str], None] | None = None) -> Iterator[Tuple[int, dict]]:
+    """Yield ``(line_no, row)`` from a CSV or JSONL file without loading it into memory.
+
+    JSONL lines that are not a JSON object are passed to *on_error* and
+    skipped; without *on_error* they raise ``ValueError``.
+    """
+    with open(path, encoding="utf-8", newline="") as fh:
+        if path.endswith(JSONL_SUFFIXES):
+            for line_no, line in enumerate(fh, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = parse_line(line)
+                except ValueError as exc:
+                    if on_error is None:
+                        raise
+                    on_error(line_no, f"Invalid JSON: {exc}")
+                    continue
+                yield line_no, row
+        else:
+            for line_no, row in enumerate(csv.DictReader(fh), start=1):
+                yield line_no, row
+
+
+def read_columns(path: str) -> list[str]:
+    """Column names of a CSV file (its header) or a JSONL file (every key used, in order of appearance).
+
+    For JSONL this is an extra pass over the file, keeping only the set of keys.
+    Lines that are not a JSON object are skipped; ``read_rows`` reports them.
+    """
+    with open(path, encoding="utf-8", newline="") as fh:
+        if path.endswith(JSONL_SUFFIXES):
+            columns: dict[str, None] = {}
+            for line in fh:
+                if line.strip():
+                    try:
+                        columns.update(dict.fromkeys(parse_line(line)))
+                    except ValueError:
+                        continue
+            return list(columns)
+        return next(csv.reader(fh), [])
+
+
+def cell(row: dict, key: str) -> str:
+    """*row*'s *key* as stripped text: ``""`` when missing or null, numbers as written."""
+    value = row.get(key)
+    return "" if value is None else str(value).strip()
@@ -0,0 +1,78 @@
+"""Retrying service transactions that lose a lock race.
+
+SQLite allows one writer at a time. With ``transaction_mode = IMMEDIATE`` a
+writer waits up to the connection ``timeout`` for the lock and only then
+fails with "database is locked". MySQL reports lock-wait timeouts (1205) and
+deadlocks (1213) the same way. Both leave nothing behind, so the whole
+transaction can simply be run again::
+
+    @staticmethod
+    @retry_on_lock
+    @transaction.atomic
+    def create_basic(...):
+        ...
+
+The decorator must sit *outside* ``transaction.atomic``. When the function is
+called inside an outer transaction it is not retried: only the outermost
+transaction can be re-run.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.db import OperationalError, close_old_connections, connection
+
+logger = logging.getLogger(__name__)
+
+MYSQL_LOCK_ERRORS = {1205, 1213}
+
+
+def is_lock_error(exc: OperationalError) -> bool:
+    """Whether *exc* means the transaction lost a lock and may be retried."""
+    code = exc.args[0] if exc.args else None
+    return code in MYSQL_LOCK_ERRORS or "database is locked" in str(exc) or "database table is locked" in str(exc)
+
+
+def retry_on_lock(func):
+    """Re-run *func* up to ``DB_LOCK_RETRIES`` times on lock errors, with jittered backoff."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if connection.in_atomic_block:
+            return func(*args, **kwargs)
+        attempt = 0
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as exc:
+                if attempt >= settings.DB_LOCK_RETRIES or not is_lock_error(exc):
+                    raise
+                delay = settings.DB_LOCK_BACKOFF_SECONDS * 2**attempt * random.uniform(0.5, 1.5)
+                logger.warning("%s: %s, retrying in %.0f ms", func.__qualname__, exc, delay * 1000)
+                time.sleep(delay)
+                attempt += 1
+
+    return wrapper
+
+
+def closing_connections(func):
+    """Release the connections *func* opened once it returns, as ``request_finished`` would.
+
+    For ORM work that async views run with ``sync_to_async(thread_sensitive=False)``:
+    pool threads outlive the request, so without this every thread keeps its own
+    connection open (or, with ``CONN_MAX_AGE``, past its age).
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return wrapper
@@ -0,0 +1,134 @@
+"""Primary/replica routing with read-your-writes stickiness.
+
+``PrimaryReplicaRouter`` sends reads of models in ``REPLICA_READ_APPS`` (login
+lookups, settings fragments, admin list views) to the ``replica`` alias and
+every write to ``default``. It is inactive while no ``replica`` database is
+configured.
+
+Reads stay on the primary when
+
+* they run inside a transaction on the primary, or
+* the current client wrote a routed model less than ``REPLICA_STICKY_SECONDS``
+  ago. ``ReplicaStickinessMiddleware`` remembers that in a cookie, so the
+  pin survives redirects (register → verify phone → profile) and does not
+  write to the session.
+
+Outside a request, wrap each unit of work in ``primary_pin_scope()`` so a
+write pins only that unit; the job worker does so per job. Without a scope
+(a management command's own thread) a write pins the rest of the thread to
+the primary. ``sync_to_async`` runs its function in a copy of the caller's
+context, so a write there pins the calling request, not the pool thread.
+
+Locally, point ``SQLITE_REPLICA_PATH`` at a second file and run
+``manage.py replicate_sqlite --lag 2`` to copy the primary into it with a delay.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_pinned: contextvars.ContextVar[bool] = contextvars.ContextVar("db_pinned_to_primary", default=False)
+_wrote: contextvars.ContextVar[list | None] = contextvars.ContextVar("db_wrote_routed_model", default=None)
+
+
+@contextmanager
+def primary_pin_scope(pinned: bool = False):
+    """Route reads to the replica in the block until a write pins them to the primary.
+
+    Yields the list of routed model labels written in the block. The pin does
+    not outlive the block.
+    """
+    wrote: list[str] = []
+    pinned_token, wrote_token = _pinned.set(pinned), _wrote.set(wrote)
+    try:
+        yield wrote
+    finally:
+        _pinned.reset(pinned_token)
+        _wrote.reset(wrote_token)
+
+
+class PrimaryReplicaRouter:
+    """Reads of ``REPLICA_READ_APPS`` models from the replica, writes to ``default``."""
+
+    def _routed(self, model) -> bool:
+        return (
+            settings.DATABASE_REPLICA_ALIAS in settings.DATABASES
+            and model._meta.app_label in settings.REPLICA_READ_APPS
+        )
+
+    def db_for_read(self, model, **hints):
+        if not self._routed(model):
+            return None
+        if _pinned.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return settings.DATABASE_REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if not self._routed(model):
+            return None
+        wrote = _wrote.get()
+        if wrote is not None:
+            wrote.append(model._meta.label)
+        # Later reads in this request must see the write as well.
+        _pinned.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, settings.DATABASE_REPLICA_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives the schema through replication, never by migrating.
+        if db == settings.DATABASE_REPLICA_ALIAS:
+            return False
+        return None
+
+
+class ReplicaStickinessMiddleware:
+    """Pin a client's reads to the primary for a while after it wrote."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with primary_pin_scope(self.pinned(request)) as wrote:
+            return self.finish(self.get_response(request), wrote)
+
+    async def __acall__(self, request):
+        with primary_pin_scope(self.pinned(request)) as wrote:
+            return self.finish(await self.get_response(request), wrote)
+
+    @staticmethod
+    def pinned(request) -> bool:
+        try:
+            pinned_until = float(request.COOKIES.get(settings.REPLICA_STICKY_COOKIE, 0))
+        except ValueError:
+            pinned_until = 0
+        return pinned_until > time.time()
+
+    @staticmethod
+    def finish(response, wrote: list[str]):
+        if wrote:
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE,
+                str(int(time.time()) + settings.REPLICA_STICKY_SECONDS),
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -0,0 +1,245 @@
+"""Per-request SQL and template instrumentation.
+
+``RequestInstrumentationMiddleware`` records, for every request:
+
+* number of SQL queries and total time spent in the database,
+* duplicate ``SELECT`` queries (same SQL after collapsing ``IN (...)`` lists),
+  by fingerprint — the usual N+1 signature,
+* time spent rendering templates (outermost rendering only, so
+  ``{% include %}`` is not counted twice). Templates are timed by the
+  ``core.instrumentation.DjangoTemplates`` backend, configured in
+  ``TEMPLATES``, and blocks rendered by ``core.rendering`` by
+  ``timed_rendering``.
+
+The numbers are logged as one ``core.instrumentation`` line per request and,
+when ``SERVER_TIMING_ENABLED`` is set, returned in a ``Server-Timing`` header so
+they show up in the browser devtools, HTMX fragment swaps included.
+
+``QUERY_BUDGETS`` maps a view (dotted path or URL name) to its maximum number of
+queries. Going over budget logs a warning, or raises ``QueryBudgetExceeded``
+when ``QUERY_BUDGET_STRICT`` is on (tests and ``manage.py benchmark``).
+
+Queries are attributed through a context variable rather than a per-connection
+wrapper so that queries issued from ``sync_to_async`` threads of async views are
+counted as well.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.template import TemplateDoesNotExist
+from django.template.backends import django as django_backend
+
+logger = logging.getLogger(__name__)
+
+_current: contextvars.ContextVar[RequestMetrics | None] = contextvars.ContextVar(
+    "request_metrics", default=None
+)
+
+IN_LIST_RE = re.compile(r"\((?:%s|\?)(?:,\s*(?:%s|\?))*\)")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view executed more queries than allowed by ``QUERY_BUDGETS``."""
+
+
+def fingerprint(sql: str) -> str:
+    """Short stable id of *sql* with ``IN (%s, %s, …)`` lists collapsed."""
+    normalized = IN_LIST_RE.sub("(...)", sql)
+    return hashlib.blake2b(normalized.encode(), digest_size=4).hexdigest()
+
+
+class RequestMetrics:
+    """Counters collected while a single request is processed."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+        self.template_depth = 0
+        self.fingerprints: Counter[str] = Counter()
+        self.statements: dict[str, str] = {}
+
+    @property
+    def duplicates(self) -> dict[str, int]:
+        return {fp: count for fp, count in self.fingerprints.items() if count > 1}
+
+    @property
+    def total_seconds(self) -> float:
+        return time.perf_counter() - self.started
+
+    def record_query(self, sql: str, seconds: float) -> None:
+        self.sql_count += 1
+        self.sql_seconds += seconds
+        if sql.lstrip()[:6].upper() == "SELECT":
+            fp = fingerprint(sql)
+            self.fingerprints[fp] += 1
+            self.statements.setdefault(fp, sql)
+
+
+# ---------------------------------------------------
+# Hooks
+# ---------------------------------------------------
+
+
+def _query_wrapper(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record_query(sql, time.perf_counter() - started)
+
+
+def _install_query_wrapper(sender, connection, **kwargs):  # pylint: disable=unused-argument
+    if _query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_query_wrapper)
+
+
+@contextmanager
+def timed_rendering():
+    """Count the enclosed template rendering in the current request's template time."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    metrics.template_depth += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.template_depth -= 1
+        if metrics.template_depth == 0:
+            metrics.template_seconds += time.perf_counter() - started
+
+
+class TimedTemplate(django_backend.Template):
+    def render(self, context=None, request=None):
+        with timed_rendering():
+            return super().render(context, request)
+
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    """The Django template backend with rendering time recorded per request."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            django_backend.reraise(exc, self)
+
+
+def install() -> None:
+    """Attach the SQL hook; called from ``CoreConfig.ready``."""
+    connection_created.connect(_install_query_wrapper, dispatch_uid="core.instrumentation")
+
+
+# ---------------------------------------------------
+# Middleware
+# ---------------------------------------------------
+
+
+class RequestInstrumentationMiddleware:
+    """Collect ``RequestMetrics`` per request; see module docstring."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _current.set(RequestMetrics())
+        try:
+            response = self.get_response(request)
+            return self.finish(request, response, _current.get())
+        finally:
+            _current.reset(token)
+
+    async def __acall__(self, request):
+        token = _current.set(RequestMetrics())
+        try:
+            response = await self.get_response(request)
+            return self.finish(request, response, _current.get())
+        finally:
+            _current.reset(token)
+
+    @staticmethod
+    def view_names(request) -> list[str]:
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return []
+        view = getattr(match.func, "view_class", match.func)
+        return [match.view_name, f"{view.__module__}.{view.__qualname__}"]
+
+    def finish(self, request, response, metrics: RequestMetrics):
+        views = self.view_names(request)
+        view = views[-1] if views else request.path
+        duplicates = metrics.duplicates
+
+        logger.info(
+            "%s %s view=%s status=%s sql_count=%d sql_ms=%.1f dup_queries=%d tpl_ms=%.1f total_ms=%.1f",
+            request.method,
+            request.path,
+            view,
+            response.status_code,
+            metrics.sql_count,
+            metrics.sql_seconds * 1000,
+            sum(duplicates.values()) - len(duplicates),
+            metrics.template_seconds * 1000,
+            metrics.total_seconds * 1000,
+            extra={
+                "view": view,
+                "status": response.status_code,
+                "sql_count": metrics.sql_count,
+                "sql_ms": round(metrics.sql_seconds * 1000, 2),
+                "duplicates": duplicates,
+                "template_ms": round(metrics.template_seconds * 1000, 2),
+                "total_ms": round(metrics.total_seconds * 1000, 2),
+            },
+        )
+        for fp, count in duplicates.items():
+            logger.debug("Duplicate query %s ran %d times: %s", fp, count, metrics.statements[fp])
+
+        if settings.SERVER_TIMING_ENABLED:
+            response["Server-Timing"] = ", ".join(
+                [
+                    f'sql;dur={metrics.sql_seconds * 1000:.1f};desc="{metrics.sql_count} queries"',
+                    f'sqldup;desc="{",".join(f"{fp}x{count}" for fp, count in duplicates.items()) or "none"}"',
+                    f"tpl;dur={metrics.template_seconds * 1000:.1f}",
+                    f"app;dur={metrics.total_seconds * 1000:.1f}",
+                ]
+            )
+
+        self.check_budget(views, view, metrics)
+        return response
+
+    @staticmethod
+    def check_budget(views: list[str], view: str, metrics: RequestMetrics) -> None:
+        budget = next((settings.QUERY_BUDGETS[name] for name in views if name in settings.QUERY_BUDGETS), None)
+        if budget is None or metrics.sql_count <= budget:
+            return
+        message = f"{view} executed {metrics.sql_count} queries (budget {budget})"
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
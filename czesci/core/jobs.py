@@ -0,0 +1,176 @@
+"""Database-backed background jobs (transactional outbox).
+
+Usage::
+
+    # users/tasks.py
+    from core.jobs import job
+
+    @job("users.send_otp_sms")
+    def send_otp_sms(user_id: int, number: str, nonce: str) -> None:
+        ...
+
+    # anywhere inside a transaction
+    enqueue("users.send_otp_sms", user_id=user_id, number=number, nonce=nonce)
+
+``enqueue`` only inserts a ``Job`` row, so it commits or rolls back together
+with the caller's transaction and never performs network I/O inside it.
+Handlers are discovered from each app's ``tasks`` module and executed by
+``manage.py run_jobs``. Functions decorated with ``on_worker_start`` in those
+modules run once when a worker starts, e.g. to load in-memory indexes.
+"""
+
+from __future__ import annotations
+
+import logging
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from core.db_routers import primary_pin_scope
+from core.models import Job
+
+logger = logging.getLogger(__name__)
+
+_registry: dict[str, Callable[..., None]] = {}
+_startup: list[Callable[[], None]] = []
+
+
+def job(name: str):
+    """Register the decorated function as handler for jobs called *name*."""
+
+    def decorator(func):
+        _registry[name] = func
+        return func
+
+    return decorator
+
+
+def on_worker_start(func):
+    """Run the decorated function once when a ``Worker`` starts."""
+    _startup.append(func)
+    return func
+
+
+def enqueue(name: str, *, max_attempts: int | None = None, delay: float = 0, **payload) -> Job:
+    """Insert a pending job; *payload* must be JSON-serializable."""
+    return Job.objects.create(
+        name=name,
+        payload=payload,
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def backoff(attempts: int) -> timedelta:
+    """Delay before retry number *attempts* (exponential)."""
+    return timedelta(seconds=settings.JOBS_BACKOFF_SECONDS * 2 ** (attempts - 1))
+
+
+class Worker:
+    """Poll the ``Job`` table and execute due jobs on a thread pool."""
+
+    def __init__(self, threads: int = 4, batch_size: int | None = None):
+        autodiscover_modules("tasks")
+        for func in _startup:
+            func()
+        self.threads = threads
+        self.batch_size = batch_size or threads * 2
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="job")
+
+    def release_stale(self) -> int:
+        """Put jobs abandoned by a crashed worker back into the queue.
+
+        An abandoned run counts as a failed attempt, so a job that keeps
+        crashing its worker ends up dead instead of being retried forever.
+        """
+        now = timezone.now()
+        cutoff = now - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT_SECONDS)
+        stale = Job.objects.filter(status=Job.Status.RUNNING, locked_at__lt=cutoff)
+        changes = {
+            "attempts": F("attempts") + 1,
+            "locked_at": None,
+            "last_error": "Abandoned: the worker running it did not finish within the lock timeout.",
+            "updated_at": now,
+        }
+        dead = stale.filter(attempts__gte=F("max_attempts") - 1).update(status=Job.Status.DEAD, **changes)
+        if dead:
+            logger.error("%s abandoned jobs moved to dead letter", dead)
+        return dead + stale.update(status=Job.Status.PENDING, run_after=now, **changes)
+
+    def claim(self) -> list[int]:
+        """Atomically mark up to ``batch_size`` due jobs as running and return their ids.
+
+        Claiming is a conditional ``UPDATE`` per row, which works on every backend
+        (SQLite has no ``SKIP LOCKED``) and lets several workers share the table.
+        """
+        now = timezone.now()
+        candidates = Job.objects.filter(status=Job.Status.PENDING, run_after__lte=now).order_by("run_after")
+        claimed = []
+        for pk in candidates.values_list("pk", flat=True)[: self.batch_size]:
+            if Job.objects.filter(pk=pk, status=Job.Status.PENDING).update(
+                status=Job.Status.RUNNING, locked_at=now
+            ):
+                claimed.append(pk)
+        return claimed
+
+    def run_once(self) -> int:
+        """Claim and execute one batch; return the number of jobs processed."""
+        self.release_stale()
+        claimed = self.claim()
+        list(self.executor.map(self.execute, claimed))
+        return len(claimed)
+
+    def execute(self, pk: int) -> None:
+        """Run a single claimed job, then delete it, reschedule it or dead-letter it.
+
+        Errors outside the handler (the row was deleted meanwhile, the database
+        is locked while recording the result) are logged and never reach the
+        worker loop; a job left running is picked up again by ``release_stale``.
+        """
+        close_old_connections()
+        try:
+            with primary_pin_scope():
+                self.run_job(pk)
+        except Job.DoesNotExist:
+            logger.warning("Job #%s disappeared before it ran", pk)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Job #%s could not be run or its result not recorded", pk)
+        finally:
+            close_old_connections()
+
+    def run_job(self, pk: int) -> None:
+        """Run job *pk* and record its result; a routed write pins reads to the primary only for this job."""
+        job_obj = Job.objects.get(pk=pk)
+        handler = _registry.get(job_obj.name)
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job {job_obj.name!r}")
+            handler(**job_obj.payload)
+        except Exception:  # pylint: disable=broad-except
+            self.fail(job_obj, traceback.format_exc(), retry=handler is not None)
+        else:
+            job_obj.delete()
+
+    @staticmethod
+    def fail(job_obj: Job, error: str, retry: bool = True) -> None:
+        job_obj.attempts += 1
+        job_obj.last_error = error
+        job_obj.locked_at = None
+        if retry and job_obj.attempts < job_obj.max_attempts:
+            job_obj.status = Job.Status.PENDING
+            job_obj.run_after = timezone.now() + backoff(job_obj.attempts)
+            logger.warning("Job %s failed (attempt %s), retrying", job_obj, job_obj.attempts)
+        else:
+            job_obj.status = Job.Status.DEAD
+            logger.error("Job %s moved to dead letter after %s attempts", job_obj, job_obj.attempts)
+        job_obj.save(update_fields=["attempts", "last_error", "locked_at", "status", "run_after", "updated_at"])
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,115 @@
+"""Minimal in-process HTTP client for the ASGI application.
+
+Used by ``manage.py loadtest`` to drive ``czesci.asgi.application`` directly,
+without a server or socket in between. Each ``AsgiClient`` is one virtual user
+with its own cookie jar; POSTs send the CSRF cookie back in the ``X-CSRFToken``
+header, as HTMX does.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+
+@dataclass
+class AsgiResponse:
+    status: int = 0
+    headers: list[tuple[bytes, bytes]] = field(default_factory=list)
+    body: bytes = b""
+    elapsed: float = 0.0
+
+    def header(self, name: str) -> str | None:
+        name_bytes = name.lower().encode()
+        for key, value in self.headers:
+            if key.lower() == name_bytes:
+                return value.decode("latin-1")
+        return None
+
+
+class AsgiClient:
+    """One virtual user: cookie jar plus ``get``/``post`` against an ASGI app."""
+
+    def __init__(self, app, host: str = "localhost"):
+        self.app = app
+        self.host = host
+        self.cookies: dict[str, str] = {}
+
+    async def get(self, path: str, htmx: bool = False) -> AsgiResponse:
+        return await self.request("GET", path, htmx=htmx)
+
+    async def post(self, path: str, data: dict | None = None, htmx: bool = False) -> AsgiResponse:
+        return await self.request("POST", path, body=urlencode(data or {}).encode(), htmx=htmx)
+
+    async def request(self, method: str, path: str, body: bytes = b"", htmx: bool = False) -> AsgiResponse:
+        url = urlsplit(path)
+        headers = [(b"host", self.host.encode()), (b"user-agent", b"czesci-loadtest")]
+        if self.cookies:
+            headers.append((b"cookie", "; ".join(f"{k}={v}" for k, v in self.cookies.items()).encode()))
+        if method == "POST":
+            headers.append((b"content-type", b"application/x-www-form-urlencoded"))
+            headers.append((b"content-length", str(len(body)).encode()))
+            if "csrftoken" in self.cookies:
+                headers.append((b"x-csrftoken", self.cookies["csrftoken"].encode()))
+        if htmx:
+            headers.append((b"hx-request", b"true"))
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": url.path,
+            "raw_path": url.path.encode(),
+            "query_string": url.query.encode(),
+            "root_path": "",
+            "headers": headers,
+            "client": ("127.0.0.1", 50000),
+            "server": (self.host, 80),
+        }
+        response = AsgiResponse()
+        finished = asyncio.Event()
+        body_sent = False
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Django listens for a disconnect while the view runs; only report
+            # one once the response is complete.
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        chunks = []
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response.status = message["status"]
+                response.headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body"):
+                    finished.set()
+
+        started = time.perf_counter()
+        await self.app(scope, receive, send)
+        finished.set()
+        response.elapsed = time.perf_counter() - started
+        response.body = b"".join(chunks)
+        self.store_cookies(response)
+        return response
+
+    def store_cookies(self, response: AsgiResponse) -> None:
+        for key, value in response.headers:
+            if key.lower() != b"set-cookie":
+                continue
+            for name, morsel in SimpleCookie(value.decode("latin-1")).items():
+                if morsel["max-age"] == "0" or not morsel.value:
+                    self.cookies.pop(name, None)
+                else:
+                    self.cookies[name] = morsel.value
@@ -0,0 +1,278 @@
+"""End-to-end benchmark of the onboarding, login and settings flows.
+
+Drives the real URL configuration with Django's test client against a fresh
+test database and times every step:
+
+* buyer: register → verify phone → buyer profile → login by phone / by email →
+  settings page → settings fragment → its 304 revalidation →
+  add / verify / deactivate a phone number,
+* seller: register → verify phone → seller profile.
+
+Per step it reports p50/p99 latency, the number of SQL statements (including
+``BEGIN``/``COMMIT``, which the instrumentation middleware does not count) and
+the peak Python memory allocated (``tracemalloc``, measured in a separate pass
+so it does not distort the timings). The query counts are also asserted by
+``users.tests.test_query_counts``, so the test suite catches a regression
+without running the benchmark. ``QUERY_BUDGET_STRICT`` is on, so a view going
+over its ``QUERY_BUDGETS`` entry aborts the run.
+
+Usage::
+
+    manage.py benchmark --output bench/HEAD.json
+    manage.py benchmark --compare bench/main.json --threshold 0.2
+
+``--compare`` exits non-zero when a step got slower than the threshold or runs
+more queries than in the baseline file.
+"""
+
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from unittest import mock
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from core.bench import percentile, scratch_databases
+from users.models import PhoneNumber
+from users.services.otp import OtpStore
+
+OTP = "123456"
+PASSWORD = "bench-Pa55word!"
+
+
+class Command(BaseCommand):
+    help = "Time the registration, login and settings flows end to end and compare against a baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=5, help="Complete flows per role.")
+        parser.add_argument("--output", help="Write results as JSON to this path.")
+        parser.add_argument("--compare", help="Baseline JSON produced by an earlier --output run.")
+        parser.add_argument(
+            "--threshold", type=float, default=0.2, help="Allowed relative p50 slowdown per step (0.2 = 20%%)."
+        )
+        parser.add_argument("--no-allocations", action="store_true", help="Skip the tracemalloc pass.")
+        parser.add_argument(
+            "--hash-iterations",
+            type=int,
+            help="Override PASSWORD_HASH_ITERATIONS, e.g. to keep CI runs short.",
+        )
+
+    def handle(self, *args, **options):
+        self.samples = defaultdict(list)
+        self.queries = {}
+        self.allocations = {}
+
+        overrides = {"QUERY_BUDGET_STRICT": True, "PAGE_CACHE_ENABLED": False}
+        if options["hash_iterations"]:
+            overrides["PASSWORD_HASH_ITERATIONS"] = options["hash_iterations"]
+
+        with scratch_databases(), override_settings(**overrides), mock.patch.object(
+            OtpStore, "derive_code", return_value=OTP
+        ):
+            for index in range(options["iterations"]):
+                self.run_flows(index)
+            if not options["no_allocations"]:
+                tracemalloc.start()
+                try:
+                    self.run_flows(options["iterations"])
+                finally:
+                    tracemalloc.stop()
+
+        results = self.summarize(options)
+        self.report(results["steps"])
+
+        if options["output"]:
+            path = Path(options["output"])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(results, indent=2))
+            self.stdout.write(f"Results written to {path}")
+
+        if options["compare"]:
+            baseline = json.loads(Path(options["compare"]).read_text())
+            regressions = self.compare(baseline["steps"], results["steps"], options["threshold"])
+            if regressions:
+                raise CommandError(f"{len(regressions)} step(s) regressed: {', '.join(regressions)}")
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {options['compare']}"))
+
+    # ---------------------------------------------------
+    # Flows
+    # ---------------------------------------------------
+
+    def step(self, name: str, expected_status: int, request):
+        """Run *request* (a zero-argument callable) and record its metrics under *name*."""
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            response = request()
+            elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code != expected_status:
+            raise CommandError(f"{name}: expected HTTP {expected_status}, got {response.status_code}")
+
+        if tracing:
+            self.allocations[name] = (tracemalloc.get_traced_memory()[1] - before) / 1024
+        else:
+            self.samples[name].append(elapsed)
+            self.queries[name] = len(ctx.captured_queries)
+        return response
+
+    def register(self, client: Client, role: str, phone: str, email: str) -> None:
+        data = {
+            "first_name": "Bench",
+            "last_name": role.title(),
+            "phone": phone,
+            "email": email,
+            "password1": PASSWORD,
+            "password2": PASSWORD,
+            "role": role,
+            "age_confirm": "on",
+            "consent_terms": "on",
+            "consent_privacy": "on",
+        }
+        self.step(f"{role}.register", 302, lambda: client.post(reverse("register"), data))
+        self.step(f"{role}.verify_phone", 302, lambda: client.post(reverse("verify_phone"), {"otp": OTP}))
+
+    def run_flows(self, index: int) -> None:
+        self.buyer_flow(index)
+        self.seller_flow(index)
+
+    def buyer_flow(self, index: int) -> None:
+        client = Client()
+        phone, email = f"+4850{index:07d}", f"bench.buyer{index}@example.com"
+        self.register(client, "buyer", phone, email)
+        self.step(
+            "buyer.register_profile",
+            302,
+            lambda: client.post(reverse("register_buyer"), {"delivery_address": "Benchmark street 1"}),
+        )
+
+        for name, identifier in (("login_phone", phone), ("login_email", email)):
+            client.logout()
+            self.step(
+                name,
+                302,
+                lambda identifier=identifier: client.post(
+                    reverse("login"), {"identifier": identifier, "password": PASSWORD}
+                ),
+            )
+
+        self.step("settings.page", 200, lambda: client.get(reverse("settings")))
+        fragment = self.step("settings.fragment", 200, lambda: client.get(reverse("settings_buyer"), HTTP_HX_REQUEST="true"))
+        self.step(
+            "settings.fragment_304",
+            304,
+            lambda: client.get(reverse("settings_buyer"), HTTP_HX_REQUEST="true", HTTP_IF_NONE_MATCH=fragment["ETag"]),
+        )
+
+        extra = f"+4852{index:07d}"
+        self.step(
+            "settings.phone_add",
+            204,
+            lambda: client.post(
+                reverse("phone_add"), {"number": extra, "profile_type": "buyer"}, HTTP_HX_REQUEST="true"
+            ),
+        )
+        pk = PhoneNumber.objects.values_list("pk", flat=True).get(number=extra)
+        self.step(
+            "settings.phone_verify",
+            204,
+            lambda: client.post(reverse("phone_verify", args=[pk, "buyer"]), {"otp": OTP}, HTTP_HX_REQUEST="true"),
+        )
+        self.step(
+            "settings.phone_deactivate",
+            200,
+            lambda: client.post(reverse("phone_deactivate", args=[pk]), HTTP_HX_REQUEST="true"),
+        )
+
+    def seller_flow(self, index: int) -> None:
+        client = Client()
+        self.register(client, "seller", f"+4851{index:07d}", f"bench.seller{index}@example.com")
+        self.step(
+            "seller.register_profile",
+            302,
+            lambda: client.post(
+                reverse("register_seller"),
+                {"business_name": "Bench Parts", "business_address": "Benchmark street 2", "nip": f"{index:010d}"},
+            ),
+        )
+
+    # ---------------------------------------------------
+    # Reporting
+    # ---------------------------------------------------
+
+    def summarize(self, options) -> dict:
+        return {
+            "meta": {
+                "commit": self.commit(),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "iterations": options["iterations"],
+                "hash_iterations": options["hash_iterations"],
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+            },
+            "steps": {
+                name: {
+                    "p50_ms": round(percentile(samples, 50), 3),
+                    "p99_ms": round(percentile(samples, 99), 3),
+                    "mean_ms": round(sum(samples) / len(samples), 3),
+                    "queries": self.queries[name],
+                    "alloc_peak_kib": round(self.allocations[name], 1) if name in self.allocations else None,
+                }
+                for name, samples in self.samples.items()
+            },
+        }
+
+    @staticmethod
+    def commit() -> str:
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=settings.BASE_DIR,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return settings.DEPLOY_VERSION
+
+    def report(self, steps: dict) -> None:
+        self.stdout.write(f"{'step':<28}{'p50 ms':>10}{'p99 ms':>10}{'queries':>9}{'alloc KiB':>11}")
+        for name, stats in steps.items():
+            alloc = f"{stats['alloc_peak_kib']:.1f}" if stats["alloc_peak_kib"] is not None else "-"
+            self.stdout.write(
+                f"{name:<28}{stats['p50_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['queries']:>9}{alloc:>11}"
+            )
+
+    def compare(self, baseline: dict, current: dict, threshold: float) -> list[str]:
+        """Print the per-step delta against *baseline* and return the regressed step names."""
+        regressions = []
+        self.stdout.write(f"\n{'step':<28}{'base p50':>10}{'p50':>10}{'delta':>9}{'queries':>10}")
+        for name, stats in current.items():
+            base = baseline.get(name)
+            if base is None:
+                continue
+            delta = stats["p50_ms"] / base["p50_ms"] - 1 if base["p50_ms"] else 0.0
+            slower = delta > threshold
+            more_queries = stats["queries"] > base["queries"]
+            line = (
+                f"{name:<28}{base['p50_ms']:>10.2f}{stats['p50_ms']:>10.2f}{delta:>+9.0%}"
+                f"{base['queries']:>5} → {stats['queries']:<3}"
+            )
+            if slower or more_queries:
+                regressions.append(name)
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
+        return regressions
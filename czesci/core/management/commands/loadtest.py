@@ -0,0 +1,215 @@
+"""Concurrent load test of the ASGI application, in process.
+
+``--users`` virtual users run scripted scenarios in a loop against
+``czesci.asgi.application`` for ``--duration`` seconds:
+
+* ``browse``   – anonymous landing, how-it-works, login and register pages,
+* ``register`` – registration form, OTP verification and buyer profile,
+* ``login``    – login by phone number of a pre-created account,
+* ``settings`` – settings page plus HTMX swaps between the buyer/seller tabs.
+
+Throughput and p50/p95/p99 latency are reported per endpoint, together with
+5xx responses and ``database is locked`` errors. The run uses a throwaway
+test database (``core.bench.scratch_databases``): accounts never collide with
+or remove real ones. OTP codes are fixed for the duration of the run.
+"""
+
+import asyncio
+import itertools
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.core.signals import got_request_exception
+from django.db import OperationalError
+from django.test.utils import override_settings
+
+from core.bench import percentile, scratch_databases
+from core.loadtest import AsgiClient
+from users.models import BuyerProfile, PhoneNumber, SellerProfile
+from users.services.otp import OtpStore
+
+User = get_user_model()
+
+OTP = "123456"
+PASSWORD = "load-Pa55word!"
+ACCOUNT_PREFIX = "+4853"
+REGISTER_PREFIX = "+4854"
+
+
+class Stats:
+    """Latencies and status codes per endpoint label."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.lock_errors = 0
+
+    def record(self, label: str, response) -> None:
+        self.latencies[label].append(response.elapsed * 1000)
+        self.statuses[label][response.status] += 1
+
+
+# ---------------------------------------------------
+# Scenarios
+# ---------------------------------------------------
+
+
+async def browse(client: AsgiClient, stats: Stats, account: str) -> None:  # pylint: disable=unused-argument
+    for path in ("/", "/how-it-works/", "/login/", "/register/"):
+        stats.record(f"GET {path}", await client.get(path))
+
+
+_register_numbers = itertools.count()
+
+
+async def register(client: AsgiClient, stats: Stats, account: str) -> None:  # pylint: disable=unused-argument
+    client.cookies.clear()
+    phone = f"{REGISTER_PREFIX}{next(_register_numbers):07d}"
+    stats.record("GET /register/", await client.get("/register/"))
+    data = {
+        "first_name": "Load",
+        "last_name": "Test",
+        "phone": phone,
+        "password1": PASSWORD,
+        "password2": PASSWORD,
+        "role": "buyer",
+        "age_confirm": "on",
+        "consent_terms": "on",
+        "consent_privacy": "on",
+    }
+    stats.record("POST /register/", await client.post("/register/", data, htmx=True))
+    stats.record("POST /verify-phone/", await client.post("/verify-phone/", {"otp": OTP}, htmx=True))
+    stats.record(
+        "POST /register/buyer/",
+        await client.post("/register/buyer/", {"delivery_address": "Load street 1"}, htmx=True),
+    )
+
+
+async def login(client: AsgiClient, stats: Stats, account: str) -> None:
+    client.cookies.clear()
+    stats.record("GET /login/", await client.get("/login/"))
+    stats.record(
+        "POST /login/", await client.post("/login/", {"identifier": account, "password": PASSWORD}, htmx=True)
+    )
+
+
+async def settings_tabs(client: AsgiClient, stats: Stats, account: str) -> None:
+    if "sessionid" not in client.cookies:
+        await login(client, stats, account)
+    stats.record("GET /settings/", await client.get("/settings/"))
+    for tab in ("buyer", "seller", "buyer"):
+        stats.record(f"GET /settings/{tab}/ (htmx)", await client.get(f"/settings/{tab}/", htmx=True))
+
+
+SCENARIOS = {"browse": browse, "register": register, "login": login, "settings": settings_tabs}
+
+
+class Command(BaseCommand):
+    help = "Drive the ASGI app with N concurrent virtual users and report per-endpoint latency."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users.")
+        parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run.")
+        parser.add_argument(
+            "--scenarios",
+            nargs="+",
+            choices=list(SCENARIOS),
+            default=list(SCENARIOS),
+            help="Scenarios each virtual user picks from at random.",
+        )
+        parser.add_argument(
+            "--hash-iterations",
+            type=int,
+            help="Override PASSWORD_HASH_ITERATIONS to keep hashing from dominating the numbers.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        from czesci.asgi import application  # imported here: the module calls django.setup()
+
+        self.stats = stats = Stats()
+        overrides = {"PAGE_CACHE_ENABLED": False}
+        if options["hash_iterations"]:
+            overrides["PASSWORD_HASH_ITERATIONS"] = options["hash_iterations"]
+
+        got_request_exception.connect(self.on_exception, dispatch_uid="core.loadtest")
+        try:
+            with scratch_databases(), override_settings(**overrides), mock.patch.object(
+                OtpStore, "derive_code", return_value=OTP
+            ):
+                # Hashed under the overridden cost, so logins do not trigger a re-hash.
+                accounts = self.create_accounts(options["users"])
+                started = time.perf_counter()
+                asyncio.run(self.run(application, stats, accounts, options))
+                elapsed = time.perf_counter() - started
+        finally:
+            got_request_exception.disconnect(dispatch_uid="core.loadtest")
+
+        self.report(stats, elapsed, options["users"])
+
+    def on_exception(self, sender, request=None, **kwargs):  # pylint: disable=unused-argument
+        exc = sys.exc_info()[1]
+        if isinstance(exc, OperationalError) and "locked" in str(exc):
+            self.stats.lock_errors += 1
+
+    async def run(self, app, stats: Stats, accounts: list[str], options) -> None:
+        deadline = time.perf_counter() + options["duration"]
+        scenarios = [SCENARIOS[name] for name in options["scenarios"]]
+
+        async def virtual_user(index: int) -> None:
+            rng = random.Random(options["seed"] + index)
+            client = AsgiClient(app)
+            while time.perf_counter() < deadline:
+                await rng.choice(scenarios)(client, stats, accounts[index])
+
+        await asyncio.gather(*(virtual_user(index) for index in range(options["users"])))
+
+    # ---------------------------------------------------
+    # Fixtures
+    # ---------------------------------------------------
+
+    @staticmethod
+    def create_accounts(count: int) -> list[str]:
+        """Create *count* buyer+seller accounts with a verified number; return the numbers."""
+        password_hash = make_password(PASSWORD)
+        numbers = []
+        for index in range(count):
+            number = f"{ACCOUNT_PREFIX}{index:07d}"
+            user = User.objects.create(username=number.lstrip("+"), password=password_hash, first_name="Load")
+            buyer = BuyerProfile.objects.create(user=user, delivery_address="Load street 1")
+            SellerProfile.objects.create(user=user, business_name="Load", business_address="Load street 2", nip="0")
+            PhoneNumber.objects.create(
+                buyer_profile=buyer, profile_type=PhoneNumber.ProfileType.BUYER, number=number, is_verified=True
+            )
+            numbers.append(number)
+        return numbers
+
+    # ---------------------------------------------------
+    # Reporting
+    # ---------------------------------------------------
+
+    def report(self, stats: Stats, elapsed: float, users: int) -> None:
+        total = sum(len(samples) for samples in stats.latencies.values())
+        server_errors = sum(
+            count for statuses in stats.statuses.values() for status, count in statuses.items() if status >= 500
+        )
+        self.stdout.write(
+            f"{users} virtual users, {elapsed:.1f}s, {total} requests, {total / elapsed:.1f} req/s, "
+            f"{server_errors} 5xx, {stats.lock_errors} 'database is locked'"
+        )
+        self.stdout.write(
+            f"{'endpoint':<30}{'reqs':>7}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}  statuses"
+        )
+        for label in sorted(stats.latencies):
+            samples = stats.latencies[label]
+            statuses = " ".join(f"{status}x{count}" for status, count in sorted(stats.statuses[label].items()))
+            self.stdout.write(
+                f"{label:<30}{len(samples):>7}{len(samples) / elapsed:>8.1f}{percentile(samples, 50):>9.1f}"
+                f"{percentile(samples, 95):>9.1f}{percentile(samples, 99):>9.1f}  {statuses}"
+            )
@@ -0,0 +1,29 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired sessions in small chunks. Unlike clearsessions this never "
+        "issues one table-wide DELETE, so concurrent requests are not blocked."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--sleep", type=float, default=0.05, help="Pause between chunks in seconds.")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = Session.objects.filter(expire_date__lt=now).order_by()
+        total = 0
+        while True:
+            keys = list(expired.values_list("session_key", flat=True)[: options["chunk_size"]])
+            if not keys:
+                break
+            deleted, _ = Session.objects.filter(session_key__in=keys).delete()
+            total += deleted
+            time.sleep(options["sleep"])
+        self.stdout.write(f"Deleted {total} expired sessions.")
@@ -0,0 +1,64 @@
+"""Simulate asynchronous replication between two SQLite files.
+
+Every ``--interval`` seconds a consistent snapshot of the primary is taken with
+SQLite's online backup API and applied to the replica ``--lag`` seconds later,
+so the replica trails the primary the way a MySQL replica under load would.
+Use it to exercise ``core.db_routers`` locally::
+
+    SQLITE_REPLICA_PATH=/tmp/replica.sqlite3 manage.py replicate_sqlite --lag 2
+"""
+
+import sqlite3
+import time
+from contextlib import closing
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+
+class Command(BaseCommand):
+    help = "Copy the primary SQLite database into the replica with a configurable delay."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lag", type=float, default=1.0, help="Seconds between snapshot and apply.")
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds between snapshots.")
+        parser.add_argument("--once", action="store_true", help="Copy once without delay and exit.")
+
+    def handle(self, *args, **options):
+        alias = settings.DATABASE_REPLICA_ALIAS
+        if alias not in settings.DATABASES:
+            raise CommandError("No replica configured; set SQLITE_REPLICA_PATH.")
+        primary, replica = settings.DATABASES[DEFAULT_DB_ALIAS], settings.DATABASES[alias]
+        if not all(db["ENGINE"] == "django.db.backends.sqlite3" for db in (primary, replica)):
+            raise CommandError("replicate_sqlite only supports SQLite primary and replica.")
+
+        if options["once"]:
+            self.apply(self.snapshot(primary["NAME"]), replica["NAME"])
+            self.stdout.write("Replica refreshed.")
+            return
+
+        pending = []  # (apply_at, snapshot)
+        try:
+            while True:
+                now = time.monotonic()
+                pending.append((now + options["lag"], self.snapshot(primary["NAME"])))
+                while pending and pending[0][0] <= now:
+                    self.apply(pending.pop(0)[1], replica["NAME"])
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+
+    @staticmethod
+    def snapshot(path) -> sqlite3.Connection:
+        """Consistent in-memory copy of the database at *path*."""
+        snapshot = sqlite3.connect(":memory:")
+        with closing(sqlite3.connect(path)) as source:
+            source.backup(snapshot)
+        return snapshot
+
+    @staticmethod
+    def apply(snapshot: sqlite3.Connection, path) -> None:
+        with closing(sqlite3.connect(path)) as target:
+            snapshot.backup(target)
+        snapshot.close()
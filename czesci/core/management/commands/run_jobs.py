@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.jobs import Worker
+
+
+class Command(BaseCommand):
+    help = "Process background jobs from the database queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=4, help="Size of the worker thread pool.")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to sleep when idle.")
+        parser.add_argument("--once", action="store_true", help="Drain due jobs and exit.")
+
+    def handle(self, *args, **options):
+        worker = Worker(threads=options["threads"])
+        self.stdout.write(f"Job worker started with {options['threads']} threads.")
+        try:
+            while True:
+                processed = worker.run_once()
+                if processed:
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping job worker…")
+        finally:
+            worker.shutdown()
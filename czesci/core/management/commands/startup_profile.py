@@ -0,0 +1,162 @@
+"""Where a fresh worker spends its startup time.
+
+Starts a new interpreter with ``python -X importtime`` that sets Django up
+the way a worker does, then serves a few requests. The report lists
+
+* the startup phases (settings, app registry, warm-up),
+* the time spent in every ``AppConfig.ready()`` hook,
+* import time per top-level package and the slowest modules,
+* the latency of the first request to each path next to the steady-state
+  latency, once for a cold worker and once after ``core.warmup.warm_up()``.
+
+Usage::
+
+    manage.py startup_profile
+    manage.py startup_profile --limit 40 --paths / /login/
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in the child interpreter; argv: warm-up flag, repeats, paths...
+PROBE = r"""
+import json, sys, time
+
+from django.apps.config import AppConfig
+
+ready = {}
+create = AppConfig.create.__func__
+
+
+def timed_create(cls, entry):
+    config = create(cls, entry)
+    hook = config.ready
+
+    def timed_ready():
+        started = time.perf_counter()
+        hook()
+        ready[config.label] = time.perf_counter() - started
+
+    config.ready = timed_ready
+    return config
+
+
+AppConfig.create = classmethod(timed_create)
+
+phases = {}
+started = time.perf_counter()
+import django
+from django.conf import settings
+settings.INSTALLED_APPS
+phases["settings"] = time.perf_counter() - started
+
+started = time.perf_counter()
+django.setup()
+phases["apps"] = time.perf_counter() - started
+
+if sys.argv[1] == "1":
+    from core.warmup import warm_up
+
+    started = time.perf_counter()
+    for name, (_items, seconds) in warm_up().items():
+        phases[f"warm-up {name}"] = seconds
+    phases["warm-up total"] = time.perf_counter() - started
+
+from django.test import Client
+from django.test.utils import setup_test_environment
+
+setup_test_environment()
+repeats = int(sys.argv[2])
+requests = {}
+# One client: its handler loads the middleware chain once, like a worker's application does.
+client = Client()
+for path in sys.argv[3:]:
+    client.cookies.clear()
+    timings = []
+    for _ in range(repeats + 1):
+        started = time.perf_counter()
+        client.get(path)
+        timings.append(time.perf_counter() - started)
+    requests[path] = {"first": timings[0], "steady": sorted(timings[1:])[len(timings[1:]) // 2]}
+
+print(json.dumps({"phases": phases, "ready": ready, "requests": requests}))
+"""
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+class Command(BaseCommand):
+    help = "Profile imports, app ready() hooks and first-request latency of a fresh worker."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20, help="Number of packages and modules to list.")
+        parser.add_argument("--paths", nargs="+", default=["/", "/login/", "/register/"])
+        parser.add_argument("--repeats", type=int, default=20, help="Requests per path after the first one.")
+
+    def handle(self, *args, **options):
+        cold, imports = self.probe(False, options)
+        warm, _ = self.probe(True, options)
+
+        self.section("phase", "ms")
+        for name, seconds in {**cold["phases"], **warm["phases"]}.items():
+            self.stdout.write(f"{name:<32}{seconds * 1000:>10.1f}")
+
+        self.section("ready() hook", "ms")
+        for label, seconds in sorted(cold["ready"].items(), key=lambda item: -item[1]):
+            self.stdout.write(f"{label:<32}{seconds * 1000:>10.1f}")
+
+        packages = defaultdict(int)
+        for module, (self_us, _cumulative) in imports.items():
+            packages[module.split(".")[0]] += self_us
+        self.section("package (self time)", "ms")
+        for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[: options["limit"]]:
+            self.stdout.write(f"{package:<32}{self_us / 1000:>10.1f}")
+        self.stdout.write(f"{'total':<32}{sum(packages.values()) / 1000:>10.1f}")
+
+        self.section("module (cumulative)", "ms", "self ms")
+        slowest = sorted(imports.items(), key=lambda item: -item[1][1])[: options["limit"]]
+        for module, (self_us, cumulative_us) in slowest:
+            self.stdout.write(f"{module:<32}{cumulative_us / 1000:>10.1f}{self_us / 1000:>10.1f}")
+
+        self.stdout.write("")
+        self.stdout.write(f"{'first request':<32}{'cold ms':>10}{'warm ms':>10}{'steady ms':>10}")
+        for path in options["paths"]:
+            self.stdout.write(
+                f"{path:<32}{cold['requests'][path]['first'] * 1000:>10.1f}"
+                f"{warm['requests'][path]['first'] * 1000:>10.1f}"
+                f"{warm['requests'][path]['steady'] * 1000:>10.1f}"
+            )
+
+    def section(self, *columns) -> None:
+        self.stdout.write("")
+        self.stdout.write(f"{columns[0]:<32}" + "".join(f"{column:>10}" for column in columns[1:]))
+
+    @staticmethod
+    def probe(warm: bool, options) -> tuple[dict, dict[str, tuple[int, int]]]:
+        """Run ``PROBE`` in a fresh interpreter; returns its report and ``{module: (self µs, cumulative µs)}``."""
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "czesci.settings")}
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE, "1" if warm else "0", str(options["repeats"]),
+             *options["paths"]],
+            cwd=settings.BASE_DIR.parent,  # the directory of manage.py, so the project is importable
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if completed.returncode:
+            raise CommandError(completed.stderr.strip().splitlines()[-1] if completed.stderr else "probe failed")
+
+        imports = {}
+        for line in completed.stderr.splitlines():
+            match = IMPORTTIME_RE.match(line)
+            if match:
+                imports[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+        return json.loads(completed.stdout.strip().splitlines()[-1]), imports
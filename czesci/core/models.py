@@ -1,3 +1,36 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class Job(models.Model):
+    """Background job row written in the same transaction as the work that needs it.
+
+    Rows are picked up by ``manage.py run_jobs``. Successful jobs are deleted;
+    jobs that exhaust their attempts stay behind with status ``dead`` so they can
+    be inspected and retried from the admin.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DEAD = "dead", "Dead"
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Worker polling: status='pending' AND run_after <= now ORDER BY run_after
+            models.Index(fields=["status", "run_after"], name="job_status_run_after"),
+        ]
+
+    def __str__(self) -> str:  # noqa: DunderStr
+        return f"{self.name} #{self.pk} ({self.status})"
@@ -0,0 +1,81 @@
+"""Full-page cache for anonymous visitors of static landing pages.
+
+Only anonymous, non-HTMX ``GET``/``HEAD`` requests without pending messages are
+served from cache. Entries are keyed by ``DEPLOY_VERSION`` and the full path,
+so a deploy (new ``DEPLOY_VERSION``) invalidates every page at once. Pages are
+not keyed by language: without ``LocaleMiddleware`` every request renders in
+``LANGUAGE_CODE``; add the language to the key when that changes. Cached responses carry ``ETag`` and ``Last-Modified`` and answer
+conditional requests with ``304 Not Modified``.
+"""
+
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+
+def _is_cacheable_request(request) -> bool:
+    return (
+        settings.PAGE_CACHE_ENABLED
+        and request.method in ("GET", "HEAD")
+        and not request.headers.get("HX-Request")
+        and not request.user.is_authenticated
+        and not len(messages.get_messages(request))
+    )
+
+
+def _cache_key(request) -> str:
+    path_hash = hashlib.md5(request.get_full_path().encode(), usedforsecurity=False).hexdigest()
+    return f"page_cache:{settings.DEPLOY_VERSION}:{path_hash}"
+
+
+def _build_response(request, entry: dict) -> HttpResponse:
+    response = get_conditional_response(
+        request, etag=entry["etag"], last_modified=entry["last_modified"]
+    ) or HttpResponse(entry["content"], content_type=entry["content_type"])
+    response["ETag"] = entry["etag"]
+    response["Last-Modified"] = http_date(entry["last_modified"])
+    response["Cache-Control"] = "no-cache"
+    patch_vary_headers(response, ("Cookie",))
+    return response
+
+
+def anonymous_page_cache(timeout: int | None = None):
+    """Cache the decorated view's rendered page for anonymous visitors."""
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped(request, *args, **kwargs):
+            if not _is_cacheable_request(request):
+                return view_func(request, *args, **kwargs)
+
+            key = _cache_key(request)
+            entry = cache.get(key)
+            if entry is None:
+                response = view_func(request, *args, **kwargs)
+                if (
+                    response.status_code != 200
+                    or response.streaming
+                    or response.cookies
+                    or request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+                ):
+                    # Per-visitor output (cookies, CSRF tokens) must not be shared.
+                    return response
+                entry = {
+                    "content": response.content,
+                    "content_type": response["Content-Type"],
+                    "etag": f'"{hashlib.md5(response.content, usedforsecurity=False).hexdigest()}"',
+                    "last_modified": int(time.time()),
+                }
+                cache.set(key, entry, timeout if timeout is not None else settings.PAGE_CACHE_TIMEOUT)
+            return _build_response(request, entry)
+
+        return wrapped
+
+    return decorator
@@ -0,0 +1,92 @@
+"""Render a single ``{% block %}`` of a page template for HTMX requests.
+
+Pages keep one template. The region HTMX swaps is marked with a named block,
+and for ``HX-Request`` calls only that block is rendered. ``base.html``,
+header and footer are skipped, and no hand-kept ``*_partial.html`` copy can
+drift from the full page::
+
+    {% block form %}<form hx-post="…" hx-target="this" hx-swap="outerHTML">…</form>{% endblock %}
+
+    return render_page(request, "users/login.html", {"form": form}, block="form")
+
+Additional blocks can be sent in the same response as out-of-band swaps
+(``oob=("toasts",)``). ``hx-swap-oob="true"`` is added to the first element
+of each, so that element needs an ``id`` that exists on the page.
+
+The block nodes of a template's ``{% extends %}`` chain are looked up once
+per compiled template and cached. The cached loader recompiles templates
+when they change, and that invalidates the cache entry as well.
+"""
+
+from __future__ import annotations
+
+import re
+from weakref import WeakKeyDictionary
+
+from django.http import HttpResponse
+from django.shortcuts import render
+from django.template import Context
+from django.template.context import make_context
+from django.template.loader import get_template
+from django.template.loader_tags import BLOCK_CONTEXT_KEY, BlockContext, BlockNode, ExtendsNode
+
+from core.instrumentation import timed_rendering
+
+_block_chains: WeakKeyDictionary = WeakKeyDictionary()
+
+FIRST_TAG_RE = re.compile(r"^(\s*<[a-zA-Z][\w-]*)")
+
+
+def _block_chain(template) -> list[dict[str, BlockNode]]:
+    """``{name: BlockNode}`` of *template* and each of its ancestors, leaf first."""
+    chain = _block_chains.get(template)
+    if chain is None:
+        chain = []
+        current = template
+        while current is not None:
+            chain.append({node.name: node for node in current.nodelist.get_nodes_by_type(BlockNode)})
+            extends = current.nodelist.get_nodes_by_type(ExtendsNode)
+            if extends:
+                # ``{% extends %}`` resolves its parent through the template being rendered.
+                context = Context()
+                context.template = current
+                current = extends[0].get_parent(context)
+            else:
+                current = None
+        _block_chains[template] = chain
+    return chain
+
+
+def render_block_to_string(template_name: str, block_name: str, context=None, request=None) -> str:
+    """Render the block *block_name* of *template_name* (honouring ``{{ block.super }}``)."""
+    template = get_template(template_name).template
+    chain = _block_chain(template)
+    if not any(block_name in blocks for blocks in chain):
+        raise ValueError(f"Template {template_name!r} has no block {block_name!r}")
+
+    # BlockContext is consumed while rendering, so it is rebuilt every time.
+    block_context = BlockContext()
+    for blocks in chain:
+        block_context.add_blocks(blocks)
+
+    context = make_context(context, request, autoescape=template.engine.autoescape)
+    with timed_rendering(), context.render_context.push_state(template), context.bind_template(template):
+        context.template_name = template.name
+        context.render_context[BLOCK_CONTEXT_KEY] = block_context
+        return block_context.get_block(block_name).render(context)
+
+
+def render_block(request, template_name: str, block_name: str, context=None, oob=()) -> HttpResponse:
+    """Response with *block_name* followed by the *oob* blocks as out-of-band swaps."""
+    parts = [render_block_to_string(template_name, block_name, context, request)]
+    for name in oob:
+        html = render_block_to_string(template_name, name, context, request)
+        parts.append(FIRST_TAG_RE.sub(r'\1 hx-swap-oob="true"', html, count=1))
+    return HttpResponse("".join(parts))
+
+
+def render_page(request, template_name: str, context=None, block: str = "content", oob=()) -> HttpResponse:
+    """Full page for regular requests, only *block* (and *oob*) for HTMX requests."""
+    if request.headers.get("HX-Request"):
+        return render_block(request, template_name, block, context, oob)
+    return render(request, template_name, context)
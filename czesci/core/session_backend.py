@@ -0,0 +1,69 @@
+"""Cached, database-backed sessions that skip writes when nothing changed.
+
+Django's ``SessionMiddleware`` saves the session whenever a view assigns to it,
+even if the value is unchanged (``switch_to_seller`` on a session already in
+seller mode, registration steps re-storing the same pending data, …). This
+store remembers a fingerprint of the data it loaded and only writes to the
+database and cache when the fingerprint differs, or when the stored expiry is
+more than half a ``SESSION_COOKIE_AGE`` old and needs extending.
+
+Reads go through ``SESSION_CACHE_ALIAS`` first, exactly like
+``django.contrib.sessions.backends.cached_db``.
+
+Enable with ``SESSION_ENGINE = "core.session_backend"``.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+
+KEY_PREFIX = "core.session_backend"
+
+# Unix time of the last persisted write, kept inside the session data.
+SAVED_AT_KEY = "_session_saved_at"
+
+
+class SessionStore(CachedDBStore):
+    cache_key_prefix = KEY_PREFIX
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._loaded_fingerprint = None
+
+    def _fingerprint(self, data):
+        payload = {key: value for key, value in data.items() if key != SAVED_AT_KEY}
+        return hashlib.blake2b(self.serializer().dumps(payload), digest_size=16).digest()
+
+    def _is_unchanged(self, must_create):
+        if must_create or self._session_key is None or self._loaded_fingerprint is None:
+            return False
+        saved_at = self._session.get(SAVED_AT_KEY, 0)
+        if time.time() - saved_at > settings.SESSION_COOKIE_AGE / 2:
+            return False
+        return self._fingerprint(self._session) == self._loaded_fingerprint
+
+    def _remember(self, data):
+        self._loaded_fingerprint = self._fingerprint(data)
+        return data
+
+    def load(self):
+        return self._remember(super().load())
+
+    async def aload(self):
+        return self._remember(await super().aload())
+
+    def save(self, must_create=False):
+        if self._is_unchanged(must_create):
+            return
+        self._session[SAVED_AT_KEY] = int(time.time())
+        super().save(must_create)
+        self._remember(self._session)
+
+    async def asave(self, must_create=False):
+        if self._is_unchanged(must_create):
+            return
+        (await self._aget_session())[SAVED_AT_KEY] = int(time.time())
+        await super().asave(must_create)
+        self._remember(self._session)
@@ -0,0 +1,200 @@
+"""Content-hashed, precompressed static files served by the application.
+
+``CompressedManifestStaticFilesStorage`` is Django's manifest storage
+(``styles.css`` is collected as ``styles.4f1c….css`` and ``{% static %}``
+links to that name) that additionally writes a ``.gz`` and, when the optional
+``brotli`` package is installed, a ``.br`` variant of every text asset during
+``collectstatic``. Variants that save less than 5% are not written.
+
+``StaticFilesMiddleware`` serves ``STATIC_ROOT`` below ``STATIC_URL`` when no
+web server sits in front of Django (``DJANGO_SERVE_STATIC=1``):
+
+* the variant is picked from ``Accept-Encoding`` (brotli, then gzip),
+* hashed names are sent with ``Cache-Control: immutable`` and a far-future
+  ``max-age``, so browsers never revalidate them; a changed file gets a new
+  name,
+* other names must be revalidated and answer ``If-None-Match`` /
+  ``If-Modified-Since`` with ``304 Not Modified``.
+
+The file index is built once when the middleware is loaded, so files must be
+collected before the server starts. Requests for static files skip sessions,
+authentication and the views entirely.
+"""
+
+from __future__ import annotations
+
+import gzip
+import mimetypes
+import os
+from dataclasses import dataclass, field
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip variants are written without it
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (".css", ".js", ".mjs", ".map", ".json", ".svg", ".txt", ".html", ".xml", ".ico")
+MIN_SAVING = 0.05
+
+# Preferred first.
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _encoders():
+    if brotli is not None:
+        yield ".br", lambda data: brotli.compress(data, quality=11)
+    yield ".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest storage that also writes gzip/brotli variants of text assets."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in sorted(set(self.hashed_files) | set(self.hashed_files.values())):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                for variant in self.compress(name):
+                    yield name, variant, True
+
+    def compress(self, name: str) -> list[str]:
+        """Write the compressed variants of *name*; returns their names."""
+        path = self.path(name)
+        with open(path, "rb") as source:
+            data = source.read()
+        written = []
+        for suffix, encode in _encoders():
+            compressed = encode(data)
+            if len(compressed) > len(data) * (1 - MIN_SAVING):
+                continue
+            with open(path + suffix, "wb") as target:
+                target.write(compressed)
+            written.append(name + suffix)
+        return written
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            # Nothing collected yet (development, test runs): plain names.
+            return name
+        return super().stored_name(name)
+
+
+@dataclass
+class StaticFile:
+    """A collected file and its precompressed variants."""
+
+    content_type: str
+    immutable: bool
+    # ``{encoding or "": (path, size, mtime)}``; "" is the uncompressed file.
+    variants: dict[str, tuple[str, int, int]] = field(default_factory=dict)
+
+    def negotiate(self, accept_encoding: str) -> tuple[str, tuple[str, int, int]]:
+        accepted = accepted_encodings(accept_encoding)
+        for encoding, _suffix in ENCODINGS:
+            if encoding in accepted and encoding in self.variants:
+                return encoding, self.variants[encoding]
+        return "", self.variants[""]
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """Codings listed in an ``Accept-Encoding`` header, without those with ``q=0``."""
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def build_index(root: str, url_prefix: str) -> dict[str, StaticFile]:
+    """``{url path: StaticFile}`` for every file below *root*."""
+    hashed_names = set(getattr(staticfiles_storage, "hashed_files", {}).values())
+    variant_suffixes = tuple(suffix for _encoding, suffix in ENCODINGS)
+    index = {}
+    for directory, _dirs, files in os.walk(root):
+        for filename in files:
+            if filename.endswith(variant_suffixes):
+                continue
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, root).replace(os.sep, "/")
+            if name == ManifestStaticFilesStorage.manifest_name:
+                continue
+            static_file = StaticFile(
+                content_type=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+                immutable=name in hashed_names,
+            )
+            for encoding, suffix in (("", ""), *ENCODINGS):
+                try:
+                    stat = os.stat(path + suffix)
+                except FileNotFoundError:
+                    continue
+                static_file.variants[encoding] = (path + suffix, stat.st_size, int(stat.st_mtime))
+            index[url_prefix + name] = static_file
+    return index
+
+
+class StaticFilesMiddleware:
+    """Serve ``STATIC_ROOT`` with precompressed variants and long-lived caching."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.STATIC_SERVE or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        self.files = build_index(str(settings.STATIC_ROOT), settings.STATIC_URL)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.serve(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        return self.serve(request) or await self.get_response(request)
+
+    def serve(self, request):
+        if request.method not in ("GET", "HEAD"):
+            return None
+        static_file = self.files.get(request.path)
+        if static_file is None:
+            return None
+
+        encoding, (path, size, mtime) = static_file.negotiate(request.headers.get("Accept-Encoding", ""))
+        etag = f'"{mtime:x}-{size:x}"'
+        response = get_conditional_response(request, etag=etag, last_modified=mtime)
+        if response is None:
+            if request.method == "HEAD":
+                response = HttpResponse(content_type=static_file.content_type)
+            else:
+                response = FileResponse(open(path, "rb"), content_type=static_file.content_type)
+            response["Content-Length"] = size
+            if encoding:
+                response["Content-Encoding"] = encoding
+
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(mtime)
+        if static_file.immutable:
+            response["Cache-Control"] = f"public, max-age={settings.STATIC_MAX_AGE}, immutable"
+        else:
+            response["Cache-Control"] = "no-cache"
+        if len(static_file.variants) > 1:
+            patch_vary_headers(response, ("Accept-Encoding",))
+        return response
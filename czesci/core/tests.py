@@ -1,3 +1,278 @@
-from django.test import TestCase
+"""Tests for the job queue, uploads, page cache, instrumentation, replica routing and static files of ``core``."""
 
-# Create your tests here.
+import os
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.files.uploadhandler import StopUpload
+from django.http import HttpResponse
+from django.db import OperationalError, connections
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core import jobs
+from core.jobs import Worker, enqueue
+from core.db_routers import ReplicaStickinessMiddleware, primary_pin_scope
+from core.models import Job
+from core.page_cache import anonymous_page_cache
+from core.staticfiles import StaticFilesMiddleware
+from core.uploads import HashingUploadHandler
+
+
+class WorkerTests(TransactionTestCase):
+    """The worker closes its connections between jobs, so each test commits."""
+
+    def setUp(self):
+        self.worker = Worker(threads=1)
+        self.addCleanup(self.worker.shutdown)
+        self.calls = []
+        patcher = mock.patch.dict(jobs._registry, {"tests.record": lambda **payload: self.calls.append(payload)})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_successful_job_is_deleted(self):
+        job_obj = enqueue("tests.record", value=1)
+        self.assertEqual(self.worker.run_once(), 1)
+        self.assertEqual(self.calls, [{"value": 1}])
+        self.assertFalse(Job.objects.filter(pk=job_obj.pk).exists())
+
+    def test_missing_job_does_not_raise(self):
+        with self.assertLogs("core.jobs", "WARNING"):
+            self.worker.execute(123456)
+
+    def test_error_recording_the_result_does_not_raise(self):
+        job_obj = enqueue("tests.record")
+        with mock.patch.object(Job, "delete", side_effect=OperationalError("database is locked")):
+            with self.assertLogs("core.jobs", "ERROR"):
+                self.worker.execute(job_obj.pk)
+        self.assertTrue(Job.objects.filter(pk=job_obj.pk).exists())
+
+    def test_stale_job_counts_an_attempt(self):
+        locked_at = timezone.now() - timedelta(hours=1)
+        retried = enqueue("tests.record", max_attempts=3)
+        exhausted = enqueue("tests.record", max_attempts=3)
+        Job.objects.filter(pk=retried.pk).update(status=Job.Status.RUNNING, locked_at=locked_at, attempts=1)
+        Job.objects.filter(pk=exhausted.pk).update(status=Job.Status.RUNNING, locked_at=locked_at, attempts=2)
+
+        with self.assertLogs("core.jobs", "ERROR"):
+            self.assertEqual(self.worker.release_stale(), 2)
+
+        retried.refresh_from_db()
+        exhausted.refresh_from_db()
+        self.assertEqual((retried.status, retried.attempts, retried.locked_at), (Job.Status.PENDING, 2, None))
+        self.assertEqual((exhausted.status, exhausted.attempts), (Job.Status.DEAD, 3))
+
+
+class HashingUploadHandlerTests(SimpleTestCase):
+    def test_oversized_file_stops_the_upload_without_resetting_the_connection(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            handler = HashingUploadHandler(temp_dir=temp_dir, max_bytes=10)
+            handler.new_file("images", "photo.jpg", "image/jpeg", 0)
+            handler.receive_data_chunk(b"x" * 8, 0)
+            with self.assertRaises(StopUpload) as raised:
+                handler.receive_data_chunk(b"x" * 8, 8)
+            handler.file.close()
+
+        # The parser then reads the rest of the body, so the client gets the 400.
+        self.assertFalse(raised.exception.connection_reset)
+        self.assertEqual(handler.too_large, ["photo.jpg"])
+
+
+@override_settings(PAGE_CACHE_ENABLED=True, DEPLOY_VERSION="1")
+class AnonymousPageCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.calls = 0
+
+        @anonymous_page_cache()
+        def page(request):
+            self.calls += 1
+            return HttpResponse(f"page {self.calls}")
+
+        self.page = page
+
+    def get(self, user=None, **headers):
+        request = RequestFactory().get("/", headers=headers)
+        request.user = user or AnonymousUser()
+        return self.page(request)
+
+    def test_anonymous_visitors_share_one_rendering(self):
+        first = self.get()
+        second = self.get()
+        self.assertEqual((first.content, second.content), (b"page 1", b"page 1"))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(second["Vary"], "Cookie")
+        self.assertEqual(self.get(If_None_Match=second["ETag"]).status_code, 304)
+
+    def test_authenticated_users_bypass_the_cache(self):
+        user = get_user_model()(username="jan")
+        self.get()
+        self.assertEqual(self.get(user).content, b"page 2")
+        self.assertEqual(self.get(user).content, b"page 3")
+        self.assertNotIn("ETag", self.get(user))
+
+    def test_deploy_version_changes_the_key(self):
+        self.get()
+        with override_settings(DEPLOY_VERSION="2"):
+            self.assertEqual(self.get().content, b"page 2")
+        self.assertEqual(self.get().content, b"page 1")
+
+
+@override_settings(PAGE_CACHE_ENABLED=False, SERVER_TIMING_ENABLED=True)
+class RequestInstrumentationTests(TestCase):
+    def test_full_page_and_block_rendering_are_timed(self):
+        for headers in ({}, {"HX-Request": "true"}):
+            with self.subTest(headers=headers), self.assertLogs("core.instrumentation", "INFO") as logs:
+                response = self.client.get(reverse("login"), headers=headers)
+            record = logs.records[-1]
+            self.assertRegex(record.view, r"^users\.views(_async)?\.login_view$")
+            self.assertGreater(record.template_ms, 0)
+            self.assertIn("tpl;dur=", response["Server-Timing"])
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    """A second SQLite file as ``replica``, filled by ``replicate_sqlite --once``."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        replica = {**connections["default"].settings_dict, "NAME": os.path.join(directory.name, "replica.sqlite3")}
+        for patcher in (
+            mock.patch.dict(settings.DATABASES, {settings.DATABASE_REPLICA_ALIAS: replica}),
+            # Allow the connection, which did not exist when the test class was set up.
+            mock.patch.object(type(self), "databases", {"default", settings.DATABASE_REPLICA_ALIAS}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self.drop_replica_connection)
+
+        self.User = get_user_model()
+        self.User.objects.create(username="replicated")
+        call_command("replicate_sqlite", once=True, stdout=StringIO())
+        # Not replicated yet: only the primary has it.
+        self.User.objects.create(username="lagging")
+
+    @staticmethod
+    def drop_replica_connection():
+        connections[settings.DATABASE_REPLICA_ALIAS].close()
+        del connections[settings.DATABASE_REPLICA_ALIAS]
+
+    def visible(self, username: str) -> bool:
+        return self.User.objects.filter(username=username).exists()
+
+    def test_reads_go_to_the_replica_until_a_write(self):
+        with primary_pin_scope() as wrote:
+            self.assertTrue(self.visible("replicated"))
+            self.assertFalse(self.visible("lagging"))
+            self.User.objects.create(username="writer")
+            self.assertEqual(wrote, ["auth.User"])
+            self.assertTrue(self.visible("lagging"))
+        # The pin ends with the scope.
+        with primary_pin_scope():
+            self.assertFalse(self.visible("lagging"))
+
+    def test_a_jobs_write_does_not_pin_the_next_job(self):
+        seen = []
+        handlers = {
+            "tests.write": lambda: self.User.objects.create(username="writer"),
+            "tests.read": lambda: seen.append(self.visible("lagging")),
+        }
+        worker = Worker(threads=1)
+        self.addCleanup(worker.shutdown)
+        with mock.patch.dict(jobs._registry, handlers):
+            for name in ("tests.write", "tests.read"):
+                worker.execute(enqueue(name).pk)
+        self.assertEqual(seen, [False])
+
+    def test_sticky_cookie_pins_reads_and_is_set_after_a_write(self):
+        def view(request):
+            response = HttpResponse(str(self.visible("lagging")))
+            if request.GET.get("write"):
+                self.User.objects.create(username="writer")
+            return response
+
+        middleware = ReplicaStickinessMiddleware(view)
+        factory = RequestFactory()
+        self.assertEqual(middleware(factory.get("/")).content, b"False")
+
+        response = middleware(factory.get("/", {"write": "1"}))
+        cookie = response.cookies[settings.REPLICA_STICKY_COOKIE]
+        self.assertGreater(float(cookie.value), time.time())
+
+        factory.cookies[settings.REPLICA_STICKY_COOKIE] = cookie.value
+        self.assertEqual(middleware(factory.get("/")).content, b"True")
+        factory.cookies[settings.REPLICA_STICKY_COOKIE] = str(time.time() - 1)
+        self.assertEqual(middleware(factory.get("/")).content, b"False")
+
+
+@mock.patch("core.staticfiles.brotli", None)
+class StaticFilesTests(SimpleTestCase):
+    """``collectstatic`` into a temporary ``STATIC_ROOT``, then served by ``StaticFilesMiddleware``."""
+
+    def setUp(self):
+        directories = [tempfile.TemporaryDirectory() for _ in range(2)]
+        for directory in directories:
+            self.addCleanup(directory.cleanup)
+        source, self.root = (directory.name for directory in directories)
+        with open(os.path.join(source, "styles.css"), "w", encoding="utf-8") as fh:
+            fh.write("body { color: black; }\n" * 200)
+        with open(os.path.join(source, "noise.png"), "wb") as fh:
+            fh.write(os.urandom(4096))
+
+        patcher = override_settings(
+            STATICFILES_DIRS=[source],
+            STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"],
+            STATIC_ROOT=self.root,
+            STATIC_SERVE=True,
+        )
+        patcher.enable()
+        self.addCleanup(patcher.disable)
+        call_command("collectstatic", interactive=False, verbosity=0)
+        self.hashed = staticfiles_storage.stored_name("styles.css")
+        self.middleware = StaticFilesMiddleware(lambda request: HttpResponse("view"))
+
+    def get(self, name: str, method: str = "get", **headers):
+        return self.middleware(getattr(RequestFactory(), method)(settings.STATIC_URL + name, headers=headers))
+
+    def test_gzip_is_written_only_when_it_saves_enough(self):
+        self.assertTrue(os.path.exists(os.path.join(self.root, self.hashed + ".gz")))
+        noise = staticfiles_storage.stored_name("noise.png")
+        self.assertFalse(os.path.exists(os.path.join(self.root, noise + ".gz")))
+
+    def test_encoding_is_negotiated(self):
+        for accept_encoding, encoding in (("gzip, deflate", "gzip"), ("gzip;q=0, deflate", None), ("", None)):
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.get(self.hashed, Accept_Encoding=accept_encoding)
+                self.assertEqual(response.get("Content-Encoding"), encoding)
+                self.assertEqual(response["Vary"], "Accept-Encoding")
+                response.close()
+
+    def test_only_hashed_names_are_immutable(self):
+        hashed, plain = self.get(self.hashed), self.get("styles.css")
+        self.assertIn("immutable", hashed["Cache-Control"])
+        self.assertEqual(plain["Cache-Control"], "no-cache")
+        for response in (hashed, plain):
+            response.close()
+
+    def test_revalidation_and_head(self):
+        response = self.get("styles.css")
+        response.close()
+        self.assertEqual(self.get("styles.css", If_None_Match=response["ETag"]).status_code, 304)
+
+        head = self.get("styles.css", method="head")
+        self.assertEqual(head.content, b"")
+        self.assertEqual(int(head["Content-Length"]), os.path.getsize(os.path.join(self.root, "styles.css")))
+
+    def test_other_paths_reach_the_view(self):
+        self.assertEqual(self.get("missing.css").content, b"view")
@@ -0,0 +1,79 @@
+"""Upload handler that streams files to disk and hashes them on the way.
+
+Django keeps uploads below ``FILE_UPLOAD_MAX_MEMORY_SIZE`` in memory and
+writes larger ones to a temporary file. ``HashingUploadHandler`` writes every
+upload to *temp_dir* chunk by chunk, so a request never holds more than one
+chunk of a file, and feeds the same chunks to SHA-256. The finished file
+carries the digest as ``sha256``, so content-addressed storage
+(``orders.services.images``) needs no second pass over the data. A file
+growing past *max_bytes* stops the upload before more of it is written.
+
+The handler is installed per view, before the request body is read::
+
+    @csrf_exempt
+    def upload(request):
+        request.upload_handlers = [HashingUploadHandler(request, temp_dir=..., max_bytes=...)]
+        return _upload(request)  # decorated with csrf_protect
+
+Keep *temp_dir* on the same filesystem as ``MEDIA_ROOT``: ``FileSystemStorage``
+then stores a temporary file with a rename instead of copying it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+
+from django.core.files.uploadedfile import TemporaryUploadedFile, UploadedFile
+from django.core.files.uploadhandler import StopUpload, TemporaryFileUploadHandler
+
+
+class HashedTemporaryUploadedFile(TemporaryUploadedFile):
+    """``TemporaryUploadedFile`` created in *temp_dir* instead of ``FILE_UPLOAD_TEMP_DIR``."""
+
+    def __init__(self, name, content_type, size, charset, content_type_extra=None, temp_dir=None):
+        _, ext = os.path.splitext(name)
+        file = tempfile.NamedTemporaryFile(suffix=".upload" + ext, dir=temp_dir)
+        # Skip TemporaryUploadedFile.__init__, which would open a second file.
+        UploadedFile.__init__(self, file, name, content_type, size, charset, content_type_extra)  # pylint: disable=non-parent-init-called
+        self.sha256 = ""
+
+
+class HashingUploadHandler(TemporaryFileUploadHandler):
+    """``TemporaryFileUploadHandler`` that sets ``sha256`` on the uploaded files.
+
+    Files larger than *max_bytes* are not accepted: their names are collected in
+    ``too_large`` and nothing more is written. The rest of the body is still
+    read and discarded, so the client receives the view's error response
+    instead of a reset connection.
+    """
+
+    def __init__(self, request=None, temp_dir: str | os.PathLike | None = None, max_bytes: int | None = None):
+        super().__init__(request)
+        self.temp_dir = temp_dir
+        self.max_bytes = max_bytes
+        self.too_large: list[str] = []
+
+    def new_file(self, *args, **kwargs):
+        # Skip TemporaryFileUploadHandler.new_file: it creates its file in FILE_UPLOAD_TEMP_DIR.
+        super(TemporaryFileUploadHandler, self).new_file(*args, **kwargs)  # pylint: disable=bad-super-call
+        if self.temp_dir is not None:
+            # Created on first use: MEDIA_ROOT may be new.
+            os.makedirs(self.temp_dir, exist_ok=True)
+        self.file = HashedTemporaryUploadedFile(
+            self.file_name, self.content_type, 0, self.charset, self.content_type_extra, temp_dir=self.temp_dir
+        )
+        self.hash = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.max_bytes is not None and start + len(raw_data) > self.max_bytes:
+            self.too_large.append(self.file_name)
+            raise StopUpload(connection_reset=False)
+        self.hash.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        file.sha256 = self.hash.hexdigest()
+        return file
@@ -1,11 +1,15 @@
 from django.shortcuts import render
 
+from core.page_cache import anonymous_page_cache
+
 # Create your views here.
 
+@anonymous_page_cache()
 def home(request):
     """Render main landing page"""
     return render(request, "core/index.html")
 
+@anonymous_page_cache()
 def how_it_works(request):
     """Render 'How It Works' page"""
     return render(request, "core/how_it_works.html")
@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'czesci.settings')
 
 application = get_asgi_application()
+
+if settings.WARMUP_ON_LOAD:
+    from core.warmup import warm_up
+
+    warm_up()
@@ -1 +1,30 @@
-MAX_SMS_ATTEMPTS = 5
\ No newline at end of file
+MAX_SMS_ATTEMPTS = 5
+OTP_TTL_SECONDS = 300
+
+# Background jobs (core.jobs)
+JOBS_MAX_ATTEMPTS = 5
+JOBS_BACKOFF_SECONDS = 10  # doubled after every failed attempt
+JOBS_LOCK_TIMEOUT_SECONDS = 300  # running jobs older than this are considered abandoned
+
+# Service transactions that lose a lock race (core.db.retry_on_lock)
+DB_LOCK_RETRIES = 5
+DB_LOCK_BACKOFF_SECONDS = 0.05  # doubled after every retry, with jitter
+
+# Order delivery to seller inboxes (orders.services.fanout)
+ORDERS_FANOUT_CHUNK_SIZE = 1000  # inbox rows per bulk_create / transaction
+# Full reload of orders.services.matching.SellerIndex (drops deleted sellers);
+# changed preferences are applied incrementally before every match.
+SELLER_INDEX_REBUILD_SECONDS = 300
+
+# Handbook autocomplete (handbooks.views.autocomplete)
+HANDBOOK_AUTOCOMPLETE_LIMIT = 10  # options per response
+HANDBOOK_AUTOCOMPLETE_MAX_QUERY = 50  # longer queries are truncated (keeps cache keys short)
+HANDBOOK_AUTOCOMPLETE_MAX_AGE = 300  # server cache lifetime of a rendered response, seconds
+
+# Part photos (orders.services.images)
+PART_IMAGES_PER_PART = 5
+PART_IMAGE_MAX_BYTES = 20 * 1024 * 1024
+PART_IMAGE_SIZES = {"small": 160, "medium": 640, "large": 1600}  # longest edge in px
+PART_IMAGE_QUALITY = 82  # JPEG quality of the variants
+PART_IMAGE_WORKERS = 2  # resizing processes per job worker
+PART_IMAGE_MAX_AGE = 60 * 60 * 24 * 365  # content-addressed: a URL never changes content
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 
 
@@ -25,10 +26,15 @@ INSTALLED_APPS = [
     'theme',
     'core',
     'users',
+    'handbooks',
+    'orders',
 ]
 
 MIDDLEWARE = [
+    'core.instrumentation.RequestInstrumentationMiddleware',
+    'core.db_routers.ReplicaStickinessMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.staticfiles.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -42,7 +48,10 @@ ROOT_URLCONF = 'czesci.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # django.template.backends.django.DjangoTemplates plus the rendering
+        # time reported by core.instrumentation.
+        'BACKEND': 'core.instrumentation.DjangoTemplates',
+        'NAME': 'django',
         'DIRS': [os.path.join(BASE_DIR, "templates")],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -58,16 +67,108 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'czesci.wsgi.application'
 
+# Build the URLconf, templates and translation catalogs when the wsgi/asgi
+# module is imported (core.warmup). Use with `gunicorn --preload` so workers
+# inherit them from the master.
+WARMUP_ON_LOAD = os.environ.get('DJANGO_WARMUP', '') == '1'
+
+# Serve login, registration and phone-settings from users.views_async. Enable
+# when running under ASGI (Gunicorn + UvicornWorker).
+USERS_ASYNC_VIEWS = os.environ.get('USERS_ASYNC_VIEWS', '') == '1'
+
+# SQLite tuned for concurrent requests: WAL lets readers run alongside the
+# single writer, BEGIN IMMEDIATE takes the write lock up front (a deferred
+# transaction upgrading its lock fails at once instead of waiting) and
+# `timeout` is the busy timeout in seconds. synchronous=NORMAL is durable
+# under WAL except for the last commits on power loss.
+SQLITE_OPTIONS = {
+    'init_command': (
+        'PRAGMA journal_mode=WAL;'
+        'PRAGMA synchronous=NORMAL;'
+        'PRAGMA mmap_size=268435456;'
+        'PRAGMA cache_size=-20000;'
+        'PRAGMA temp_store=MEMORY;'
+    ),
+    'transaction_mode': 'IMMEDIATE',
+    'timeout': 20,
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_OPTIONS,
+        # A file, not the shared-cache in-memory default: in-memory databases
+        # lock per table and ignore the busy timeout, so tests running
+        # concurrent writers would fail instead of waiting.
+        'TEST': {'NAME': os.path.join(tempfile.gettempdir(), 'czesci-test.sqlite3')},
     }
 }
 
+# Read replica (core.db_routers). Locally a second SQLite file kept in sync by
+# `manage.py replicate_sqlite`; tests mirror it to the primary.
+DATABASE_REPLICA_ALIAS = 'replica'
+if os.environ.get('SQLITE_REPLICA_PATH'):
+    DATABASES[DATABASE_REPLICA_ALIAS] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['SQLITE_REPLICA_PATH'],
+        'OPTIONS': SQLITE_OPTIONS,
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['core.db_routers.PrimaryReplicaRouter']
+# Apps whose reads may be served by the replica.
+REPLICA_READ_APPS = ('users', 'auth')
+# After writing, a client reads from the primary for this long (cookie based).
+REPLICA_STICKY_SECONDS = 10
+REPLICA_STICKY_COOKIE = 'db_primary_until'
+
+# OTP codes and attempt counters (users.services.otp) live here. Local memory is
+# per-process: point this at Memcached/Redis when running several workers.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Read-through cache for core.session_backend. The file store is shared by
+    # all worker processes on a host, so no Redis is needed.
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get(
+            'SESSION_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'czesci-sessions')
+        ),
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    },
+}
+# Changing the deploy version (e.g. git SHA set by CI) invalidates cached pages.
+DEPLOY_VERSION = os.environ.get('DEPLOY_VERSION', 'dev')
+
+# Anonymous full-page cache for landing pages (core.page_cache).
+PAGE_CACHE_ENABLED = not DEBUG
+PAGE_CACHE_TIMEOUT = 60 * 15
+
+# Request instrumentation (core.instrumentation). The Server-Timing header
+# exposes query counts, so it is only sent in development by default.
+SERVER_TIMING_ENABLED = DEBUG
+# Maximum number of SQL queries per view (dotted path or URL name).
+QUERY_BUDGETS = {
+    'login': 7,
+    'settings': 3,
+    'settings_buyer': 4,  # includes the ETag aggregate (users.fragments.etag)
+    'settings_seller': 4,
+    'phone_add': 6,
+    'phone_verify': 6,
+    'phone_deactivate': 6,
+    'phone_toggle_visibility': 6,
+    'handbook_autocomplete': 4,  # handbooks.search's version, plus 3 to (re)build its index
+}
+# Raise QueryBudgetExceeded instead of logging a warning (tests, benchmarks).
+QUERY_BUDGET_STRICT = False
 
 LOGIN_URL = "/login/"
 
+AUTHENTICATION_BACKENDS = [
+    'users.backends.IdentifierBackend',
+]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -83,8 +184,49 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+PASSWORD_HASHERS = [
+    'users.hashers.TunablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# PBKDF2 work factor (None = Django default). Stored hashes with a different
+# count are re-hashed transparently on the next successful login.
+PASSWORD_HASH_ITERATIONS = int(os.environ['PASSWORD_HASH_ITERATIONS']) if 'PASSWORD_HASH_ITERATIONS' in os.environ else None
+
+# Threads used by users.services.passwords to hash off the ASGI event loop
+# (None = the loop's default executor).
+PASSWORD_HASH_THREADS = None
+
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR.parent / 'staticfiles'
+
+# collectstatic writes content-hashed names plus .gz/.br variants (core.staticfiles).
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'core.staticfiles.CompressedManifestStaticFilesStorage'},
+}
+
+# Serve STATIC_ROOT from core.staticfiles.StaticFilesMiddleware when no web
+# server sits in front of Django. Run collectstatic before starting.
+STATIC_SERVE = os.environ.get('DJANGO_SERVE_STATIC', '') == '1'
+STATIC_MAX_AGE = 60 * 60 * 24 * 365  # hashed names never change content
+
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR.parent / 'media'
+# Part photos are streamed to disk and hashed on the way (core.uploads). Their
+# temporary files live on the media filesystem, so storing one is a rename;
+# the directory is created by the first upload.
+PART_IMAGE_UPLOAD_TEMP_DIR = MEDIA_ROOT / 'tmp'
+FILE_UPLOAD_PERMISSIONS = 0o644
+# Internal nginx location of MEDIA_ROOT (e.g. '/protected-media/'): media views
+# then answer with X-Accel-Redirect and nginx sends the file itself.
+MEDIA_ACCEL_REDIRECT = os.environ.get('DJANGO_MEDIA_ACCEL_REDIRECT', '')
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-SESSION_ENGINE = "django.contrib.sessions.backends.db"  # todo: move to redis
\ No newline at end of file
+# Cached DB sessions that only hit the database when session data changes.
+SESSION_ENGINE = "core.session_backend"
+SESSION_CACHE_ALIAS = "sessions"
\ No newline at end of file
@@ -2,15 +2,22 @@ from django.conf import settings
 from django.contrib import admin
 from django.urls import include
 from core import views as core_views
+from handbooks import views as handbook_views
+from orders import views as order_views
 from django.urls import path
 from users import views as user_views
+from users import views_async
+
+# Login, onboarding and phone-settings views have native async versions for
+# the ASGI deployment; the remaining views are shared.
+auth_views = views_async if settings.USERS_ASYNC_VIEWS else user_views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', core_views.home, name='home'),
-    path('login/', user_views.login_view, name='login'),
-    path('register/', user_views.register_view, name='register'),
-    path('verify-phone/', user_views.verify_phone_view, name='verify_phone'),
+    path('login/', auth_views.login_view, name='login'),
+    path('register/', auth_views.register_view, name='register'),
+    path('verify-phone/', auth_views.verify_phone_view, name='verify_phone'),
     path('register/buyer/', user_views.register_buyer_view, name='register_buyer'),
     path('register/seller/', user_views.register_seller_view, name='register_seller'),
     path('logout/', user_views.logout_view, name='logout'),
@@ -22,10 +29,17 @@ urlpatterns = [
     path('settings/', user_views.settings_view, name='settings'),
     path('settings/buyer/', user_views.buyer_settings_partial, name='settings_buyer'),
     path('settings/seller/', user_views.seller_settings_partial, name='settings_seller'),
-    path('settings/phone/add/', user_views.add_phone_view, name='phone_add'),
-    path('settings/phone/verify/<int:pk>/<str:profile_type>/', user_views.verify_phone_settings_view, name='phone_verify'),
-    path('settings/phone/deactivate/<int:pk>/', user_views.deactivate_phone_view, name='phone_deactivate'),
-    path('settings/phone/visibility/<int:pk>/', user_views.toggle_phone_visibility_view, name='phone_toggle_visibility'),
+    path('settings/phone/add/', auth_views.add_phone_view, name='phone_add'),
+    path('settings/phone/verify/<int:pk>/<str:profile_type>/', auth_views.verify_phone_settings_view, name='phone_verify'),
+    path('settings/phone/deactivate/<int:pk>/', auth_views.deactivate_phone_view, name='phone_deactivate'),
+    path('settings/phone/visibility/<int:pk>/', auth_views.toggle_phone_visibility_view, name='phone_toggle_visibility'),
+
+    # Order form autocomplete
+    path('handbooks/<str:kind>/autocomplete/', handbook_views.autocomplete, name='handbook_autocomplete'),
+
+    # Part photos
+    path('orders/parts/<int:pk>/images/', order_views.upload_part_images, name='part_images'),
+    path('part-images/<str:sha256>/<str:variant>/', order_views.part_image, name='part_image'),
 
 ]
 
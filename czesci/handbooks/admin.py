@@ -0,0 +1,25 @@
+from django.contrib import admin
+
+from .models import CarMake, CarModel, PartGroup
+
+NAME_FIELDS = ("name", "name_en", "name_pl", "name_ru", "name_uk")
+
+
+@admin.register(CarMake)
+class CarMakeAdmin(admin.ModelAdmin):
+    list_display = NAME_FIELDS
+    search_fields = NAME_FIELDS
+
+
+@admin.register(CarModel)
+class CarModelAdmin(admin.ModelAdmin):
+    list_display = ("make", *NAME_FIELDS)
+    list_select_related = ("make",)
+    search_fields = NAME_FIELDS
+    raw_id_fields = ("make",)
+
+
+@admin.register(PartGroup)
+class PartGroupAdmin(admin.ModelAdmin):
+    list_display = NAME_FIELDS
+    search_fields = NAME_FIELDS
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class HandbooksConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "handbooks"
+
+    def ready(self):
+        from handbooks import signals  # noqa: F401  register signal handlers
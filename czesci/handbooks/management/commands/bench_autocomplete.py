@@ -0,0 +1,153 @@
+"""Latency of the handbook autocomplete.
+
+Creates a synthetic handbook (``--makes`` makes with ``--models`` models
+each, ``--groups`` part groups, with Polish and Ukrainian translations) inside
+a transaction that is rolled back at the end, then reports p50/p99 of
+
+* ``HandbookIndex.search`` and the ``LIKE '%q%'`` query it replaces,
+* the autocomplete endpoint on a cache miss, a cache hit and a ``304``
+  revalidation,
+
+for random 1–6 character prefixes of the names in every language. It also
+checks that folded queries (``czesci``) find names with diacritics
+(``Części``). The command fails when the endpoint's p99 on a cache miss is
+above ``--budget-ms``.
+"""
+
+import random
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+from django.test import Client
+from django.urls import reverse
+
+from core.bench import measure
+from handbooks import search
+from handbooks.models import NAME_LANGUAGES, CarMake, CarModel, PartGroup
+
+PL_LETTERS = "aąbcćdeęfghijklłmnńoóprsśtuwyzźż"
+UK_LETTERS = "абвгґдеєжзиіїйклмнопрстуфхцчшщьюя"
+LATIN_LETTERS = "abcdefghijklmnoprstuvwyz"
+
+
+class Command(BaseCommand):
+    help = "Benchmark the handbook prefix index and autocomplete endpoint against LIKE queries."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--makes", type=int, default=300)
+        parser.add_argument("--models", type=int, default=30, help="Models per make.")
+        parser.add_argument("--groups", type=int, default=500)
+        parser.add_argument("--queries", type=int, default=500)
+        parser.add_argument("--budget-ms", type=float, default=5.0, help="Allowed endpoint p99 on a cache miss.")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        try:
+            with transaction.atomic():
+                self.run(options)
+                transaction.set_rollback(True)
+        finally:
+            search.invalidate()
+
+    def run(self, options):
+        self.setup(options["makes"], options["models"], options["groups"])
+        started = time.perf_counter()
+        search.invalidate()
+        index = search.handbook_index()
+        self.stdout.write(f"build: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        folded = search.search("groups", "czesci k", 10, language="pl")
+        labels = [label for _pk, label in folded]
+        if "Części karoserii" not in labels:
+            raise CommandError(f"'czesci k' did not find 'Części karoserii': {labels}")
+        self.stdout.write(f"fold: 'czesci k' -> {labels}")
+
+        queries = [self.query() for _ in range(options["queries"])]
+        self.stdout.write(f"{'':>16}{'p50 ms':>10}{'p99 ms':>10}")
+
+        pending = iter(queries)
+        self.report("index", measure(lambda: index.search(*next(pending), 10), len(queries)))
+        pending = iter(queries)
+        self.report("LIKE query", measure(lambda: self.like(*next(pending)), len(queries)))
+
+        client = Client(HTTP_HOST="localhost")
+        urls = [
+            f"{reverse('handbook_autocomplete', args=[kind])}?{urlencode({'q': query, 'lang': language})}"
+            for kind, query, language in queries
+        ]
+        cache.clear()
+        search.handbook_index()  # clearing the cache dropped its version
+        pending = iter(urls)
+        miss = measure(lambda: client.get(next(pending)), len(urls))
+        self.report("endpoint miss", miss)
+        pending = iter(urls)
+        self.report("endpoint hit", measure(lambda: client.get(next(pending)), len(urls)))
+        etags = {url: client.get(url)["ETag"] for url in urls}
+        pending = iter(urls)
+
+        def revalidate():
+            url = next(pending)
+            if client.get(url, HTTP_IF_NONE_MATCH=etags[url]).status_code != 304:
+                raise CommandError(f"{url} was not answered with 304.")
+
+        self.report("endpoint 304", measure(revalidate, len(urls)))
+
+        if miss["p99_ms"] > options["budget_ms"]:
+            raise CommandError(f"Endpoint p99 {miss['p99_ms']:.2f} ms is above {options['budget_ms']} ms.")
+
+    def report(self, label: str, stats: dict) -> None:
+        self.stdout.write(f"{label:>16}{stats['p50_ms']:>10.3f}{stats['p99_ms']:>10.3f}")
+
+    def query(self) -> tuple[str, str, str]:
+        """``(kind, prefix, language)`` of a random name, as a user would type it."""
+        kind = self.random.choice(list(search.KINDS))
+        language = self.random.choice(NAME_LANGUAGES)
+        entry = search.KINDS[kind].objects.order_by("?").first()
+        name = getattr(entry, f"name_{language}") or entry.name
+        prefix = name[: self.random.randint(1, 6)]
+        if self.random.random() < 0.5:
+            prefix = search.fold(prefix)
+        return kind, prefix, language
+
+    @staticmethod
+    def like(kind: str, query: str, language: str):
+        condition = Q(name__icontains=query) | Q(**{f"name_{language}__icontains": query})
+        return list(search.KINDS[kind].objects.filter(condition).values_list("pk", "name")[:10])
+
+    def word(self, letters: str) -> str:
+        return "".join(self.random.choice(letters) for _ in range(self.random.randint(3, 10))).capitalize()
+
+    def localized(self, **fields) -> dict:
+        name = " ".join(self.word(LATIN_LETTERS) for _ in range(self.random.randint(1, 2)))
+        return {
+            "name": name,
+            "name_en": name,
+            "name_pl": self.word(PL_LETTERS),
+            "name_uk": self.word(UK_LETTERS),
+            **fields,
+        }
+
+    def setup(self, makes: int, models: int, groups: int) -> None:
+        names = set()
+
+        def unique(fields):
+            while (fields["name"], fields.get("make")) in names:
+                fields["name"] += "x"
+            names.add((fields["name"], fields.get("make")))
+            return fields
+
+        created = CarMake.objects.bulk_create(CarMake(**unique(self.localized())) for _ in range(makes))
+        CarModel.objects.bulk_create(
+            (CarModel(**unique(self.localized(make=make))) for make in created for _ in range(models)),
+            batch_size=1000,
+        )
+        PartGroup.objects.bulk_create(
+            [PartGroup(**unique(self.localized())) for _ in range(groups)]
+            + [PartGroup(name="Bench body parts", name_pl="Części karoserii", name_uk="Кузовні деталі")],
+            batch_size=1000,
+        )
@@ -0,0 +1,68 @@
+"""Upsert a handbook (makes, models or part groups) from a CSV or JSONL file.
+
+Import makes before their models. Re-running with the same file is safe and
+only reads; ``--delete`` also removes the rows missing from the file, and
+``--dry-run`` reports the change set without writing anything.
+"""
+
+import os
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.datafiles import read_columns, read_rows
+from handbooks import search
+from handbooks.services.importer import HandbookImporter
+
+
+class Command(BaseCommand):
+    help = "Import CarMake, CarModel or PartGroup rows from CSV/JSONL as a chunked upsert."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=list(search.KINDS))
+        parser.add_argument("path", help="CSV (with header) or .jsonl file.")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--delete", action="store_true", help="Delete rows missing from the file.")
+        parser.add_argument("--dry-run", action="store_true", help="Report the changes without writing them.")
+        parser.add_argument("--trace-memory", action="store_true", help="Report peak Python memory (slower).")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.exists(path):
+            raise CommandError(f"File not found: {path}")
+
+        importer = HandbookImporter(
+            options["kind"],
+            read_columns(path),
+            chunk_size=options["chunk_size"],
+            delete=options["delete"],
+            dry_run=options["dry_run"],
+            on_error=lambda line_no, error: self.stderr.write(f"line {line_no}: {error}"),
+        )
+        if problems := importer.column_errors():
+            raise CommandError(" ".join(problems))
+        if options["trace_memory"]:
+            tracemalloc.start()
+        started = time.perf_counter()
+        processed = 0
+        for processed in importer.run(read_rows(path, importer.error)):
+            if options["verbosity"] > 1:
+                elapsed = time.perf_counter() - started
+                self.stdout.write(f"line {processed}: {processed / elapsed:.0f} rows/s")
+        elapsed = time.perf_counter() - started
+
+        if options["delete"] and importer.invalid:
+            self.stderr.write("Invalid rows: nothing was deleted.")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{'Dry run' if options['dry_run'] else 'Done'}: {processed} rows in {elapsed:.1f}s "
+                f"({processed / elapsed if elapsed else 0:.0f} rows/s), {importer.created} created, "
+                f"{importer.updated} updated, {importer.unchanged} unchanged, {importer.deleted} deleted, "
+                f"{importer.protected} protected, {importer.invalid} invalid."
+            )
+        )
+        if options["trace_memory"]:
+            self.stdout.write(f"Peak memory: {tracemalloc.get_traced_memory()[1] / 1024:.0f} KiB")
+            tracemalloc.stop()
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CarMake',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('name_en', models.CharField(blank=True, max_length=100)),
+                ('name_pl', models.CharField(blank=True, max_length=100)),
+                ('name_ru', models.CharField(blank=True, max_length=100)),
+                ('name_uk', models.CharField(blank=True, max_length=100)),
+            ],
+            options={
+                'ordering': ['name'],
+                'constraints': [models.UniqueConstraint(fields=('name',), name='carmake_name_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PartGroup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('name_en', models.CharField(blank=True, max_length=100)),
+                ('name_pl', models.CharField(blank=True, max_length=100)),
+                ('name_ru', models.CharField(blank=True, max_length=100)),
+                ('name_uk', models.CharField(blank=True, max_length=100)),
+            ],
+            options={
+                'ordering': ['name'],
+                'constraints': [models.UniqueConstraint(fields=('name',), name='partgroup_name_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CarModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('name_en', models.CharField(blank=True, max_length=100)),
+                ('name_pl', models.CharField(blank=True, max_length=100)),
+                ('name_ru', models.CharField(blank=True, max_length=100)),
+                ('name_uk', models.CharField(blank=True, max_length=100)),
+                ('make', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='car_models', to='handbooks.carmake')),
+            ],
+            options={
+                'ordering': ['name'],
+                'constraints': [models.UniqueConstraint(fields=('make', 'name'), name='carmodel_make_name_unique')],
+            },
+        ),
+    ]
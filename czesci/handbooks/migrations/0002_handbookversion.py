@@ -0,0 +1,26 @@
+"""Keep the handbook index version in the database (``handbooks.search``)."""
+
+from django.db import migrations, models
+
+
+def create_version(apps, schema_editor):
+    HandbookVersion = apps.get_model("handbooks", "HandbookVersion")
+    HandbookVersion.objects.using(schema_editor.connection.alias).get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('handbooks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HandbookVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_version, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+from django.db import models
+from django.utils import translation
+
+# Languages with a ``name_<code>`` column (LANGUAGES plus Russian, see the parts-order doc).
+NAME_LANGUAGES = ("en", "pl", "ru", "uk")
+
+
+class LocalizedName(models.Model):
+    """``name`` (the catalogue name, used as natural key) and one translation per language.
+
+    Empty translations fall back to ``name``.
+    """
+
+    name = models.CharField(max_length=100)
+    name_en = models.CharField(max_length=100, blank=True)
+    name_pl = models.CharField(max_length=100, blank=True)
+    name_ru = models.CharField(max_length=100, blank=True)
+    name_uk = models.CharField(max_length=100, blank=True)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def localized_name(self) -> str:
+        code = (translation.get_language() or "en").split("-")[0]
+        return getattr(self, f"name_{code}", "") or self.name
+
+    def __str__(self) -> str:  # noqa: DunderStr
+        return self.localized_name
+
+
+class CarMake(LocalizedName):
+    """Vehicle manufacturer (``Volkswagen``)."""
+
+    class Meta:
+        ordering = ["name"]
+        constraints = [models.UniqueConstraint(fields=["name"], name="carmake_name_unique")]
+
+
+class CarModel(LocalizedName):
+    """Model of a ``CarMake`` (``Golf``)."""
+
+    make = models.ForeignKey(CarMake, on_delete=models.CASCADE, related_name="car_models")
+
+    class Meta:
+        ordering = ["name"]
+        constraints = [models.UniqueConstraint(fields=["make", "name"], name="carmodel_make_name_unique")]
+
+
+class PartGroup(LocalizedName):
+    """Group of parts a request belongs to (``Brakes``, ``Engine``)."""
+
+    class Meta:
+        ordering = ["name"]
+        constraints = [models.UniqueConstraint(fields=["name"], name="partgroup_name_unique")]
+
+
+class HandbookVersion(models.Model):
+    """Single row counting handbook changes (``handbooks.search.invalidate``).
+
+    Kept in the database, so every process and management command sees a bump.
+    """
+
+    version = models.PositiveBigIntegerField(default=0)
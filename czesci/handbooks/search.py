@@ -0,0 +1,156 @@
+"""Prefix search over handbook names for the order form's autocomplete.
+
+Every process keeps a ``HandbookIndex``: per handbook kind (``makes``,
+``models``, ``groups``) and language in ``NAME_LANGUAGES`` two sorted
+arrays of folded keys,
+
+* the whole name, ranked first, and
+* every later word of it (``romeo`` for ``Alfa Romeo``),
+
+searched with ``bisect``, so a lookup costs O(log n) plus the matches
+returned instead of a ``LIKE '%q%'`` scan per keystroke. A language indexes
+its translation and the catalogue ``name``, so Latin spellings match in every
+language. Car models are additionally indexed per make.
+
+Keys and queries are folded (``fold``): case-folded, diacritics removed and
+letters without a decomposition (``ł``, ``ø``) mapped by hand, so
+``Czesci`` finds ``Części`` and ``ежик`` finds ``ёжик``.
+
+The index is built on the first search in a process. Saving or deleting a
+handbook entry bumps the ``HandbookVersion`` row (``handbooks.signals``, or
+``invalidate()`` after bulk changes such as ``import_handbook``); a search
+reads the version (one primary-key query) and the process rebuilds when its
+index is older. The version lives in the database, not the per-process
+default cache, so every worker sees a bump made by any other process.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Iterable
+
+from django.db.models import F
+from django.utils import translation
+
+from handbooks.models import NAME_LANGUAGES, CarMake, CarModel, HandbookVersion, PartGroup
+
+KINDS = {"makes": CarMake, "models": CarModel, "groups": PartGroup}
+
+# Latin letters NFKD does not split into base letter + combining mark.
+_LETTERS = str.maketrans({"ł": "l", "Ł": "L", "ø": "o", "Ø": "O", "đ": "d", "Đ": "D", "ı": "i", "æ": "ae", "Æ": "AE"})
+_SEPARATORS = re.compile(r"[\s\-/.,()]+")
+
+
+def fold(text: str) -> str:
+    """*text* lower-cased, without diacritics and with single spaces between words."""
+    decomposed = unicodedata.normalize("NFKD", text.translate(_LETTERS))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(_SEPARATORS.sub(" ", stripped.casefold()).split())
+
+
+def invalidate() -> None:
+    """Make every process rebuild its index on the next search."""
+    if not HandbookVersion.objects.filter(pk=1).update(version=F("version") + 1):
+        HandbookVersion.objects.get_or_create(pk=1, defaults={"version": 1})
+
+
+def version() -> int:
+    return HandbookVersion.objects.filter(pk=1).values_list("version", flat=True).first() or 0
+
+
+def language_code(language: str | None = None) -> str:
+    """*language* (or the active one) reduced to one of ``NAME_LANGUAGES``."""
+    code = (language or translation.get_language() or "en").split("-")[0]
+    return code if code in NAME_LANGUAGES else NAME_LANGUAGES[0]
+
+
+class PrefixIndex:
+    """Sorted ``(key, id)`` pairs searched with ``bisect``."""
+
+    __slots__ = ("keys", "ids")
+
+    def __init__(self, pairs: Iterable[tuple[str, int]]):
+        pairs = sorted(set(pairs))
+        self.keys = [key for key, _ in pairs]
+        self.ids = [pk for _, pk in pairs]
+
+    def search(self, prefix: str, limit: int, found: list[int]) -> None:
+        """Append ids of keys starting with *prefix* to *found* until it holds *limit* ids."""
+        for position in range(bisect_left(self.keys, prefix), len(self.keys)):
+            if len(found) >= limit or not self.keys[position].startswith(prefix):
+                return
+            if self.ids[position] not in found:
+                found.append(self.ids[position])
+
+
+class HandbookIndex:
+    """The prefix indexes of every handbook; see the module docstring."""
+
+    def __init__(self, version: int):
+        self.version = version
+        # (kind, language) -> {id: label}
+        self.labels: dict[tuple[str, str], dict[int, str]] = {}
+        # (kind, make_id or None, language) -> (names, words)
+        self.indexes: dict[tuple[str, int | None, str], tuple[PrefixIndex, PrefixIndex]] = {}
+
+    def search(self, kind: str, query: str, language: str, limit: int, make_id: int | None = None):
+        """Up to *limit* ``(id, label)`` pairs whose name starts with *query*."""
+        prefix = fold(query)
+        indexes = self.indexes.get((kind, make_id, language))
+        if not prefix or indexes is None:
+            return []
+        found: list[int] = []
+        for index in indexes:
+            index.search(prefix, limit, found)
+        labels = self.labels[kind, language]
+        return [(pk, labels[pk]) for pk in found]
+
+    @classmethod
+    def build(cls, version: int) -> "HandbookIndex":
+        """Load every handbook (one query per kind) into a new index."""
+        index = cls(version)
+        name_fields = [f"name_{code}" for code in NAME_LANGUAGES]
+        for kind, model in KINDS.items():
+            scoped = model is CarModel
+            rows = model.objects.values_list("pk", "name", *name_fields, *(["make_id"] if scoped else []))
+            names = {code: defaultdict(list) for code in NAME_LANGUAGES}
+            words = {code: defaultdict(list) for code in NAME_LANGUAGES}
+            for pk, name, *rest in rows:
+                scopes = (None, rest.pop()) if scoped else (None,)
+                folded = fold(name)
+                for code, translated in zip(NAME_LANGUAGES, rest):
+                    index.labels.setdefault((kind, code), {})[pk] = translated or name
+                    keys = {folded, fold(translated)} if translated and translated != name else {folded}
+                    for key in keys:
+                        word_keys = [(key[match.end() :], pk) for match in re.finditer(" ", key)]
+                        for scope in scopes:
+                            names[code][scope].append((key, pk))
+                            words[code][scope].extend(word_keys)
+            for code in NAME_LANGUAGES:
+                for scope, pairs in names[code].items():
+                    index.indexes[kind, scope, code] = (PrefixIndex(pairs), PrefixIndex(words[code][scope]))
+        return index
+
+
+_index: HandbookIndex | None = None
+_index_lock = threading.Lock()
+
+
+def handbook_index() -> HandbookIndex:
+    """This process's ``HandbookIndex``, rebuilt when the handbooks changed."""
+    global _index  # pylint: disable=global-statement
+    current = version()
+    if _index is None or _index.version != current:
+        with _index_lock:
+            if _index is None or _index.version != current:
+                _index = HandbookIndex.build(current)
+    return _index
+
+
+def search(kind: str, query: str, limit: int, language: str | None = None, make_id: int | None = None):
+    """``(id, label)`` pairs of *kind* entries whose name starts with *query* in *language*."""
+    return handbook_index().search(kind, query, language_code(language), limit, make_id)
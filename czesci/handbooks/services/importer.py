@@ -0,0 +1,241 @@
+"""Upsert import of the vehicle and part-group handbooks from CSV or JSONL.
+
+Rows are keyed by their natural key, ``name`` for makes and part groups and
+``(make, name)`` for models (``make`` being the make's catalogue name). The
+file is read in chunks of ``chunk_size`` rows; per chunk the existing rows
+with those keys are fetched in one query and the chunk is applied in its own
+transaction with one ``bulk_create`` for new keys and one ``bulk_update`` for
+rows whose translations differ. Unchanged rows are not written, so
+re-importing an unchanged file only reads.
+
+With ``delete`` the rows missing from the file are deleted afterwards, in
+primary-key ranges of ``chunk_size``. The keys seen in the file are
+remembered as one bit per primary key, so memory stays bounded by one chunk
+whatever the size of the file. Rows still referenced by orders are kept and
+counted as ``protected``.
+
+Expected columns (CSV header, or the keys of the JSONL objects): ``name``,
+``make`` (models only) and any of ``name_en``, ``name_pl``, ``name_ru``,
+``name_uk``. ``column_errors`` reports missing key columns and unknown ones.
+Translation columns missing from the file are left untouched. Invalid rows
+are passed to ``on_error`` and only counted.
+"""
+
+from __future__ import annotations
+
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Tuple
+
+from django.db import transaction
+from django.db.models import ProtectedError
+
+from core.datafiles import cell
+from core.db import retry_on_lock
+from handbooks import search
+from handbooks.models import NAME_LANGUAGES, CarMake, CarModel
+
+TRANSLATION_FIELDS = tuple(f"name_{code}" for code in NAME_LANGUAGES)
+
+
+class HandbookImporter:
+    """Diff and apply rows of one handbook in chunks; see the module docstring."""
+
+    def __init__(
+        self,
+        kind: str,
+        columns: Iterable[str],
+        chunk_size: int = 1000,
+        delete: bool = False,
+        dry_run: bool = False,
+        on_error: Callable[[int, str], None] | None = None,
+    ):
+        self.model = search.KINDS[kind]
+        self.scoped = self.model is CarModel
+        self.columns = list(columns)
+        self.fields = tuple(field for field in TRANSLATION_FIELDS if field in self.columns)
+        self.chunk_size = chunk_size
+        self.delete = delete
+        self.dry_run = dry_run
+        self.on_error = on_error
+        self.makes: dict[str, int] = {}
+        # bit n set: the row with primary key n is in the file
+        self.seen = bytearray()
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.deleted = 0
+        self.protected = 0
+        self.invalid = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.created or self.updated or self.deleted)
+
+    # ---------------------------------------------------
+    # Validation
+    # ---------------------------------------------------
+
+    def column_errors(self) -> list[str]:
+        """Problems with the file's columns; a file with any is not imported."""
+        required = ("make", "name") if self.scoped else ("name",)
+        problems = [f"Missing column {column!r}." for column in required if column not in self.columns]
+        unknown = [column for column in self.columns if column not in {*required, *TRANSLATION_FIELDS}]
+        if unknown:
+            problems.append(
+                f"Unknown columns {', '.join(map(repr, unknown))}; "
+                f"expected {', '.join((*required, *TRANSLATION_FIELDS))}."
+            )
+        return problems
+
+    def error(self, line_no: int, message: str) -> None:
+        """Count an invalid row and report it to ``on_error``."""
+        self.invalid += 1
+        if self.on_error is not None:
+            self.on_error(line_no, message)
+
+    def validate(self, line_no: int, row: dict) -> tuple[tuple, dict] | None:
+        """Return ``(natural_key, values)`` for *row* or report an error and return ``None``."""
+        name = cell(row, "name")
+        values = {field: cell(row, field) for field in self.fields}
+        problems = [
+            f"{field}: Ensure this value has at most 100 characters."
+            for field, value in {"name": name, **values}.items()
+            if len(value) > 100
+        ]
+        if not name:
+            problems.append("name: This field is required.")
+
+        key: tuple = (name,)
+        if self.scoped:
+            make = cell(row, "make")
+            if make not in self.makes:
+                problems.append(f"make: Unknown make {make!r}.")
+            key = (self.makes.get(make), name)
+
+        if problems:
+            self.error(line_no, "; ".join(problems))
+            return None
+        return key, values
+
+    # ---------------------------------------------------
+    # Import
+    # ---------------------------------------------------
+
+    def run(self, rows: Iterable[Tuple[int, dict]]) -> Iterator[int]:
+        """Upsert *rows*, yielding the last line number of every applied chunk."""
+        if self.scoped:
+            self.makes = dict(CarMake.objects.values_list("name", "pk"))
+        rows = iter(rows)
+        while chunk := list(islice(rows, self.chunk_size)):
+            cleaned = {}
+            for line_no, row in chunk:
+                if (result := self.validate(line_no, row)) is None:
+                    continue
+                key, values = result
+                if key in cleaned:
+                    self.error(line_no, f"Duplicate of line {cleaned[key][0]}.")
+                    continue
+                cleaned[key] = (line_no, values)
+            if cleaned:
+                self.apply_chunk({key: values for key, (_, values) in cleaned.items()})
+            yield chunk[-1][0]
+
+        if self.delete and not self.invalid:
+            self.delete_missing()
+        if self.changed and not self.dry_run:
+            search.invalidate()
+
+    @retry_on_lock
+    @transaction.atomic
+    def apply_chunk(self, rows: dict[tuple, dict]) -> None:
+        existing = self.existing(rows)
+        created, updated = [], []
+        for key, values in rows.items():
+            if key not in existing:
+                created.append(self.model(**self.key_fields(key), **values))
+                continue
+            pk, current = existing[key]
+            self.mark(pk)
+            if any(current[field] != value for field, value in values.items()):
+                updated.append(self.model(pk=pk, **values))
+            else:
+                self.unchanged += 1
+
+        if not self.dry_run:
+            self.model.objects.bulk_create(created)
+            if updated:
+                self.model.objects.bulk_update(updated, self.fields)
+            if created and self.delete:
+                # Re-read ids by natural key: bulk_create cannot return pks on MySQL.
+                for pk, _ in self.existing({self.natural_key(obj): None for obj in created}).values():
+                    self.mark(pk)
+        self.created += len(created)
+        self.updated += len(updated)
+
+    def existing(self, rows: dict[tuple, object]) -> dict[tuple, tuple[int, dict]]:
+        """``{natural_key: (pk, translations)}`` of the stored rows among *rows*' keys."""
+        queryset = self.model.objects.filter(name__in={key[-1] for key in rows})
+        if self.scoped:
+            queryset = queryset.filter(make_id__in={key[0] for key in rows})
+        key_fields = ("make_id", "name") if self.scoped else ("name",)
+        found = {}
+        for pk, *values in queryset.values_list("pk", *key_fields, *self.fields):
+            key = tuple(values[: len(key_fields)])
+            if key in rows:
+                found[key] = (pk, dict(zip(self.fields, values[len(key_fields) :])))
+        return found
+
+    def key_fields(self, key: tuple) -> dict:
+        return {"make_id": key[0], "name": key[1]} if self.scoped else {"name": key[0]}
+
+    def natural_key(self, obj) -> tuple:
+        return (obj.make_id, obj.name) if self.scoped else (obj.name,)
+
+    # ---------------------------------------------------
+    # Deletion of rows missing from the file
+    # ---------------------------------------------------
+
+    def mark(self, pk: int) -> None:
+        byte = pk >> 3
+        if byte >= len(self.seen):
+            self.seen.extend(bytes(byte - len(self.seen) + 1))
+        self.seen[byte] |= 1 << (pk & 7)
+
+    def is_marked(self, pk: int) -> bool:
+        byte = pk >> 3
+        return byte < len(self.seen) and bool(self.seen[byte] & (1 << (pk & 7)))
+
+    def delete_missing(self) -> None:
+        last_pk = 0
+        while True:
+            pks = list(
+                self.model.objects.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[
+                    : self.chunk_size
+                ]
+            )
+            if not pks:
+                return
+            last_pk = pks[-1]
+            missing = [pk for pk in pks if not self.is_marked(pk)]
+            if missing:
+                self.delete_chunk(missing)
+
+    @retry_on_lock
+    @transaction.atomic
+    def delete_chunk(self, pks: list[int]) -> None:
+        if self.dry_run:
+            self.deleted += len(pks)
+            return
+        try:
+            with transaction.atomic():
+                self.deleted += self.model.objects.filter(pk__in=pks).delete()[1].get(self.model._meta.label, 0)
+        except ProtectedError:
+            # Some rows are used by orders: delete the others one by one.
+            for pk in pks:
+                try:
+                    with transaction.atomic():
+                        self.deleted += self.model.objects.filter(pk=pk).delete()[1].get(
+                            self.model._meta.label, 0
+                        )
+                except ProtectedError:
+                    self.protected += 1
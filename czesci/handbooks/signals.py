@@ -0,0 +1,16 @@
+"""Signal handlers invalidating the handbook prefix index (``handbooks.search``)."""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from handbooks import search
+from handbooks.models import CarMake, CarModel, PartGroup
+
+
+@receiver([post_save, post_delete], sender=CarMake)
+@receiver([post_save, post_delete], sender=CarModel)
+@receiver([post_save, post_delete], sender=PartGroup)
+def invalidate_index(sender, instance, **kwargs):
+    # After commit, so no process rebuilds from data it cannot see yet.
+    transaction.on_commit(search.invalidate)
@@ -0,0 +1,75 @@
+"""Handbook autocomplete queries and the ``import_handbook`` command."""
+
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from handbooks import search
+from handbooks.models import CarMake, CarModel, HandbookVersion, PartGroup
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class AutocompleteQueryTests(TestCase):
+    def setUp(self):
+        make = CarMake.objects.create(name="Alfa Romeo")
+        CarModel.objects.create(make=make, name="Giulia")
+        PartGroup.objects.create(name="Body parts", name_pl="Części karoserii")
+        search.invalidate()
+
+    def test_index_is_built_once_then_searched_with_a_version_check(self):
+        url = reverse("handbook_autocomplete", args=["groups"])
+        # the version, then one query per handbook kind to build the index
+        with self.assertNumQueries(4):
+            response = self.client.get(url, {"q": "czesci", "lang": "pl"})
+        self.assertContains(response, "Części karoserii")
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("handbook_autocomplete", args=["makes"]), {"q": "rom"})
+        self.assertContains(response, "Alfa Romeo")
+
+    def test_index_is_rebuilt_after_a_change_in_another_process(self):
+        self.assertEqual(search.search("groups", "eng", 10), [])
+        # What another process (a web worker, import_handbook) leaves behind:
+        # new rows and a bumped version row, but nothing in this process's cache.
+        PartGroup.objects.bulk_create([PartGroup(name="Engine")])
+        HandbookVersion.objects.filter(pk=1).update(version=F("version") + 1)
+        cache.clear()
+
+        self.assertEqual([label for _pk, label in search.search("groups", "eng", 10)], ["Engine"])
+
+
+class ImportHandbookColumnTests(TestCase):
+    def import_file(self, kind: str, name: str, content: str) -> str:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, name)
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write(content)
+            stdout = StringIO()
+            call_command("import_handbook", kind, path, stdout=stdout, stderr=StringIO())
+        return stdout.getvalue()
+
+    def test_jsonl_translations_come_from_every_row(self):
+        self.import_file("groups", "groups.jsonl", '{"name": "Engine"}\n{"name": "Body", "name_pl": "Karoseria"}\n')
+        self.assertEqual(PartGroup.objects.get(name="Body").name_pl, "Karoseria")
+
+    def test_jsonl_numbers_are_read_as_names(self):
+        CarMake.objects.create(name="Fiat")
+        rows = '{"make": "Fiat", "name": 500}\n{"make": "Fiat", "name": null}\n'
+        output = self.import_file("models", "models.jsonl", rows)
+        self.assertTrue(CarModel.objects.filter(make__name="Fiat", name="500").exists())
+        self.assertIn("1 created", output)
+        self.assertIn("1 invalid", output)
+
+    def test_unknown_column_is_reported(self):
+        with self.assertRaisesMessage(CommandError, "Unknown columns 'nazwa_pl'"):
+            self.import_file("groups", "groups.csv", "name,nazwa_pl\nBody,Karoseria\n")
+        self.assertFalse(PartGroup.objects.exists())
+
+    def test_missing_key_column_is_reported(self):
+        with self.assertRaisesMessage(CommandError, "Missing column 'make'."):
+            self.import_file("models", "models.csv", "name,name_pl\nGiulia,Giulia\n")
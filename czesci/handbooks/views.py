@@ -0,0 +1,50 @@
+"""HTMX autocomplete over the handbooks (``handbooks.search``)."""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.views.decorators.http import require_GET
+
+from handbooks import search
+
+
+@require_GET
+def autocomplete(request, kind: str):
+    """Options for ``?q=<prefix>`` (and ``&make=<id>`` for models) as an HTML fragment.
+
+    The language is ``?lang=`` or the active one. Rendered fragments are cached
+    under the handbook version, so an edit in the handbooks invalidates them.
+    Browsers revalidate every response (``no-cache``) against its ``ETag``,
+    which changes with the version, so they never keep showing stale options.
+    """
+    if kind not in search.KINDS:
+        raise Http404
+    query = search.fold(request.GET.get("q", ""))[: settings.HANDBOOK_AUTOCOMPLETE_MAX_QUERY]
+    language = search.language_code(request.GET.get("lang"))
+    make_id = request.GET.get("make", "")
+    make_id = int(make_id) if kind == "models" and make_id.isdigit() else None
+
+    index = search.handbook_index()
+    digest = hashlib.md5(
+        f"{index.version}:{kind}:{language}:{make_id}:{query}".encode(), usedforsecurity=False
+    ).hexdigest()
+    key, etag = f"handbooks:autocomplete:{digest}", f'"{digest}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        content = cache.get(key)
+        if content is None:
+            results = index.search(kind, query, language, settings.HANDBOOK_AUTOCOMPLETE_LIMIT, make_id)
+            content = render_to_string(
+                "handbooks/autocomplete.html", {"kind": kind, "query": query, "results": results}
+            )
+            cache.set(key, content, settings.HANDBOOK_AUTOCOMPLETE_MAX_AGE)
+        response = HttpResponse(content)
+
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, no_cache=True)
+    patch_vary_headers(response, ("Accept-Language",))
+    return response
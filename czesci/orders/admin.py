@@ -0,0 +1,45 @@
+from django.contrib import admin
+
+from .models import BuyerOrder, PartImage, PartRequest, SellerInbox, SellerPreference, Vehicle
+
+
+class VehicleInline(admin.StackedInline):
+    model = Vehicle
+    raw_id_fields = ("make", "model")
+
+
+class PartRequestInline(admin.TabularInline):
+    model = PartRequest
+    extra = 0
+    raw_id_fields = ("group",)
+
+
+@admin.register(BuyerOrder)
+class BuyerOrderAdmin(admin.ModelAdmin):
+    list_display = ("id", "buyer_profile", "status", "created_at")
+    list_filter = ("status",)
+    raw_id_fields = ("buyer_profile",)
+    inlines = (VehicleInline, PartRequestInline)
+
+
+@admin.register(PartImage)
+class PartImageAdmin(admin.ModelAdmin):
+    list_display = ("sha256", "part_request", "content_type", "size", "variants_ready", "created_at")
+    list_filter = ("variants_ready",)
+    raw_id_fields = ("part_request",)
+    search_fields = ("sha256",)
+
+
+@admin.register(SellerPreference)
+class SellerPreferenceAdmin(admin.ModelAdmin):
+    list_display = ("seller", "sells_new", "sells_used", "sells_original", "sells_aftermarket", "updated_at")
+    raw_id_fields = ("seller",)
+    filter_horizontal = ("makes", "part_groups")
+
+
+@admin.register(SellerInbox)
+class SellerInboxAdmin(admin.ModelAdmin):
+    list_display = ("order", "seller", "created_at", "read_at")
+    raw_id_fields = ("order", "seller")
+    # Counting millions of inbox rows on every page load is not worth it.
+    show_full_result_count = False
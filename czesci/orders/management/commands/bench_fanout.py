@@ -0,0 +1,121 @@
+"""Order submission latency and fan-out to a large number of sellers.
+
+Creates ``--sellers`` seller profiles, then
+
+* times ``OrderService.submit`` (what the buyer waits for) over ``--orders``
+  submissions,
+* runs the ``orders.fan_out`` job of one order and reports its duration
+  and inbox rows per second, then the peak Python memory of another run
+  (``tracemalloc``).
+
+Compare chunk sizes with ``--chunk-size 100 1000 5000``. Everything created
+is deleted afterwards.
+"""
+
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from core.bench import measure
+from core.models import Job
+from handbooks.models import CarMake, CarModel, PartGroup
+from orders.models import BuyerOrder, SellerInbox, SellerPreference
+from orders.services.fanout import FanOutService
+from orders.services.matching import seller_index
+from orders.services.orders import OrderService
+from users.models import BuyerProfile, SellerProfile
+
+User = get_user_model()
+
+USERNAME_PREFIX = "bench_fanout_"
+HANDBOOK_NAME = "Bench fan-out"
+
+
+class Command(BaseCommand):
+    help = "Benchmark order submission and fan-out of one order to many seller inboxes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sellers", type=int, default=10_000)
+        parser.add_argument("--orders", type=int, default=50, help="Submissions to time.")
+        parser.add_argument("--chunk-size", type=int, nargs="+", default=[settings.ORDERS_FANOUT_CHUNK_SIZE])
+
+    def handle(self, *args, **options):
+        try:
+            buyer = self.setup(options["sellers"])
+            seller_index().build()
+            vehicle, parts = self.order_data()
+
+            with CaptureQueriesContext(connection) as ctx:
+                OrderService.submit(buyer, vehicle, parts)
+            stats = measure(lambda: OrderService.submit(buyer, vehicle, parts), options["orders"])
+            self.stdout.write(
+                f"submit: p50 {stats['p50_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms, "
+                f"{len(ctx.captured_queries)} queries"
+            )
+
+            self.stdout.write(f"{'chunk':>8}{'sellers':>10}{'seconds':>10}{'rows/s':>10}{'peak KiB':>10}")
+            for chunk_size in options["chunk_size"]:
+                order = OrderService.submit(buyer, vehicle, parts)
+                started = time.perf_counter()
+                delivered = FanOutService.deliver(order.pk, chunk_size)
+                elapsed = time.perf_counter() - started
+                if SellerInbox.objects.filter(order=order).count() != delivered:
+                    raise CommandError("Inbox row count does not match the number of delivered sellers.")
+
+                # Memory in a separate pass: tracing slows the fan-out down several times.
+                order = OrderService.submit(buyer, vehicle, parts)
+                tracemalloc.start()
+                FanOutService.deliver(order.pk, chunk_size)
+                peak = tracemalloc.get_traced_memory()[1] / 1024
+                tracemalloc.stop()
+                self.stdout.write(
+                    f"{chunk_size:>8}{delivered:>10}{elapsed:>10.2f}{delivered / elapsed:>10.0f}{peak:>10.0f}"
+                )
+        finally:
+            self.cleanup()
+
+    @staticmethod
+    @transaction.atomic
+    def setup(sellers: int) -> BuyerProfile:
+        users = User.objects.bulk_create(
+            User(username=f"{USERNAME_PREFIX}{number}", password="!") for number in range(sellers + 1)
+        )
+        if not users[0].pk:  # backends without RETURNING on bulk inserts
+            users = list(User.objects.filter(username__startswith=USERNAME_PREFIX).order_by("pk"))
+        sellers = SellerProfile.objects.bulk_create(
+            (
+                SellerProfile(user=user, business_name=f"Seller {user.pk}", business_address="-", nip="0000000000")
+                for user in users[1:]
+            ),
+            batch_size=1000,
+        )
+        if sellers and not sellers[0].pk:
+            sellers = SellerProfile.objects.filter(user__username__startswith=USERNAME_PREFIX)
+        # bulk_create sends no post_save, so create the default preferences here.
+        SellerPreference.objects.bulk_create((SellerPreference(seller=seller) for seller in sellers), batch_size=1000)
+        return BuyerProfile.objects.create(user=users[0], delivery_address="-")
+
+    @staticmethod
+    def order_data() -> tuple[dict, list[dict]]:
+        make, _ = CarMake.objects.get_or_create(name=HANDBOOK_NAME)
+        model, _ = CarModel.objects.get_or_create(make=make, name=HANDBOOK_NAME)
+        group, _ = PartGroup.objects.get_or_create(name=HANDBOOK_NAME)
+        vehicle = {"make": make, "model": model, "year": 2015, "fuel_type": "diesel"}
+        parts = [{"group": group, "name": f"Part {number}", "condition": "used"} for number in range(3)]
+        return vehicle, parts
+
+    @staticmethod
+    def cleanup():
+        orders = BuyerOrder.objects.filter(buyer_profile__user__username__startswith=USERNAME_PREFIX)
+        order_ids = list(orders.values_list("pk", flat=True))
+        Job.objects.filter(name="orders.fan_out", payload__order_id__in=order_ids).delete()
+        orders.delete()
+        User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+        CarModel.objects.filter(name=HANDBOOK_NAME).delete()
+        CarMake.objects.filter(name=HANDBOOK_NAME).delete()
+        PartGroup.objects.filter(name=HANDBOOK_NAME).delete()
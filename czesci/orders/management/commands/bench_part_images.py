@@ -0,0 +1,116 @@
+"""Part photo upload latency by file size.
+
+For each ``--sizes`` (MB) it uploads ``--iterations`` distinct photos through
+the upload view and reports p50/p99 of
+
+* the whole request, including receiving and parsing the multipart body,
+* ``PartImageService.attach`` alone, which is what the request does with a
+  file once the upload handler has streamed and hashed it,
+
+then uploads one photo for two parts to show that it is stored once. The photos are
+random bytes behind a JPEG signature, so the resizing job, if run, fails on
+them; they are never enqueued here. The benchmark runs in a throwaway
+database and media directory, both removed afterwards.
+"""
+
+import os
+import tempfile
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from core.bench import percentile, scratch_databases
+from core.uploads import HashedTemporaryUploadedFile
+from handbooks.models import CarMake, CarModel, PartGroup
+from orders.models import PartImage
+from orders.services.images import PartImageService, file_hash
+from orders.services.orders import OrderService
+from users.models import BuyerProfile
+
+User = get_user_model()
+
+USERNAME = "bench_part_images"
+HANDBOOK_NAME = "Bench part images"
+
+
+def photo(size: int) -> bytes:
+    return b"\xff\xd8\xff\xe0" + os.urandom(size - 4)
+
+
+class Command(BaseCommand):
+    help = "Benchmark part photo uploads of different sizes and content-hash deduplication."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=float, nargs="+", default=[0.1, 1, 5, 15], help="Photo sizes in MB.")
+        parser.add_argument("--iterations", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with scratch_databases(), tempfile.TemporaryDirectory() as media:
+            with override_settings(MEDIA_ROOT=media, PART_IMAGE_UPLOAD_TEMP_DIR=os.path.join(media, "tmp")):
+                self.run(options)
+
+    def run(self, options):
+        part, other_part = self.setup()
+        client = Client(HTTP_HOST="localhost")
+        client.force_login(part.order.buyer_profile.user)
+        url = reverse("part_images", args=[part.pk])
+
+        self.stdout.write(f"{'MB':>6}{'request p50':>14}{'p99':>8}{'attach p50':>14}{'p99':>8}")
+        with mock.patch("orders.services.images.enqueue"), override_settings(PART_IMAGES_PER_PART=10**6):
+            for megabytes in options["sizes"]:
+                size = int(megabytes * 2**20)
+                requests, attaches = [], []
+                for _ in range(options["iterations"]):
+                    started = time.perf_counter()
+                    client.post(url, {"images": SimpleUploadedFile("photo.jpg", photo(size))})
+                    requests.append((time.perf_counter() - started) * 1000)
+
+                    upload = self.streamed(photo(size))
+                    started = time.perf_counter()
+                    PartImageService.attach(part, [upload])
+                    attaches.append((time.perf_counter() - started) * 1000)
+                    upload.close()
+                self.stdout.write(
+                    f"{megabytes:>6}{percentile(requests, 50):>14.1f}{percentile(requests, 99):>8.1f}"
+                    f"{percentile(attaches, 50):>14.1f}{percentile(attaches, 99):>8.1f}"
+                )
+
+            data = photo(2**20)
+            for target in (part, other_part):
+                client.post(
+                    reverse("part_images", args=[target.pk]), {"images": SimpleUploadedFile("photo.jpg", data)}
+                )
+            images = PartImage.objects.filter(sha256=file_hash(SimpleUploadedFile("photo.jpg", data)))
+            self.stdout.write(
+                f"dedup: one photo for two parts: {images.count()} rows, "
+                f"{len(set(images.values_list('image', flat=True)))} stored file"
+            )
+
+    @staticmethod
+    def streamed(data: bytes) -> HashedTemporaryUploadedFile:
+        """*data* as ``HashingUploadHandler`` delivers it: on disk, with ``sha256`` set."""
+        upload = HashedTemporaryUploadedFile(
+            "photo.jpg", "image/jpeg", len(data), None, temp_dir=settings.PART_IMAGE_UPLOAD_TEMP_DIR
+        )
+        upload.write(data)
+        upload.seek(0)
+        upload.sha256 = file_hash(SimpleUploadedFile("photo.jpg", data))
+        return upload
+
+    @staticmethod
+    def setup():
+        user = User.objects.create_user(USERNAME, password="!")
+        buyer = BuyerProfile.objects.create(user=user, delivery_address="-")
+        make, _ = CarMake.objects.get_or_create(name=HANDBOOK_NAME)
+        model, _ = CarModel.objects.get_or_create(make=make, name=HANDBOOK_NAME)
+        group, _ = PartGroup.objects.get_or_create(name=HANDBOOK_NAME)
+        parts = [{"group": group, "name": name} for name in ("Door", "Mirror")]
+        order = OrderService.submit(buyer, {"make": make, "model": model, "year": 2015}, parts)
+        return list(order.parts.order_by("pk"))
@@ -0,0 +1,185 @@
+"""Consistency and latency of the in-memory seller index against SQL.
+
+Creates ``--sellers`` sellers with random preferences over ``--makes`` makes
+and ``--groups`` part groups (``--sellers 0`` checks the existing data
+instead), then
+
+* times a full ``SellerIndex`` build,
+* matches ``--orders`` random orders with the index and with
+  ``eligible_sellers_query``, reporting mismatches and p50/p99 of both,
+* changes the preferences of a few sellers and checks that the signal
+  handlers (this process) and ``SellerIndex.sync()`` (another process's
+  index) both pick the changes up.
+
+Exits with an error on any mismatch. Everything created is deleted afterwards.
+"""
+
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.bench import measure
+from handbooks.models import CarMake, PartGroup
+from orders.models import PartRequest, SellerPreference
+from orders.services.matching import (
+    Makes,
+    OrderCriteria,
+    PartGroups,
+    SellerIndex,
+    eligible_sellers_query,
+    seller_index,
+)
+from users.models import SellerProfile
+
+User = get_user_model()
+
+USERNAME_PREFIX = "bench_index_"
+HANDBOOK_PREFIX = "Bench index "
+
+
+class Command(BaseCommand):
+    help = "Check the in-memory seller index against SQL and compare their latency."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sellers", type=int, default=10_000, help="0 checks the existing sellers.")
+        parser.add_argument("--makes", type=int, default=50)
+        parser.add_argument("--groups", type=int, default=30)
+        parser.add_argument("--orders", type=int, default=200, help="Random orders to match.")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        try:
+            if options["sellers"]:
+                self.setup(options["sellers"], options["makes"], options["groups"])
+            make_ids = list(CarMake.objects.values_list("pk", flat=True))
+            group_ids = list(PartGroup.objects.values_list("pk", flat=True))
+            if not make_ids or not group_ids:
+                raise CommandError("No makes or part groups to build orders from.")
+            user_ids = list(SellerProfile.objects.values_list("user_id", flat=True)) or [None]
+            orders = [self.criteria(make_ids, group_ids, user_ids) for _ in range(options["orders"])]
+
+            index = seller_index()
+            started = time.perf_counter()
+            index.build()
+            self.stdout.write(f"build: {len(index)} sellers in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+            self.compare("index", index, orders)
+            self.latency(index, orders)
+
+            # Another process's index: it only sees the changes through sync().
+            other = SellerIndex()
+            other.build()
+            self.change_preferences(make_ids, group_ids)
+            self.compare("signals", index, orders)
+            other.sync()
+            self.compare("sync", other, orders)
+        finally:
+            self.cleanup()
+            seller_index().build()
+
+    def criteria(self, make_ids, group_ids, user_ids) -> OrderCriteria:
+        parts = tuple(
+            (
+                self.random.choice(group_ids),
+                self.random.choice(PartRequest.Condition.values),
+                self.random.choice(PartRequest.OriginType.values),
+            )
+            for _ in range(self.random.randint(1, 5))
+        )
+        return OrderCriteria(self.random.choice(make_ids), parts, self.random.choice(user_ids))
+
+    def compare(self, label: str, index: SellerIndex, orders: list[OrderCriteria]) -> None:
+        mismatches = 0
+        for criteria in orders:
+            expected = set(eligible_sellers_query(criteria).values_list("seller_id", flat=True))
+            if set(index.seller_ids(criteria)) != expected:
+                mismatches += 1
+        self.stdout.write(f"{label}: {len(orders) - mismatches}/{len(orders)} orders match SQL")
+        if mismatches:
+            raise CommandError(f"{label}: {mismatches} orders differ from eligible_sellers_query.")
+
+    def latency(self, index: SellerIndex, orders: list[OrderCriteria]) -> None:
+        self.stdout.write(f"{'':>12}{'p50 ms':>10}{'p99 ms':>10}")
+        runs = {
+            "index.match": lambda criteria: index.match(criteria),
+            "index ids": lambda criteria: index.seller_ids(criteria),
+            "sql ids": lambda criteria: list(eligible_sellers_query(criteria).values_list("seller_id", flat=True)),
+        }
+        for label, run in runs.items():
+            pending = iter(orders)
+            stats = measure(lambda: run(next(pending)), len(orders))  # pylint: disable=cell-var-from-loop
+            self.stdout.write(f"{label:>12}{stats['p50_ms']:>10.3f}{stats['p99_ms']:>10.3f}")
+
+    def change_preferences(self, make_ids, group_ids, count: int = 20) -> None:
+        preferences = list(SellerPreference.objects.order_by("?")[:count])
+        for preference in preferences:
+            with transaction.atomic():
+                preference.sells_used = not preference.sells_used
+                preference.save()
+                preference.makes.set(self.random.sample(make_ids, min(len(make_ids), self.random.randint(0, 2))))
+                preference.part_groups.set(self.random.sample(group_ids, min(len(group_ids), 1)))
+
+    @transaction.atomic
+    def setup(self, sellers: int, makes: int, groups: int) -> None:
+        make_ids = [
+            make.pk for make in CarMake.objects.bulk_create(CarMake(name=f"{HANDBOOK_PREFIX}{n}") for n in range(makes))
+        ]
+        group_ids = [
+            group.pk
+            for group in PartGroup.objects.bulk_create(PartGroup(name=f"{HANDBOOK_PREFIX}{n}") for n in range(groups))
+        ]
+        users = User.objects.bulk_create(
+            (User(username=f"{USERNAME_PREFIX}{number}", password="!") for number in range(sellers)), batch_size=1000
+        )
+        profiles = SellerProfile.objects.bulk_create(
+            (
+                SellerProfile(user=user, business_name=f"Seller {user.pk}", business_address="-", nip="0000000000")
+                for user in users
+            ),
+            batch_size=1000,
+        )
+        preferences = SellerPreference.objects.bulk_create(
+            (
+                SellerPreference(
+                    seller=profile,
+                    sells_new=self.random.random() < 0.7,
+                    sells_used=self.random.random() < 0.7,
+                    sells_original=self.random.random() < 0.7,
+                    sells_aftermarket=self.random.random() < 0.7,
+                )
+                for profile in profiles
+            ),
+            batch_size=1000,
+        )
+        if None in (make_ids[0], group_ids[0], preferences[0].pk):
+            raise CommandError("The database backend does not return primary keys from bulk inserts.")
+
+        # About a third of the sellers take every make / every part group.
+        Makes.objects.bulk_create(
+            (
+                Makes(sellerpreference_id=preference.pk, carmake_id=make_id)
+                for preference in preferences
+                if self.random.random() > 0.3
+                for make_id in self.random.sample(make_ids, min(makes, self.random.randint(1, 3)))
+            ),
+            batch_size=1000,
+        )
+        PartGroups.objects.bulk_create(
+            (
+                PartGroups(sellerpreference_id=preference.pk, partgroup_id=group_id)
+                for preference in preferences
+                if self.random.random() > 0.3
+                for group_id in self.random.sample(group_ids, min(groups, self.random.randint(1, 5)))
+            ),
+            batch_size=1000,
+        )
+
+    @staticmethod
+    def cleanup():
+        User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+        CarMake.objects.filter(name__startswith=HANDBOOK_PREFIX).delete()
+        PartGroup.objects.filter(name__startswith=HANDBOOK_PREFIX).delete()
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:58
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('handbooks', '0001_initial'),
+        ('users', '0007_phonenumber_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BuyerOrder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('new', 'New'), ('processing', 'Processing'), ('closed', 'Closed')], default='new', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('buyer_profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='orders', to='users.buyerprofile')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PartRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('origin_type', models.CharField(choices=[('original', 'Original'), ('aftermarket', 'Aftermarket'), ('any', 'Any')], default='any', max_length=12)),
+                ('condition', models.CharField(choices=[('new', 'New'), ('used', 'Used'), ('any', 'Any')], default='any', max_length=4)),
+                ('part_code', models.CharField(blank=True, max_length=64)),
+                ('description', models.TextField(blank=True)),
+                ('desired_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='handbooks.partgroup')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='parts', to='orders.buyerorder')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Vehicle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('vehicle_type', models.CharField(default='car', max_length=20)),
+                ('year', models.PositiveIntegerField()),
+                ('fuel_type', models.CharField(blank=True, max_length=20)),
+                ('engine_volume', models.FloatField(blank=True, null=True)),
+                ('body_type', models.CharField(blank=True, max_length=20)),
+                ('vin', models.CharField(blank=True, max_length=17, validators=[django.core.validators.RegexValidator('^[A-HJ-NPR-Z0-9]{17}$', 'Enter a 17-character VIN.')])),
+                ('import_region', models.CharField(blank=True, max_length=20)),
+                ('make', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='handbooks.carmake')),
+                ('model', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='handbooks.carmodel')),
+                ('order', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='vehicle', to='orders.buyerorder')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SellerInbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('read_at', models.DateTimeField(blank=True, null=True)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='orders.buyerorder')),
+                ('seller', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inbox', to='users.sellerprofile')),
+            ],
+            options={
+                'verbose_name_plural': 'seller inboxes',
+                'indexes': [models.Index(fields=['seller', '-created_at'], name='inbox_seller_created')],
+                'constraints': [models.UniqueConstraint(fields=('seller', 'order'), name='inbox_seller_order_unique')],
+            },
+        ),
+    ]
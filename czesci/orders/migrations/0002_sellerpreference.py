@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-18 13:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('handbooks', '0001_initial'),
+        ('orders', '0001_initial'),
+        ('users', '0007_phonenumber_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SellerPreference',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sells_new', models.BooleanField(default=True)),
+                ('sells_used', models.BooleanField(default=True)),
+                ('sells_original', models.BooleanField(default=True)),
+                ('sells_aftermarket', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+                ('makes', models.ManyToManyField(blank=True, related_name='+', to='handbooks.carmake')),
+                ('part_groups', models.ManyToManyField(blank=True, related_name='+', to='handbooks.partgroup')),
+                ('seller', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='preference', to='users.sellerprofile')),
+            ],
+        ),
+    ]
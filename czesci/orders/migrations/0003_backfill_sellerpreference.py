@@ -0,0 +1,28 @@
+"""Give every existing seller a ``SellerPreference`` accepting all orders."""
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def create_preferences(apps, schema_editor):
+    SellerProfile = apps.get_model("users", "SellerProfile")
+    SellerPreference = apps.get_model("orders", "SellerPreference")
+    db_alias = schema_editor.connection.alias
+
+    seller_ids = SellerProfile.objects.using(db_alias).filter(preference__isnull=True).values_list("pk", flat=True)
+    SellerPreference.objects.using(db_alias).bulk_create(
+        (SellerPreference(seller_id=seller_id) for seller_id in seller_ids.iterator()),
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_sellerpreference'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_preferences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.3 on 2026-10-18 13:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_backfill_sellerpreference'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PartImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('image', models.FileField(max_length=120, upload_to='')),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('size', models.PositiveIntegerField()),
+                ('content_type', models.CharField(max_length=20)),
+                ('width', models.PositiveIntegerField(blank=True, null=True)),
+                ('height', models.PositiveIntegerField(blank=True, null=True)),
+                ('variants_ready', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('part_request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='images', to='orders.partrequest')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('part_request', 'sha256'), name='partimage_part_sha_unique')],
+            },
+        ),
+    ]
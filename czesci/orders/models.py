@@ -0,0 +1,141 @@
+from django.core.validators import RegexValidator
+from django.db import models
+
+
+class BuyerOrder(models.Model):
+    """A buyer's request for parts for one vehicle (up to five ``PartRequest`` items)."""
+
+    class Status(models.TextChoices):
+        NEW = "new", "New"
+        PROCESSING = "processing", "Processing"
+        CLOSED = "closed", "Closed"
+
+    buyer_profile = models.ForeignKey("users.BuyerProfile", on_delete=models.CASCADE, related_name="orders")
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.NEW)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:  # noqa: DunderStr
+        return f"Order #{self.pk} ({self.status})"
+
+
+class Vehicle(models.Model):
+    """The vehicle a ``BuyerOrder`` requests parts for."""
+
+    order = models.OneToOneField(BuyerOrder, on_delete=models.CASCADE, related_name="vehicle")
+    vehicle_type = models.CharField(max_length=20, default="car")
+    make = models.ForeignKey("handbooks.CarMake", on_delete=models.PROTECT, related_name="+")
+    model = models.ForeignKey("handbooks.CarModel", on_delete=models.PROTECT, related_name="+")
+    year = models.PositiveIntegerField()
+    fuel_type = models.CharField(max_length=20, blank=True)
+    engine_volume = models.FloatField(null=True, blank=True)
+    body_type = models.CharField(max_length=20, blank=True)
+    vin = models.CharField(
+        max_length=17,
+        blank=True,
+        validators=[RegexValidator(r"^[A-HJ-NPR-Z0-9]{17}$", "Enter a 17-character VIN.")],
+    )
+    import_region = models.CharField(max_length=20, blank=True)
+
+    def __str__(self) -> str:  # noqa: DunderStr
+        return f"{self.make} {self.model} ({self.year})"
+
+
+class PartRequest(models.Model):
+    """A single part requested within a ``BuyerOrder``."""
+
+    class OriginType(models.TextChoices):
+        ORIGINAL = "original", "Original"
+        AFTERMARKET = "aftermarket", "Aftermarket"
+        ANY = "any", "Any"
+
+    class Condition(models.TextChoices):
+        NEW = "new", "New"
+        USED = "used", "Used"
+        ANY = "any", "Any"
+
+    order = models.ForeignKey(BuyerOrder, on_delete=models.CASCADE, related_name="parts")
+    group = models.ForeignKey("handbooks.PartGroup", on_delete=models.PROTECT, related_name="+")
+    name = models.CharField(max_length=255)
+    origin_type = models.CharField(max_length=12, choices=OriginType.choices, default=OriginType.ANY)
+    condition = models.CharField(max_length=4, choices=Condition.choices, default=Condition.ANY)
+    part_code = models.CharField(max_length=64, blank=True)
+    description = models.TextField(blank=True)
+    desired_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+
+    def __str__(self) -> str:  # noqa: DunderStr
+        return self.name
+
+
+class PartImage(models.Model):
+    """A photo of a requested part (``orders.services.images``).
+
+    Files are content-addressed: identical photos share one stored original
+    and one set of resized variants, whichever part they were uploaded for.
+    ``image`` is a ``FileField`` so Pillow stays optional; the upload is
+    checked by its signature instead.
+    """
+
+    part_request = models.ForeignKey(PartRequest, on_delete=models.CASCADE, related_name="images")
+    image = models.FileField(max_length=120)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveIntegerField()
+    content_type = models.CharField(max_length=20)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    # Set by the orders.part_image_variants job for every row with this sha256.
+    variants_ready = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            # The same photo uploaded twice for one part is stored once.
+            models.UniqueConstraint(fields=["part_request", "sha256"], name="partimage_part_sha_unique"),
+        ]
+
+    def __str__(self) -> str:  # noqa: DunderStr
+        return f"Photo {self.sha256[:12]} of part #{self.part_request_id}"
+
+
+class SellerPreference(models.Model):
+    """Which orders a seller receives (``orders.services.matching``).
+
+    Empty ``makes`` / ``part_groups`` mean every make / part group. Created
+    with every ``SellerProfile``, initially accepting everything.
+    """
+
+    seller = models.OneToOneField("users.SellerProfile", on_delete=models.CASCADE, related_name="preference")
+    makes = models.ManyToManyField("handbooks.CarMake", blank=True, related_name="+")
+    part_groups = models.ManyToManyField("handbooks.PartGroup", blank=True, related_name="+")
+    sells_new = models.BooleanField(default=True)
+    sells_used = models.BooleanField(default=True)
+    sells_original = models.BooleanField(default=True)
+    sells_aftermarket = models.BooleanField(default=True)
+    # Job workers pick up changes made in other processes by this timestamp.
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self) -> str:  # noqa: DunderStr
+        return f"Preferences of seller #{self.seller_id}"
+
+
+class SellerInbox(models.Model):
+    """An order delivered to a seller, written by the fan-out job (``orders.services.fanout``)."""
+
+    seller = models.ForeignKey("users.SellerProfile", on_delete=models.CASCADE, related_name="inbox")
+    order = models.ForeignKey(BuyerOrder, on_delete=models.CASCADE, related_name="deliveries")
+    created_at = models.DateTimeField(auto_now_add=True)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = "seller inboxes"
+        constraints = [
+            # A retried fan-out must not deliver an order twice (bulk_create ignores conflicts).
+            models.UniqueConstraint(fields=["seller", "order"], name="inbox_seller_order_unique"),
+        ]
+        indexes = [
+            # Seller inbox page: seller=… ORDER BY created_at DESC
+            models.Index(fields=["seller", "-created_at"], name="inbox_seller_created"),
+        ]
+
+    def __str__(self) -> str:  # noqa: DunderStr
+        return f"Order #{self.order_id} → seller #{self.seller_id}"
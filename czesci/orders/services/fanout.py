@@ -0,0 +1,56 @@
+"""Delivery of a submitted order to the sellers' inboxes.
+
+Runs as the ``orders.fan_out`` background job (``orders.tasks``), never in the
+buyer's request. The receiving sellers come from the in-memory
+``orders.services.matching.SellerIndex``; inbox rows are written with one
+``bulk_create`` per chunk of ``ORDERS_FANOUT_CHUNK_SIZE``, each chunk in its
+own short transaction, so lock hold time stays bounded however many sellers
+there are. Each chunk skips sellers deleted since the index last saw them.
+
+Delivery is idempotent: an inbox row is unique per (seller, order) and
+conflicts are ignored, so a retried job only fills in what is missing.
+"""
+
+from __future__ import annotations
+
+from itertools import islice
+from typing import Iterator
+
+from django.conf import settings
+from django.db import transaction
+
+from core.db import retry_on_lock
+from orders.models import BuyerOrder, SellerInbox
+from orders.services.matching import OrderCriteria, iter_bits, seller_index
+from users.models import SellerProfile
+
+
+class FanOutService:  # pylint: disable=too-few-public-methods
+    """Writes ``SellerInbox`` rows for an order."""
+
+    @staticmethod
+    def eligible_seller_ids(order: BuyerOrder) -> Iterator[int]:
+        """Ids of the sellers that receive *order*, ascending."""
+        index = seller_index()
+        index.sync()
+        return iter_bits(index.match(OrderCriteria.from_order(order)))
+
+    @staticmethod
+    def deliver(order_id: int, chunk_size: int | None = None) -> int:
+        """Deliver *order_id* to every eligible seller; returns the number of sellers."""
+        chunk_size = chunk_size or settings.ORDERS_FANOUT_CHUNK_SIZE
+        order = BuyerOrder.objects.select_related("buyer_profile", "vehicle").get(pk=order_id)
+        seller_ids = FanOutService.eligible_seller_ids(order)
+        delivered = 0
+        while chunk := list(islice(seller_ids, chunk_size)):
+            delivered += FanOutService.write_chunk(order.pk, chunk)
+        return delivered
+
+    @staticmethod
+    @retry_on_lock
+    @transaction.atomic
+    def write_chunk(order_id: int, seller_ids: list[int]) -> int:
+        existing = SellerProfile.objects.filter(pk__in=seller_ids).values_list("pk", flat=True)
+        rows = [SellerInbox(order_id=order_id, seller_id=seller_id) for seller_id in existing]
+        SellerInbox.objects.bulk_create(rows, ignore_conflicts=True)
+        return len(rows)
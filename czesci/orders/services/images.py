@@ -0,0 +1,199 @@
+"""Part photo uploads: content-addressed storage and background resizing.
+
+The request only stores what the upload handler already wrote to disk:
+
+* ``core.uploads.HashingUploadHandler``, installed by the upload view,
+  streams each file to a temporary file in ``PART_IMAGE_UPLOAD_TEMP_DIR``,
+  hashes it on the way and stops at a file over ``PART_IMAGE_MAX_BYTES``,
+* ``attach`` checks the file signature (a few bytes), stores the temporary
+  file as ``parts/<sha[:2]>/<sha256><ext>`` (a rename on the media
+  filesystem) unless a file with that hash already exists, and inserts the
+  ``PartImage`` rows,
+* resizing to ``PART_IMAGE_SIZES`` is left to the ``orders.part_image_variants``
+  job, which runs Pillow in a pool of ``PART_IMAGE_WORKERS`` processes.
+
+Apart from receiving the bytes, the request therefore does the same work for
+a 100 KB and a 10 MB photo. Photos seen before reuse the stored original and
+its variants.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from core.db import retry_on_lock
+from core.jobs import enqueue
+from orders.models import PartImage, PartRequest
+from orders.services import thumbnails
+
+logger = logging.getLogger(__name__)
+
+ORIGINAL = "original"
+
+# (content type, extension) by leading bytes; WebP also needs "WEBP" at offset 8.
+SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png", ".png"),
+    (b"RIFF", "image/webp", ".webp"),
+)
+
+
+def sniff(upload) -> tuple[str, str] | None:
+    """``(content_type, extension)`` of a JPEG, PNG or WebP *upload*, else ``None``."""
+    upload.seek(0)
+    header = upload.read(12)
+    upload.seek(0)
+    for signature, content_type, extension in SIGNATURES:
+        if header.startswith(signature) and (content_type != "image/webp" or header[8:12] == b"WEBP"):
+            return content_type, extension
+    return None
+
+
+def file_hash(upload) -> str:
+    """SHA-256 of *upload*: computed by the upload handler, else read in chunks."""
+    if digest := getattr(upload, "sha256", None):
+        return digest
+    digest = hashlib.sha256()
+    for chunk in upload.chunks():
+        digest.update(chunk)
+    upload.seek(0)
+    return digest.hexdigest()
+
+
+def variant_name(image: PartImage, variant: str) -> str:
+    """Storage name of *variant* (``ORIGINAL`` or a ``PART_IMAGE_SIZES`` key) of *image*."""
+    if variant == ORIGINAL:
+        return image.image.name
+    return f"parts/{image.sha256[:2]}/{image.sha256}_{variant}.jpg"
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def pool() -> ProcessPoolExecutor:
+    """The process pool resizing photos, started on first use."""
+    global _pool  # pylint: disable=global-statement
+    with _pool_lock:
+        if _pool is None:
+            # Spawned, not forked: job workers are multi-threaded.
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PART_IMAGE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+    return _pool
+
+
+class PartImageService:
+    """Stores part photos and renders their variants."""
+
+    @staticmethod
+    def attach(part_request: PartRequest, uploads: Iterable) -> list[PartImage]:
+        """Validate and store *uploads* for *part_request*; returns the new images.
+
+        Raises ``ValidationError`` before storing anything when a file is not a
+        JPEG, PNG or WebP image, is too large or the part would get more than
+        ``PART_IMAGES_PER_PART`` photos.
+        """
+        files = []
+        for upload in uploads:
+            detected = sniff(upload)
+            if detected is None:
+                raise ValidationError(f"{upload.name}: upload a JPEG, PNG or WebP photo.")
+            if upload.size > settings.PART_IMAGE_MAX_BYTES:
+                raise ValidationError(
+                    f"{upload.name}: photos may be at most {settings.PART_IMAGE_MAX_BYTES // 2**20} MB."
+                )
+            files.append((upload, file_hash(upload), *detected))
+        PartImageService.check_limit(part_request, {sha256 for _, sha256, _, _ in files})
+
+        # Storing is idempotent (the name is the content), so it happens before
+        # the transaction; a rolled-back request leaves a file a retry reuses.
+        stored = {}
+        for upload, sha256, content_type, extension in files:
+            name = f"parts/{sha256[:2]}/{sha256}{extension}"
+            if sha256 not in stored and not default_storage.exists(name):
+                saved = default_storage.save(name, upload)
+                if saved != name:
+                    # A concurrent upload stored the same photo first; the storage
+                    # picked a free name for this copy, which nothing should use.
+                    default_storage.delete(saved)
+            stored.setdefault(sha256, name)
+        return PartImageService.create_rows(part_request, files, stored)
+
+    @staticmethod
+    @retry_on_lock
+    @transaction.atomic
+    def create_rows(part_request: PartRequest, files: list[tuple], stored: dict[str, str]) -> list[PartImage]:
+        # Lock the part, so concurrent uploads cannot exceed the limit together.
+        PartRequest.objects.select_for_update().filter(pk=part_request.pk).exists()
+        present = PartImageService.check_limit(part_request, stored)
+        # Photos uploaded before already have their variants.
+        ready = {
+            sha256: (width, height)
+            for sha256, width, height in PartImage.objects.filter(sha256__in=stored, variants_ready=True).values_list(
+                "sha256", "width", "height"
+            )
+        }
+
+        images = []
+        for upload, sha256, content_type, _extension in files:
+            if sha256 in present:
+                continue
+            present.add(sha256)
+            width, height = ready.get(sha256, (None, None))
+            images.append(
+                PartImage(
+                    part_request=part_request,
+                    image=stored[sha256],
+                    sha256=sha256,
+                    size=upload.size,
+                    content_type=content_type,
+                    width=width,
+                    height=height,
+                    variants_ready=sha256 in ready,
+                )
+            )
+        PartImage.objects.bulk_create(images)
+        for sha256 in {image.sha256 for image in images if not image.variants_ready}:
+            enqueue("orders.part_image_variants", sha256=sha256)
+        return images
+
+    @staticmethod
+    def check_limit(part_request: PartRequest, hashes: Iterable[str]) -> set[str]:
+        """Raise ``ValidationError`` when adding *hashes* exceeds ``PART_IMAGES_PER_PART``.
+
+        Returns the hashes of the part's current photos.
+        """
+        present = set(part_request.images.values_list("sha256", flat=True))
+        if len(present | set(hashes)) > settings.PART_IMAGES_PER_PART:
+            raise ValidationError(f"A part may have at most {settings.PART_IMAGES_PER_PART} photos.")
+        return present
+
+    @staticmethod
+    def render_variants(sha256: str) -> None:
+        """Write the ``PART_IMAGE_SIZES`` variants of the photo *sha256* and mark its rows ready."""
+        image = PartImage.objects.filter(sha256=sha256).first()
+        if image is None or image.variants_ready:
+            return
+        if thumbnails.Image is None:
+            logger.warning("Pillow is not installed; serving photo %s without variants.", sha256)
+            return
+
+        targets = {
+            default_storage.path(variant_name(image, variant)): edge
+            for variant, edge in settings.PART_IMAGE_SIZES.items()
+        }
+        width, height = pool().submit(
+            thumbnails.render_variants, default_storage.path(image.image.name), targets, settings.PART_IMAGE_QUALITY
+        ).result()
+        PartImage.objects.filter(sha256=sha256).update(width=width, height=height, variants_ready=True)
@@ -0,0 +1,273 @@
+"""Which sellers receive an order: an in-memory bitmap index of seller preferences.
+
+A seller receives an order when its ``SellerPreference`` accepts the
+vehicle's make and at least one requested part (part group, condition and
+origin type), unless the seller is the buyer. ``eligible_sellers_query`` is
+the same rule in SQL; run for every order, it gets slower with every seller
+that signs up.
+
+``SellerIndex`` keeps one bitmap per make, part group, condition and origin
+type, with bit *n* standing for the seller with primary key *n*. Python
+integers serve as bitmaps, so matching an order takes a few ``&`` and ``|``
+operations whatever the number of sellers.
+
+The index is built once per process (``seller_index()``; job workers build it
+at start-up) and kept current by
+
+* ``orders.signals``, which re-indexes a seller after its profile or
+  preferences are saved in this process, and
+* ``SellerIndex.sync()``, which re-indexes preferences whose ``updated_at``
+  changed since the last sync (saved by other processes) and rebuilds the
+  whole index every ``SELLER_INDEX_REBUILD_SECONDS`` to drop deleted sellers.
+
+``manage.py bench_seller_index`` compares index and query.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from orders.models import BuyerOrder, PartRequest, SellerPreference
+
+# Re-read preferences saved this long before the last sync: covers clock skew
+# between processes and transactions that committed after the sync started.
+SYNC_OVERLAP = timedelta(seconds=5)
+# More changed sellers than this are cheaper to pick up with a full rebuild.
+SYNC_REFRESH_LIMIT = 1000
+
+Makes = SellerPreference.makes.through
+PartGroups = SellerPreference.part_groups.through
+
+
+@dataclass(frozen=True)
+class OrderCriteria:
+    """The properties of an order sellers are matched on."""
+
+    make_id: int
+    # (group_id, condition, origin_type) per requested part
+    parts: tuple[tuple[int, str, str], ...]
+    buyer_user_id: int | None = None
+
+    @classmethod
+    def from_order(cls, order: BuyerOrder) -> "OrderCriteria":
+        return cls(
+            make_id=order.vehicle.make_id,
+            parts=tuple(order.parts.values_list("group_id", "condition", "origin_type")),
+            buyer_user_id=order.buyer_profile.user_id,
+        )
+
+
+def eligible_sellers_query(criteria: OrderCriteria):
+    """``SellerPreference`` rows of the sellers receiving an order with *criteria*."""
+    any_make = ~Exists(Makes.objects.filter(sellerpreference_id=OuterRef("pk")))
+    make = Exists(Makes.objects.filter(sellerpreference_id=OuterRef("pk"), carmake_id=criteria.make_id))
+    any_group = ~Exists(PartGroups.objects.filter(sellerpreference_id=OuterRef("pk")))
+
+    parts = Q(pk__in=[])
+    for group_id, condition, origin_type in criteria.parts:
+        group = Exists(PartGroups.objects.filter(sellerpreference_id=OuterRef("pk"), partgroup_id=group_id))
+        parts |= (any_group | group) & _flag_q(condition, "sells_new", "sells_used") & _flag_q(
+            origin_type, "sells_original", "sells_aftermarket"
+        )
+
+    query = SellerPreference.objects.filter(any_make | make).filter(parts)
+    if criteria.buyer_user_id is not None:
+        query = query.exclude(seller__user_id=criteria.buyer_user_id)
+    return query
+
+
+def _flag_q(value: str, first: str, second: str) -> Q:
+    """``new``/``original`` → first flag, ``used``/``aftermarket`` → second, ``any`` → either."""
+    if value in (PartRequest.Condition.NEW, PartRequest.OriginType.ORIGINAL):
+        return Q(**{first: True})
+    if value in (PartRequest.Condition.USED, PartRequest.OriginType.AFTERMARKET):
+        return Q(**{second: True})
+    return Q(**{first: True}) | Q(**{second: True})
+
+
+def iter_bits(bitmap: int) -> Iterator[int]:
+    """Positions of the set bits of *bitmap*, ascending."""
+    while bitmap:
+        lowest = bitmap & -bitmap
+        yield lowest.bit_length() - 1
+        bitmap ^= lowest
+
+
+class SellerIndex:
+    """Bitmaps of seller preferences; see the module docstring."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.any_make = 0
+        self.by_make: dict[int, int] = defaultdict(int)
+        self.any_group = 0
+        self.by_group: dict[int, int] = defaultdict(int)
+        # sells_new, sells_used, sells_original, sells_aftermarket
+        self.flags = [0, 0, 0, 0]
+        self.seller_of_user: dict[int, int] = {}
+        # seller_id -> (user_id, makes, groups) to undo its bits on changes
+        self.entries: dict[int, tuple[int, tuple[int, ...], tuple[int, ...]]] = {}
+        self.synced_at = None
+        self.built_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # ---------------------------------------------------
+    # Matching
+    # ---------------------------------------------------
+
+    def match(self, criteria: OrderCriteria) -> int:
+        """Bitmap of the sellers receiving an order with *criteria*."""
+        with self.lock:
+            new, used, original, aftermarket = self.flags
+            conditions = {"new": new, "used": used}
+            origins = {"original": original, "aftermarket": aftermarket}
+
+            parts = 0
+            for group_id, condition, origin_type in criteria.parts:
+                parts |= (
+                    (self.any_group | self.by_group.get(group_id, 0))
+                    & conditions.get(condition, new | used)
+                    & origins.get(origin_type, original | aftermarket)
+                )
+            sellers = (self.any_make | self.by_make.get(criteria.make_id, 0)) & parts
+            own = self.seller_of_user.get(criteria.buyer_user_id)
+
+        if own is not None:
+            sellers &= ~(1 << own)
+        return sellers
+
+    def seller_ids(self, criteria: OrderCriteria) -> list[int]:
+        return list(iter_bits(self.match(criteria)))
+
+    # ---------------------------------------------------
+    # Maintenance
+    # ---------------------------------------------------
+
+    def build(self) -> None:
+        """(Re)load every seller's preferences."""
+        started = timezone.now()
+        fresh = SellerIndex()
+        for seller_id, entry in self.load().items():
+            fresh.add(seller_id, *entry)
+        with self.lock:
+            # Swap in the new bitmaps at once; readers hold the lock while matching.
+            self.__dict__.update({key: value for key, value in fresh.__dict__.items() if key != "lock"})
+            self.synced_at = started
+            self.built_at = time.monotonic()
+
+    def sync(self) -> None:
+        """Apply preferences changed since the last sync; rebuild when the index is old."""
+        if self.synced_at is None or time.monotonic() - self.built_at > settings.SELLER_INDEX_REBUILD_SECONDS:
+            self.build()
+            return
+        started = timezone.now()
+        changed = list(
+            SellerPreference.objects.filter(updated_at__gte=self.synced_at - SYNC_OVERLAP).values_list(
+                "seller_id", flat=True
+            )[: SYNC_REFRESH_LIMIT + 1]
+        )
+        if len(changed) > SYNC_REFRESH_LIMIT:
+            self.build()
+            return
+        if changed:
+            self.refresh(changed)
+        self.synced_at = started
+
+    def refresh(self, seller_ids: Iterable[int]) -> None:
+        """Re-read the preferences of *seller_ids*; sellers without preferences are dropped."""
+        seller_ids = list(seller_ids)
+        entries = self.load(seller_ids)
+        with self.lock:
+            for seller_id in seller_ids:
+                self.remove(seller_id)
+                if seller_id in entries:
+                    self.add(seller_id, *entries[seller_id])
+
+    @staticmethod
+    def load(seller_ids: list[int] | None = None) -> dict[int, tuple]:
+        """``{seller_id: (user_id, flags, makes, groups)}`` in three queries."""
+        preferences = SellerPreference.objects.all()
+        makes, groups = Makes.objects.all(), PartGroups.objects.all()
+        if seller_ids is not None:
+            preferences = preferences.filter(seller_id__in=seller_ids)
+            makes = makes.filter(sellerpreference__seller_id__in=seller_ids)
+            groups = groups.filter(sellerpreference__seller_id__in=seller_ids)
+
+        makes_of, groups_of = defaultdict(list), defaultdict(list)
+        for seller_id, make_id in makes.values_list("sellerpreference__seller_id", "carmake_id"):
+            makes_of[seller_id].append(make_id)
+        for seller_id, group_id in groups.values_list("sellerpreference__seller_id", "partgroup_id"):
+            groups_of[seller_id].append(group_id)
+
+        rows = preferences.values_list(
+            "seller_id", "seller__user_id", "sells_new", "sells_used", "sells_original", "sells_aftermarket"
+        )
+        return {
+            seller_id: (user_id, flags, tuple(makes_of[seller_id]), tuple(groups_of[seller_id]))
+            for seller_id, user_id, *flags in rows
+        }
+
+    def add(self, seller_id: int, user_id: int, flags, makes: tuple, groups: tuple) -> None:
+        bit = 1 << seller_id
+        if makes:
+            for make_id in makes:
+                self.by_make[make_id] |= bit
+        else:
+            self.any_make |= bit
+        if groups:
+            for group_id in groups:
+                self.by_group[group_id] |= bit
+        else:
+            self.any_group |= bit
+        for position, enabled in enumerate(flags):
+            if enabled:
+                self.flags[position] |= bit
+        self.seller_of_user[user_id] = seller_id
+        self.entries[seller_id] = (user_id, makes, groups)
+
+    def remove(self, seller_id: int) -> None:
+        entry = self.entries.pop(seller_id, None)
+        if entry is None:
+            return
+        user_id, makes, groups = entry
+        mask = ~(1 << seller_id)
+        for make_id in makes:
+            self.by_make[make_id] &= mask
+        for group_id in groups:
+            self.by_group[group_id] &= mask
+        self.any_make &= mask
+        self.any_group &= mask
+        self.flags = [bits & mask for bits in self.flags]
+        self.seller_of_user.pop(user_id, None)
+
+
+_index: SellerIndex | None = None
+_index_lock = threading.Lock()
+
+
+def seller_index() -> SellerIndex:
+    """The process-wide ``SellerIndex``, built on first use."""
+    global _index  # pylint: disable=global-statement
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = SellerIndex()
+                index.build()
+                _index = index
+    return _index
+
+
+def built_index() -> SellerIndex | None:
+    """The process-wide index if this process has built it (for signal handlers)."""
+    return _index
@@ -0,0 +1,38 @@
+"""Order submission service."""
+
+from __future__ import annotations
+
+from typing import List
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from core.db import retry_on_lock
+from core.jobs import enqueue
+from orders.models import BuyerOrder, PartRequest, Vehicle
+
+MAX_PARTS_PER_ORDER = 5
+
+
+class OrderService:  # pylint: disable=too-few-public-methods
+    """Creates buyer orders; delivery to sellers happens in the background."""
+
+    @staticmethod
+    @retry_on_lock
+    @transaction.atomic
+    def submit(buyer_profile, vehicle: dict, parts: List[dict]) -> BuyerOrder:
+        """Create the order with its vehicle and parts and schedule the fan-out.
+
+        *vehicle* and each item of *parts* hold ``Vehicle`` / ``PartRequest``
+        field values. The fan-out job is enqueued in the same transaction, so
+        the buyer's request only pays for a handful of inserts no matter how
+        many sellers receive the order.
+        """
+        if not 1 <= len(parts) <= MAX_PARTS_PER_ORDER:
+            raise ValidationError(f"An order must contain between 1 and {MAX_PARTS_PER_ORDER} parts.")
+
+        order = BuyerOrder.objects.create(buyer_profile=buyer_profile)
+        Vehicle.objects.create(order=order, **vehicle)
+        PartRequest.objects.bulk_create(PartRequest(order=order, **part) for part in parts)
+        enqueue("orders.fan_out", order_id=order.pk)
+        return order
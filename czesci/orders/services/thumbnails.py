@@ -0,0 +1,43 @@
+"""Resizing of part photos, run in a process pool (see ``orders.services.images``).
+
+Imports nothing from Django, so spawned pool processes start quickly without
+``django.setup()``. Pillow is optional: without it no variants are rendered
+and the originals are served instead.
+"""
+
+from __future__ import annotations
+
+import os
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # optional: originals are served without variants
+    Image = ImageOps = None
+
+# EXIF orientations that swap width and height
+TRANSPOSED = {5, 6, 7, 8}
+
+
+def render_variants(source: str, targets: dict[str, int], quality: int) -> tuple[int, int]:
+    """Write a JPEG no larger than ``edge`` px per ``{path: edge}`` of *targets*.
+
+    Returns the (upright) width and height of *source*. Variants are written
+    to a temporary name and renamed, so a half-written file is never served.
+    """
+    with Image.open(source) as image:
+        width, height = image.size
+        if image.getexif().get(0x0112) in TRANSPOSED:  # Orientation tag
+            width, height = height, width
+        # JPEG: decode at the smallest scale that still covers the largest variant.
+        largest = max(targets.values())
+        image.draft("RGB", (largest, largest))
+        current = ImageOps.exif_transpose(image)
+
+        # Largest first, each one scaled down from the previous.
+        for path, edge in sorted(targets.items(), key=lambda item: -item[1]):
+            current.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+            variant = current if current.mode in ("RGB", "L") else current.convert("RGB")
+            partial = f"{path}.part"
+            variant.save(partial, "JPEG", quality=quality, optimize=True, progressive=True)
+            os.replace(partial, path)
+    return width, height
@@ -0,0 +1,45 @@
+"""Signal handlers giving every seller preferences and keeping the seller index current."""
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from orders.models import SellerPreference
+from orders.services.matching import built_index
+from users.models import SellerProfile
+from users.signals import sellers_imported
+
+
+def reindex(seller_id: int) -> None:
+    """Re-index *seller_id* in this process's ``SellerIndex`` once the transaction commits."""
+    index = built_index()
+    if index is not None:
+        transaction.on_commit(lambda: index.refresh([seller_id]))
+
+
+@receiver(post_save, sender=SellerProfile)
+def create_seller_preference(sender, instance, created, **kwargs):
+    if created and not kwargs.get("raw"):
+        # New sellers receive every order until they narrow their preferences.
+        SellerPreference.objects.get_or_create(seller=instance)
+
+
+@receiver(sellers_imported)
+def create_imported_seller_preferences(sender, seller_ids, **kwargs):
+    SellerPreference.objects.bulk_create(SellerPreference(seller_id=seller_id) for seller_id in seller_ids)
+
+
+@receiver([post_save, post_delete], sender=SellerPreference)
+def reindex_preference(sender, instance, **kwargs):
+    reindex(instance.seller_id)
+
+
+@receiver(m2m_changed, sender=SellerPreference.makes.through)
+@receiver(m2m_changed, sender=SellerPreference.part_groups.through)
+def reindex_preference_relations(sender, instance, action, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear") or not isinstance(instance, SellerPreference):
+        return
+    # Bump updated_at so SellerIndex.sync() in other processes sees the change.
+    SellerPreference.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+    reindex(instance.seller_id)
@@ -0,0 +1,21 @@
+"""Background job handlers for the orders app (see ``core.jobs``)."""
+
+from core.jobs import job, on_worker_start
+from orders.services.fanout import FanOutService
+from orders.services.images import PartImageService
+from orders.services.matching import seller_index
+
+
+@on_worker_start
+def build_seller_index() -> None:
+    seller_index()
+
+
+@job("orders.fan_out")
+def fan_out(order_id: int) -> None:
+    FanOutService.deliver(order_id)
+
+
+@job("orders.part_image_variants")
+def part_image_variants(sha256: str) -> None:
+    PartImageService.render_variants(sha256)
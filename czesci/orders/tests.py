@@ -0,0 +1,185 @@
+"""Tests for part photo uploads, seller preferences of imported sellers and order fan-out."""
+
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from handbooks.models import CarMake, CarModel, PartGroup
+from orders.models import PartImage, SellerInbox
+from orders.services.fanout import FanOutService
+from orders.services.images import PartImageService, file_hash
+from orders.services.matching import OrderCriteria, SellerIndex, seller_index
+from orders.services.orders import OrderService
+from users.models import BuyerProfile, SellerProfile
+from users.services.bulk_import import UserImporter
+
+User = get_user_model()
+
+PHOTO = b"\xff\xd8\xff\xe0" + bytes(2000)
+
+
+@mock.patch("orders.services.images.enqueue")
+class UploadPartImagesTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.temp_dir = os.path.join(media.name, "tmp")
+        settings_patcher = override_settings(MEDIA_ROOT=media.name, PART_IMAGE_UPLOAD_TEMP_DIR=self.temp_dir)
+        settings_patcher.enable()
+        self.addCleanup(settings_patcher.disable)
+
+        user = User.objects.create_user("buyer", password="!")
+        buyer = BuyerProfile.objects.create(user=user, delivery_address="-")
+        make = CarMake.objects.create(name="Make")
+        model = CarModel.objects.create(make=make, name="Model")
+        group = PartGroup.objects.create(name="Group")
+        parts = [{"group": group, "name": "Door"}]
+        order = OrderService.submit(buyer, {"make": make, "model": model, "year": 2015}, parts)
+        self.part = order.parts.get()
+        self.client = Client(enforce_csrf_checks=True)
+        self.client.force_login(user)
+        self.url = reverse("part_images", args=[self.part.pk])
+
+    def post(self, data: bytes):
+        self.client.get(reverse("settings_buyer"))  # sets the CSRF cookie
+        return self.client.post(
+            self.url,
+            {"images": SimpleUploadedFile("photo.jpg", data)},
+            HTTP_X_CSRFTOKEN=self.client.cookies["csrftoken"].value,
+        )
+
+    def test_upload_is_stored_under_its_hash(self, enqueue):
+        response = self.post(PHOTO)
+        self.assertEqual(response.status_code, 200)
+        image = PartImage.objects.get(part_request=self.part)
+        self.assertEqual(image.sha256, file_hash(SimpleUploadedFile("photo.jpg", PHOTO)))
+        self.assertTrue(default_storage.exists(image.image.name))
+        self.assertEqual(os.listdir(self.temp_dir), [])
+        enqueue.assert_called_once_with("orders.part_image_variants", sha256=image.sha256)
+
+    @override_settings(PART_IMAGE_MAX_BYTES=1000)
+    def test_oversized_upload_is_rejected(self, enqueue):
+        response = self.post(PHOTO)
+        self.assertContains(response, "photos may be at most", status_code=400)
+        self.assertFalse(PartImage.objects.exists())
+        self.assertEqual(os.listdir(self.temp_dir), [])
+        enqueue.assert_not_called()
+
+    def test_concurrently_stored_photo_is_kept_once(self, enqueue):
+        sha256 = file_hash(SimpleUploadedFile("photo.jpg", PHOTO))
+        name = f"parts/{sha256[:2]}/{sha256}.jpg"
+        # Another request stores the photo between this one's exists() and save().
+        default_storage.save(name, SimpleUploadedFile("photo.jpg", PHOTO))
+        real_exists = default_storage.exists
+        checks = iter([lambda name: False])
+        with mock.patch.object(default_storage, "exists", side_effect=lambda name: next(checks, real_exists)(name)):
+            PartImageService.attach(self.part, [SimpleUploadedFile("photo.jpg", PHOTO)])
+
+        self.assertEqual(PartImage.objects.get(part_request=self.part).image.name, name)
+        self.assertEqual(default_storage.listdir(os.path.dirname(name))[1], [os.path.basename(name)])
+
+    def test_csrf_is_checked(self, enqueue):
+        response = self.client.post(self.url, {"images": SimpleUploadedFile("photo.jpg", PHOTO)})
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(PartImage.objects.exists())
+
+
+class ImportedSellerTests(TestCase):
+    def test_imported_sellers_are_matched_to_orders(self):
+        importer = UserImporter(hash_workers=1)
+        try:
+            list(
+                importer.run(
+                    [
+                        (
+                            1,
+                            {
+                                "role": "seller",
+                                "first_name": "Anna",
+                                "last_name": "Nowak",
+                                "phone": "+48600100300",
+                                "password": "Pa55word!",
+                                "business_name": "Nowak Parts",
+                                "business_address": "Street 3",
+                                "nip": "1234567890",
+                            },
+                        )
+                    ]
+                )
+            )
+        finally:
+            importer.close()
+
+        seller = SellerProfile.objects.get()
+        self.assertTrue(hasattr(seller, "preference"))
+        index = SellerIndex()
+        index.build()
+        criteria = OrderCriteria(make_id=1, parts=((1, "used", "original"),))
+        self.assertEqual(index.seller_ids(criteria), [seller.pk])
+
+
+@mock.patch("orders.services.orders.enqueue")
+@mock.patch("orders.services.matching._index", None)
+class FanOutTests(TestCase):
+    """``FanOutService.deliver`` with a process index built for each test."""
+
+    def setUp(self):
+        make = CarMake.objects.create(name="Make")
+        self.vehicle = {"make": make, "model": CarModel.objects.create(make=make, name="Model"), "year": 2015}
+        self.parts = [{"group": PartGroup.objects.create(name="Group"), "name": "Door"}]
+        self.sellers = [self.seller(f"seller{number}") for number in range(5)]
+        buyer_user = User.objects.create_user("buyer", password="!")
+        self.buyer = BuyerProfile.objects.create(user=buyer_user, delivery_address="-")
+
+    @staticmethod
+    def seller(username: str, user=None) -> SellerProfile:
+        user = user or User.objects.create_user(username, password="!")
+        return SellerProfile.objects.create(user=user, business_name=username, business_address="-", nip="1234567890")
+
+    def submit(self):
+        return OrderService.submit(self.buyer, self.vehicle, self.parts)
+
+    def inbox(self, order) -> list[int]:
+        return sorted(SellerInbox.objects.filter(order=order).values_list("seller_id", flat=True))
+
+    def test_sellers_are_written_in_chunks(self, enqueue):
+        order = self.submit()
+        with mock.patch.object(FanOutService, "write_chunk", wraps=FanOutService.write_chunk) as write_chunk:
+            self.assertEqual(FanOutService.deliver(order.pk, chunk_size=2), 5)
+
+        ids = [seller.pk for seller in self.sellers]
+        self.assertEqual([call.args[1] for call in write_chunk.call_args_list], [ids[0:2], ids[2:4], ids[4:]])
+        self.assertEqual(self.inbox(order), ids)
+
+    def test_retried_delivery_adds_no_duplicates(self, enqueue):
+        order = self.submit()
+        FanOutService.write_chunk(order.pk, [self.sellers[0].pk])
+        FanOutService.deliver(order.pk, chunk_size=2)
+        FanOutService.deliver(order.pk, chunk_size=2)
+
+        self.assertEqual(self.inbox(order), [seller.pk for seller in self.sellers])
+
+    def test_deleted_sellers_are_skipped(self, enqueue):
+        order = self.submit()
+        seller_index()
+        # Deleted by another process: this process's index still lists the seller.
+        deleted = self.sellers.pop()
+        SellerProfile.objects.filter(pk=deleted.pk).delete()
+        self.assertIn(deleted.pk, FanOutService.eligible_seller_ids(order))
+
+        self.assertEqual(FanOutService.deliver(order.pk), 4)
+        self.assertEqual(self.inbox(order), [seller.pk for seller in self.sellers])
+
+    def test_buyer_does_not_receive_own_order(self, enqueue):
+        own = self.seller("buyer", user=self.buyer.user)
+        order = self.submit()
+
+        FanOutService.deliver(order.pk)
+        self.assertNotIn(own.pk, self.inbox(order))
+        self.assertEqual(self.inbox(order), [seller.pk for seller in self.sellers])
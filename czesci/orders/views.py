@@ -0,0 +1,100 @@
+"""Part photo upload and delivery (``orders.services.images``)."""
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.http import FileResponse, Http404, HttpResponse
+from django.shortcuts import get_object_or_404, render
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.views.decorators.http import require_GET, require_POST
+
+from core.uploads import HashingUploadHandler
+from orders.models import PartImage, PartRequest
+from orders.services.images import ORIGINAL, PartImageService, variant_name
+
+TEMPLATE = "orders/part_images.html"
+
+
+@csrf_exempt
+def upload_part_images(request, pk: int):
+    """Attach the ``images`` files to one of the buyer's parts; answers with the photo list.
+
+    The upload handler has to be installed before the body is read, so the
+    CSRF check runs after it, in ``_upload_part_images``.
+    """
+    handler = HashingUploadHandler(
+        request, temp_dir=settings.PART_IMAGE_UPLOAD_TEMP_DIR, max_bytes=settings.PART_IMAGE_MAX_BYTES
+    )
+    request.upload_handlers = [handler]
+    return _upload_part_images(request, pk, handler)
+
+
+@csrf_protect
+@login_required
+@require_POST
+def _upload_part_images(request, pk: int, handler: HashingUploadHandler):
+    part = get_object_or_404(PartRequest, pk=pk, order__buyer_profile__user=request.user)
+    errors = []
+    try:
+        uploads = request.FILES.getlist("images")
+        if handler.too_large:
+            # The upload was stopped at the first oversized file.
+            raise ValidationError(
+                f"{handler.too_large[0]}: photos may be at most {settings.PART_IMAGE_MAX_BYTES // 2**20} MB."
+            )
+        PartImageService.attach(part, uploads)
+    except ValidationError as exc:
+        errors = exc.messages
+    return render(
+        request,
+        TEMPLATE,
+        {"part": part, "images": part.images.order_by("pk"), "errors": errors},
+        status=400 if errors else 200,
+    )
+
+
+@login_required
+@require_GET
+def part_image(request, sha256: str, variant: str):
+    """Send a part photo to its buyer and the sellers the order was delivered to.
+
+    URLs are content-addressed, so a variant is cached for good. Until the
+    variants are rendered the original is sent and must be revalidated.
+    """
+    if variant != ORIGINAL and variant not in settings.PART_IMAGE_SIZES:
+        raise Http404
+    user = request.user
+    image = (
+        PartImage.objects.filter(sha256=sha256)
+        .filter(Q(part_request__order__buyer_profile__user=user) | Q(part_request__order__deliveries__seller__user=user))
+        .only("image", "sha256", "content_type", "variants_ready")
+        .first()
+    )
+    if image is None:
+        raise Http404
+
+    final = variant == ORIGINAL or image.variants_ready
+    if not final:
+        variant = ORIGINAL
+    etag = f'"{sha256}-{variant}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        name = variant_name(image, variant)
+        content_type = image.content_type if variant == ORIGINAL else "image/jpeg"
+        if settings.MEDIA_ACCEL_REDIRECT:
+            # nginx sends the file (sendfile) from its internal location.
+            response = HttpResponse(content_type=content_type)
+            response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_REDIRECT + name
+        else:
+            # Served through wsgi.file_wrapper, i.e. sendfile() under Gunicorn.
+            response = FileResponse(default_storage.open(name, "rb"), content_type=content_type)
+
+    response["ETag"] = etag
+    if final:
+        patch_cache_control(response, private=True, max_age=settings.PART_IMAGE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
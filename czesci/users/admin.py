@@ -20,7 +20,7 @@ class SellerProfileAdmin(admin.ModelAdmin):
 class PhoneNumberAdmin(admin.ModelAdmin):
     list_display = ("number", "profile_type", "is_active", "is_verified", "show_to_sellers", "created_at")
     list_filter = ("profile_type", "is_active", "is_verified", "show_to_sellers")
-    search_fields = ("number",)
+    search_fields = ("number", "number_e164")
     raw_id_fields = ("buyer_profile", "seller_profile")
 
 @admin.register(Company)
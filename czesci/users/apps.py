@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "users" 
\ No newline at end of file
+    name = "users"
+
+    def ready(self):
+        from users import signals  # noqa: F401  register signal handlers
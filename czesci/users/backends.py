@@ -0,0 +1,140 @@
+"""Authentication backend resolving phone, email or username identifiers.
+
+The login form accepts a single free-form *identifier*. Instead of probing each
+lookup strategy in turn (and hashing the password once per attempt), the
+identifier is classified up-front and resolved to at most one user with a
+single query. The password is then hashed exactly once, whether or not a user
+was found, so failed logins cost the same as successful ones.
+"""
+
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Coalesce, Lower
+
+from users.models import PhoneNumber, normalize_phone
+from users.services.passwords import acheck_password, amake_password
+
+User = get_user_model()
+
+
+class IdentifierBackend(ModelBackend):
+    """Authenticate by email, verified phone number or username.
+
+    Accepts either ``identifier`` (login form) or ``username`` (admin login,
+    ``Client.login``) as keyword argument.
+    """
+
+    EMAIL = "email"
+    PHONE = "phone"
+    USERNAME = "username"
+
+    @classmethod
+    def classify(cls, identifier: str) -> str:
+        """Return which kind of identifier the string looks like."""
+        if "@" in identifier:
+            return cls.EMAIL
+        if normalize_phone(identifier):
+            return cls.PHONE
+        return cls.USERNAME
+
+    @classmethod
+    def candidates(cls, identifier: str):
+        """Queryset of at most two users that *identifier* may refer to.
+
+        Email and phone lookups also match a literal username so superusers
+        created with such usernames keep working; the email/phone owner is
+        ordered first when both exist.
+        """
+        kind = cls.classify(identifier)
+        username_q = Q(**{User.USERNAME_FIELD: identifier})
+
+        if kind == cls.USERNAME:
+            return User._default_manager.filter(username_q)[:1]
+
+        if kind == cls.EMAIL:
+            qs = User._default_manager.alias(email_lower=Lower("email"))
+            match_q = Q(email_lower=identifier.lower())
+        else:
+            owners = (
+                PhoneNumber.objects.filter(
+                    number_e164=normalize_phone(identifier), is_verified=True, is_active=True
+                )
+                .annotate(owner_id=Coalesce("buyer_profile__user_id", "seller_profile__user_id"))
+                .values("owner_id")
+            )
+            qs = User._default_manager.all()
+            match_q = Q(pk__in=owners)
+
+        # Two rows are enough to detect an ambiguous email/phone match.
+        return (
+            qs.filter(match_q | username_q)
+            .annotate(
+                by_identifier=Case(
+                    When(match_q, then=Value(0)),
+                    default=Value(1),
+                    output_field=IntegerField(),
+                )
+            )
+            .order_by("by_identifier", "pk")[:2]
+        )
+
+    @staticmethod
+    def pick(candidates: list):
+        """Return the single user among *candidates* or ``None``."""
+        if not candidates:
+            return None
+        if len(candidates) > 1 and candidates[0].by_identifier == candidates[1].by_identifier == 0:
+            # Shared email or phone across accounts: refuse to guess.
+            return None
+        return candidates[0]
+
+    @classmethod
+    def resolve(cls, identifier: str):
+        """Return the single user matching *identifier* or ``None``."""
+        return cls.pick(list(cls.candidates(identifier)))
+
+    @classmethod
+    async def aresolve(cls, identifier: str):
+        """Async ``resolve``."""
+        return cls.pick([user async for user in cls.candidates(identifier)])
+
+    @staticmethod
+    def _identifier(identifier, username, kwargs) -> str | None:
+        identifier = identifier if identifier is not None else username
+        if identifier is None:
+            identifier = kwargs.get(User.USERNAME_FIELD)
+        return identifier
+
+    def authenticate(self, request, identifier=None, password=None, username=None, **kwargs):
+        identifier = self._identifier(identifier, username, kwargs)
+        if identifier is None or password is None:
+            return None
+
+        user = self.resolve(identifier.strip())
+        if user is None:
+            # Run the default password hasher once to reduce the timing
+            # difference between an existing and a nonexistent user.
+            User().set_password(password)
+            return None
+
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    async def aauthenticate(self, request, identifier=None, password=None, username=None, **kwargs):
+        """Async ``authenticate``; hashing runs on the pool of ``users.services.passwords``."""
+        identifier = self._identifier(identifier, username, kwargs)
+        if identifier is None or password is None:
+            return None
+
+        user = await self.aresolve(identifier.strip())
+        if user is None:
+            await amake_password(password)
+            return None
+
+        if await acheck_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,172 @@
+"""Buyer/seller settings fragment: shared context builder and rendered-HTML cache.
+
+The settings page loads ``/settings/buyer/`` and ``/settings/seller/`` via HTMX
+on every tab switch. The browser revalidates the fragments on every load.
+``etag`` builds their validator from the ``updated_at`` timestamps of the
+profile and its numbers with one aggregate query; the views are wrapped in
+``conditional`` and answer an unchanged fragment with ``304 Not Modified``
+before anything is rendered.
+
+For other plain GETs the rendered fragment is cached under that ETag, so the
+key changes with the database in every process, whatever cache backend is
+configured. ``users.signals`` additionally bumps a per-user version when a
+``PhoneNumber``, ``BuyerProfile`` or ``SellerProfile`` is saved or deleted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from functools import wraps
+from typing import List, Tuple
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils import translation
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from users.forms import BuyerProfileForm, SellerProfileForm
+from users.models import BuyerProfile, PhoneNumber, SellerProfile
+
+TEMPLATES = {
+    "buyer": "users/buyer_settings_partial.html",
+    "seller": "users/seller_settings_partial.html",
+}
+FORMS = {"buyer": BuyerProfileForm, "seller": SellerProfileForm}
+PROFILE_MODELS = {"buyer": BuyerProfile, "seller": SellerProfile}
+
+CACHE_TIMEOUT = 60 * 60
+
+
+def _version_key(user_id: int) -> str:
+    return f"settings_fragment:version:{user_id}"
+
+
+def invalidate(user_id: int) -> None:
+    """Drop every cached settings fragment of *user_id*."""
+    cache.set(_version_key(user_id), time.time_ns(), None)
+
+
+def load(user, profile_type: str) -> Tuple[object | None, List[PhoneNumber]]:
+    """Return ``(profile, active_numbers)`` for *user*.
+
+    Active numbers are fetched together with their profile in one query; the
+    profile is only queried separately when it has no active number.
+    """
+    profile_field = f"{profile_type}_profile"
+    numbers = list(
+        PhoneNumber.objects.select_related(profile_field)
+        .filter(**{f"{profile_field}__user": user, "is_active": True})
+        .order_by("pk")
+    )
+    if numbers:
+        profile = getattr(numbers[0], profile_field)
+    else:
+        profile = PROFILE_MODELS[profile_type].objects.filter(user=user).first()
+    return profile, numbers
+
+
+def build_context(profile_type: str, profile, numbers: List[PhoneNumber], form=None) -> dict:
+    if profile is None:
+        return {"profile_exists": False}
+    return {
+        "profile_exists": True,
+        "form": form or FORMS[profile_type](instance=profile),
+        "phone_numbers": numbers,
+        "phone_numbers_count": len(numbers),
+    }
+
+
+def _cache_key(request, profile_type: str) -> str | None:
+    """Cache key for the fragment, or ``None`` when the response must not be cached."""
+    state = etag(request, profile_type)
+    if state is None:
+        # No CSRF secret yet, or pending toasts that the fragment would render.
+        return None
+    version = cache.get(_version_key(request.user.pk), 0)
+    return f"settings_fragment:{request.user.pk}:{profile_type}:{version}:{state[1:-1]}"
+
+
+def etag(request, profile_type: str) -> str | None:
+    """ETag of the fragment ``request.user`` would get, or ``None`` to skip validation.
+
+    Besides the profile and phone timestamps it covers the number count (a
+    deleted number leaves no newer timestamp), the language, the deploy and
+    the CSRF secret the forms' tokens derive from. Like the HTML cache it is
+    skipped while toasts are pending. Computed once per request: the HTML
+    cache key reuses it.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None
+    csrf_secret = request.META.get("CSRF_COOKIE")
+    if not csrf_secret or len(messages.get_messages(request)):
+        return None
+    if not hasattr(request, "_settings_fragment_etags"):
+        request._settings_fragment_etags = {}
+    if profile_type not in request._settings_fragment_etags:
+        request._settings_fragment_etags[profile_type] = _etag(request, profile_type, csrf_secret)
+    return request._settings_fragment_etags[profile_type]
+
+
+def _etag(request, profile_type: str, csrf_secret: str) -> str:
+    state = PROFILE_MODELS[profile_type].objects.filter(user_id=request.user.pk).aggregate(
+        profile=Max("pk"),
+        updated=Max("updated_at"),
+        numbers=Count("phone_numbers"),
+        numbers_updated=Max("phone_numbers__updated_at"),
+    )
+    parts = [settings.DEPLOY_VERSION, translation.get_language(), csrf_secret, profile_type, *state.values()]
+    digest = hashlib.blake2b(":".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def conditional(profile_type: str):
+    """Answer GETs of the decorated fragment view with 304 while ``etag`` is unchanged."""
+
+    def decorator(view_func):
+        conditional_view = condition(etag_func=lambda request, *args, **kwargs: etag(request, profile_type))(view_func)
+
+        @wraps(view_func)
+        def wrapped(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            if request.method in ("GET", "HEAD"):
+                # Per user, and revalidated on every load.
+                patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return wrapped
+
+    return decorator
+
+
+def render_fragment(request, profile_type: str, profile=None, form=None, numbers=None) -> HttpResponse:
+    """Render the settings fragment of *profile_type* for ``request.user``.
+
+    Pass *profile* (and a bound *form*) after a POST; only the active numbers
+    are queried then, unless the caller already has them in *numbers*.
+    Without a profile the fragment may be served from cache.
+    """
+    template = TEMPLATES[profile_type]
+
+    if profile is not None:
+        if numbers is None:
+            numbers = list(profile.phone_numbers.filter(is_active=True).order_by("pk"))
+        return render(request, template, build_context(profile_type, profile, numbers, form))
+
+    key = _cache_key(request, profile_type) if request.method == "GET" else None
+    if key is not None:
+        html = cache.get(key)
+        if html is not None:
+            return HttpResponse(html)
+
+    profile, numbers = load(request.user, profile_type)
+    html = render_to_string(template, build_context(profile_type, profile, numbers, form), request)
+    if key is not None:
+        cache.set(key, html, CACHE_TIMEOUT)
+    return HttpResponse(html)
@@ -0,0 +1,17 @@
+"""Password hasher with a cost taken from settings.
+
+``PASSWORD_HASH_ITERATIONS`` sets the PBKDF2 work factor per deployment (lower
+on small containers, higher as hardware gets faster). The algorithm name is
+Django's own ``pbkdf2_sha256`` so existing hashes keep verifying; whenever a
+stored hash was made with a different iteration count ``must_update`` is true
+and ``User.check_password`` transparently re-hashes it on the next login.
+"""
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return getattr(settings, "PASSWORD_HASH_ITERATIONS", None) or PBKDF2PasswordHasher.iterations
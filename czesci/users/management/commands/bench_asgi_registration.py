@@ -0,0 +1,104 @@
+"""In-flight registrations one ASGI worker sustains.
+
+Drives ``czesci.asgi.application`` in process (``core.loadtest.AsgiClient``)
+with at most ``N`` registrations in flight for each ``--concurrency`` level.
+A registration is the registration POST followed by the OTP verification.
+Besides throughput and latency it reports the worst event-loop lag measured
+by a 10 ms ticker: views that block the loop show up there.
+
+Run it once per view implementation to compare them::
+
+    manage.py bench_asgi_registration
+    USERS_ASYNC_VIEWS=1 manage.py bench_asgi_registration
+
+Runs against a throwaway test database (``core.bench.scratch_databases``), so
+the configured database is not touched.
+"""
+
+import asyncio
+import itertools
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.bench import percentile, scratch_databases
+from core.loadtest import AsgiClient
+from users.services.otp import OtpStore
+
+OTP = "123456"
+PASSWORD = "bench-Pa55word!"
+PHONE_PREFIX = "+4855"
+TICK = 0.01
+
+
+class Command(BaseCommand):
+    help = "Benchmark concurrent in-flight registrations against the ASGI application."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+        parser.add_argument("--registrations", type=int, default=64, help="Registrations per concurrency level.")
+
+    def handle(self, *args, **options):
+        from czesci.asgi import application  # imported here: the module calls django.setup()
+
+        self.numbers = itertools.count()
+        mode = "async" if settings.USERS_ASYNC_VIEWS else "sync"
+        self.stdout.write(f"views: {mode}")
+        self.stdout.write(
+            f"{'in-flight':>10}{'regs/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'loop lag ms':>13}{'errors':>8}"
+        )
+        with scratch_databases(), mock.patch.object(OtpStore, "derive_code", return_value=OTP):
+            for concurrency in options["concurrency"]:
+                result = asyncio.run(self.run_level(application, concurrency, options["registrations"]))
+                self.stdout.write(
+                    f"{concurrency:>10}{result['rate']:>10.2f}{percentile(result['latencies'], 50):>10.1f}"
+                    f"{percentile(result['latencies'], 99):>10.1f}{result['lag'] * 1000:>13.1f}"
+                    f"{result['errors']:>8}"
+                )
+
+    async def run_level(self, app, concurrency: int, registrations: int) -> dict:
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies, errors = [], 0
+        max_lag = 0.0
+        done = asyncio.Event()
+
+        async def ticker():
+            nonlocal max_lag
+            while not done.is_set():
+                started = time.perf_counter()
+                await asyncio.sleep(TICK)
+                max_lag = max(max_lag, time.perf_counter() - started - TICK)
+
+        async def register():
+            nonlocal errors
+            async with semaphore:
+                client = AsgiClient(app)
+                data = {
+                    "first_name": "Bench",
+                    "last_name": "Async",
+                    "phone": f"{PHONE_PREFIX}{next(self.numbers):07d}",
+                    "password1": PASSWORD,
+                    "password2": PASSWORD,
+                    "role": "buyer",
+                    "age_confirm": "on",
+                    "consent_terms": "on",
+                    "consent_privacy": "on",
+                }
+                started = time.perf_counter()
+                await client.get("/register/")
+                first = await client.post("/register/", data, htmx=True)
+                second = await client.post("/verify-phone/", {"otp": OTP}, htmx=True)
+                if first.status == second.status == 204:
+                    latencies.append((time.perf_counter() - started) * 1000)
+                else:
+                    errors += 1
+
+        tick_task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        await asyncio.gather(*(register() for _ in range(registrations)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await tick_task
+        return {"rate": len(latencies) / elapsed, "latencies": latencies, "lag": max_lag, "errors": errors}
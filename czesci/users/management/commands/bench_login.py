@@ -0,0 +1,95 @@
+"""Benchmark login latency, CPU and queries per attempt.
+
+Compares the former three-step lookup of ``login_view`` (email, then phone,
+then username – each followed by ``authenticate``) with the single-query
+``IdentifierBackend``. All fixtures are created inside a transaction that is
+rolled back at the end, so the command is safe to run against any database.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from core.bench import measure
+from users.backends import IdentifierBackend
+from users.models import BuyerProfile, PhoneNumber
+
+User = get_user_model()
+
+PASSWORD = "bench-Pa55word!"
+EMAIL = "bench.login@example.com"
+PHONE = "+48500100200"
+
+
+def legacy_authenticate(identifier: str, password: str):
+    """Reproduce the lookup chain ``login_view`` used before IdentifierBackend."""
+    backend = ModelBackend()
+    try:
+        user_obj = User.objects.get(email__iexact=identifier)
+        user = backend.authenticate(None, username=user_obj.username, password=password)
+    except User.DoesNotExist:
+        user = None
+
+    if user is None:
+        phone_entry = (
+            PhoneNumber.objects.select_related("buyer_profile__user", "seller_profile__user")
+            .filter(number=identifier, is_verified=True, is_active=True)
+            .first()
+        )
+        if phone_entry:
+            owner = phone_entry.buyer_profile or phone_entry.seller_profile
+            if owner is not None:
+                user = backend.authenticate(None, username=owner.user.username, password=password)
+
+    if user is None:
+        user = backend.authenticate(None, username=identifier, password=password)
+    return user
+
+
+class Command(BaseCommand):
+    help = "Benchmark p50/p99 login latency and CPU per attempt (legacy lookup vs IdentifierBackend)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        backend = IdentifierBackend()
+
+        with transaction.atomic():
+            user = User.objects.create_user(username="48500100200", email=EMAIL, password=PASSWORD)
+            profile = BuyerProfile.objects.create(user=user, delivery_address="Bench street 1")
+            PhoneNumber.objects.create(
+                buyer_profile=profile,
+                profile_type=PhoneNumber.ProfileType.BUYER,
+                number=PHONE,
+                is_verified=True,
+            )
+
+            scenarios = {
+                "email ok": (EMAIL, PASSWORD),
+                "phone ok": (PHONE, PASSWORD),
+                "phone bad password": (PHONE, "wrong"),
+                "unknown identifier": ("nobody@example.com", PASSWORD),
+            }
+            strategies = {
+                "legacy": legacy_authenticate,
+                "backend": lambda ident, pwd: backend.authenticate(None, identifier=ident, password=pwd),
+            }
+
+            self.stdout.write(
+                f"{'scenario':<22}{'strategy':<10}{'p50 ms':>10}{'p99 ms':>10}{'cpu ms':>10}{'queries':>9}"
+            )
+            for scenario, (ident, pwd) in scenarios.items():
+                for name, fn in strategies.items():
+                    with CaptureQueriesContext(connection) as ctx:
+                        fn(ident, pwd)
+                    stats = measure(lambda: fn(ident, pwd), iterations)
+                    self.stdout.write(
+                        f"{scenario:<22}{name:<10}{stats['p50_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+                        f"{stats['cpu_ms_per_call']:>10.2f}{len(ctx.captured_queries):>9}"
+                    )
+
+            transaction.set_rollback(True)
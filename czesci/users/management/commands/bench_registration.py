@@ -0,0 +1,84 @@
+"""Registration throughput at increasing client concurrency.
+
+Each client is a thread with its own DB connection calling
+``RegistrationService.register_basic``. ``--hash-in-transaction`` reproduces
+the former behaviour (``make_password`` inside ``transaction.atomic``) for a
+before/after comparison. With SQLite every client is a concurrent writer, so
+the ``errors`` column shows "database is locked" failures that survived
+``core.db.retry_on_lock``. Runs against a throwaway test database
+(``core.bench.scratch_databases``), so the configured database is not touched.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections, connection, transaction
+
+from core.bench import percentile, scratch_databases
+from users.services.registration import RegistrationService
+
+PHONE_PREFIX = "+4869"
+
+
+class Command(BaseCommand):
+    help = "Benchmark registrations per second at 1, 8, 32 and 64 concurrent clients."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32, 64])
+        parser.add_argument("--registrations", type=int, default=32, help="Registrations per concurrency level.")
+        parser.add_argument(
+            "--hash-in-transaction",
+            action="store_true",
+            help="Hash inside the DB transaction, as register_basic did before.",
+        )
+
+    def handle(self, *args, **options):
+        self.counter = 0
+        self.lock = threading.Lock()
+        legacy = options["hash_in_transaction"]
+
+        self.stdout.write(f"{'clients':>8}{'regs/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+        with scratch_databases():
+            for clients in options["clients"]:
+                latencies, errors = [], []
+                started = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=clients) as pool:
+                    for result in pool.map(lambda _: self.register(legacy), range(options["registrations"])):
+                        (latencies if isinstance(result, float) else errors).append(result)
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{clients:>8}{len(latencies) / elapsed:>10.2f}{percentile(latencies, 50):>10.1f}"
+                    f"{percentile(latencies, 99):>10.1f}{len(errors):>8}"
+                )
+                for error in set(map(str, errors)):
+                    self.stderr.write(f"  {error}")
+
+    def next_phone(self) -> str:
+        with self.lock:
+            self.counter += 1
+            return f"{PHONE_PREFIX}{self.counter:07d}"
+
+    def register(self, legacy: bool):
+        data = {
+            "first_name": "Bench",
+            "last_name": "Client",
+            "phone": self.next_phone(),
+            "password1": "bench-Pa55word!",
+            "role": "buyer",
+        }
+        started = time.perf_counter()
+        try:
+            if legacy:
+                with transaction.atomic():
+                    RegistrationService.create_basic(data, make_password(data["password1"]))
+            else:
+                RegistrationService.register_basic(data)
+            return (time.perf_counter() - started) * 1000
+        except DatabaseError as exc:
+            return exc
+        finally:
+            close_old_connections()
+            connection.close()
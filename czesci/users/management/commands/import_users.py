@@ -0,0 +1,70 @@
+"""Stream buyers/sellers from a CSV or JSONL file into the database.
+
+The checkpoint file records the last line of the last committed chunk, so an
+interrupted import can be restarted with the same arguments and continues
+where it stopped.
+"""
+
+import json
+import os
+import time
+from contextlib import suppress
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.datafiles import read_rows
+from users.services.bulk_import import UserImporter
+
+
+class Command(BaseCommand):
+    help = "Bulk import buyer and seller accounts from CSV or JSONL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV (with header) or .jsonl file.")
+        parser.add_argument("--chunk-size", type=int, default=500)
+        parser.add_argument("--hash-workers", type=int, default=None, help="Password hashing processes.")
+        parser.add_argument("--checkpoint", help="Checkpoint file (default: <path>.checkpoint).")
+        parser.add_argument("--mark-verified", action="store_true", help="Mark imported phone numbers verified.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.exists(path):
+            raise CommandError(f"File not found: {path}")
+        checkpoint = options["checkpoint"] or f"{path}.checkpoint"
+
+        resume_after = 0
+        if os.path.exists(checkpoint):
+            with open(checkpoint, encoding="utf-8") as fh:
+                resume_after = json.load(fh)["line"]
+            self.stdout.write(f"Resuming after line {resume_after}.")
+
+        importer = UserImporter(
+            chunk_size=options["chunk_size"],
+            hash_workers=options["hash_workers"],
+            mark_verified=options["mark_verified"],
+            on_error=lambda line_no, error: self.stderr.write(f"line {line_no}: {error}"),
+        )
+        rows = ((line_no, row) for line_no, row in read_rows(path, importer.error) if line_no > resume_after)
+
+        started = time.perf_counter()
+        processed = 0
+        try:
+            for last_line in importer.run(rows):
+                processed = last_line - resume_after
+                with open(checkpoint, "w", encoding="utf-8") as fh:
+                    json.dump({"line": last_line}, fh)
+                elapsed = time.perf_counter() - started
+                self.stdout.write(f"line {last_line}: {processed / elapsed:.1f} rows/s, {importer.created} created")
+        finally:
+            importer.close()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done: {processed} rows in {elapsed:.1f}s ({processed / elapsed if elapsed else 0:.1f} rows/s), "
+                f"{importer.created} created, {importer.skipped} skipped, {importer.invalid} invalid."
+            )
+        )
+        # No checkpoint was written when no chunk was committed (e.g. header-only CSV).
+        with suppress(FileNotFoundError):
+            os.remove(checkpoint)
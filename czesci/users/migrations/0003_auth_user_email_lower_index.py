@@ -0,0 +1,41 @@
+"""Expression index on LOWER(email) for case-insensitive email login.
+
+``users.backends.IdentifierBackend`` looks users up by ``LOWER(email)``; the
+user table belongs to ``auth`` so the index is managed here with raw SQL.
+The double parentheses keep the statement valid on SQLite, PostgreSQL and
+MySQL 8.0.13+.
+"""
+
+from django.conf import settings
+from django.db import migrations
+
+INDEX_NAME = "users_auth_user_email_lower"
+
+
+def create_index(apps, schema_editor):
+    user_model = apps.get_model(settings.AUTH_USER_MODEL)
+    qn = schema_editor.quote_name
+    schema_editor.execute(
+        f"CREATE INDEX {qn(INDEX_NAME)} ON {qn(user_model._meta.db_table)} ((LOWER({qn('email')})))"
+    )
+
+
+def drop_index(apps, schema_editor):
+    user_model = apps.get_model(settings.AUTH_USER_MODEL)
+    qn = schema_editor.quote_name
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute(f"DROP INDEX {qn(INDEX_NAME)} ON {qn(user_model._meta.db_table)}")
+    else:
+        schema_editor.execute(f"DROP INDEX {qn(INDEX_NAME)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_phonenumber_show_to_sellers'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:31
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+
+SUFFIX_RE = re.compile(r"^(?P<base>.+?)(?:_(?P<suffix>\d+))?$")
+
+
+def backfill_sequences(apps, schema_editor):
+    """Seed one counter per existing username base with its highest suffix."""
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    UsernameSequence = apps.get_model("users", "UsernameSequence")
+
+    highest = {}
+    for username in User.objects.values_list("username", flat=True).iterator(chunk_size=2000):
+        match = SUFFIX_RE.match(username)
+        base, suffix = match["base"], int(match["suffix"] or 0)
+        highest[base] = max(highest.get(base, 0), suffix)
+
+    UsernameSequence.objects.bulk_create(
+        (UsernameSequence(base=base, last_suffix=suffix) for base, suffix in highest.items()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_auth_user_email_lower_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UsernameSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('base', models.CharField(max_length=150, unique=True)),
+                ('last_suffix', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_sequences, migrations.RunPython.noop),
+    ]
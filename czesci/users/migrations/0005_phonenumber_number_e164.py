@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_usernamesequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='phonenumber',
+            name='number_e164',
+            field=models.CharField(blank=True, default='', editable=False, max_length=16),
+        ),
+    ]
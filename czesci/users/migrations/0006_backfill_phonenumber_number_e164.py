@@ -0,0 +1,61 @@
+"""Fill ``PhoneNumber.number_e164`` for existing rows.
+
+Runs outside a single migration transaction and commits every batch, so large
+tables are not locked for the whole backfill.
+
+``normalize_phone`` is a frozen copy of ``users.models.normalize_phone`` as of
+this migration: migrations must not import code that may later change or be
+removed.
+"""
+
+import re
+
+from django.db import migrations, transaction
+
+BATCH_SIZE = 1000
+
+E164_RE = re.compile(r"^\+[1-9]\d{7,14}$")
+PHONE_SEPARATORS_RE = re.compile(r"[\s().\-]")
+
+
+def normalize_phone(raw):
+    number = PHONE_SEPARATORS_RE.sub("", raw or "")
+    if number.startswith("00"):
+        number = "+" + number[2:]
+    elif not number.startswith("+"):
+        number = "+" + number
+    return number if E164_RE.match(number) else ""
+
+
+def backfill_number_e164(apps, schema_editor):
+    PhoneNumber = apps.get_model("users", "PhoneNumber")
+    db_alias = schema_editor.connection.alias
+
+    last_pk = 0
+    while True:
+        with transaction.atomic(using=db_alias):
+            batch = list(
+                PhoneNumber.objects.using(db_alias)
+                .filter(pk__gt=last_pk)
+                .order_by("pk")
+                .only("pk", "number")[:BATCH_SIZE]
+            )
+            if not batch:
+                return
+            for phone in batch:
+                phone.number_e164 = normalize_phone(phone.number)
+            PhoneNumber.objects.using(db_alias).bulk_update(batch, ["number_e164"])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('users', '0005_phonenumber_number_e164'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_number_e164, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_backfill_phonenumber_number_e164'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='phonenumber',
+            index=models.Index(fields=['number_e164', 'is_verified', 'is_active'], name='phone_e164_verified_active'),
+        ),
+        migrations.AddIndex(
+            model_name='phonenumber',
+            index=models.Index(fields=['buyer_profile', 'is_active'], name='phone_buyer_active'),
+        ),
+        migrations.AddIndex(
+            model_name='phonenumber',
+            index=models.Index(fields=['seller_profile', 'is_active'], name='phone_seller_active'),
+        ),
+    ]
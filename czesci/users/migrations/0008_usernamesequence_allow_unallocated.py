@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 13:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_phonenumber_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='usernamesequence',
+            name='last_suffix',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -1,3 +1,5 @@
+import re
+
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.core.validators import RegexValidator
@@ -58,6 +60,24 @@ PHONE_REGEX = RegexValidator(
     message="Enter a valid phone number in E.164 format.",
 )
 
+E164_RE = re.compile(r"^\+[1-9]\d{7,14}$")
+PHONE_SEPARATORS_RE = re.compile(r"[\s().\-]")
+
+
+def normalize_phone(raw: str) -> str:
+    """Return *raw* in canonical E.164 form (``+48123123123``).
+
+    Spaces, dashes, dots and brackets are dropped, a ``00`` international prefix
+    becomes ``+`` and a missing ``+`` is added. Returns an empty string when the
+    result is not a plausible E.164 number.
+    """
+    number = PHONE_SEPARATORS_RE.sub("", raw or "")
+    if number.startswith("00"):
+        number = "+" + number[2:]
+    elif not number.startswith("+"):
+        number = "+" + number
+    return number if E164_RE.match(number) else ""
+
 
 class PhoneNumber(models.Model):
     """Stores multiple phone numbers per BuyerProfile or SellerProfile.
@@ -89,6 +109,8 @@ class PhoneNumber(models.Model):
         choices=ProfileType.choices,
     )
     number = models.CharField(max_length=32, validators=[PHONE_REGEX])
+    # Canonical E.164 form of ``number`` filled on save; all lookups go through it.
+    number_e164 = models.CharField(max_length=16, blank=True, default="", editable=False)
     is_active = models.BooleanField(default=True)
     is_verified = models.BooleanField(default=False)
     # Indicates if this phone number should be exposed to sellers. Applicable **only** for
@@ -108,11 +130,45 @@ class PhoneNumber(models.Model):
                 name="phone_profile_type_consistency",
             ),
         ]
+        indexes = [
+            # Login and OTP verification: number_e164=…, is_verified=…, is_active=…
+            models.Index(fields=["number_e164", "is_verified", "is_active"], name="phone_e164_verified_active"),
+            # Settings partials: profile.phone_numbers.filter(is_active=True)
+            models.Index(fields=["buyer_profile", "is_active"], name="phone_buyer_active"),
+            models.Index(fields=["seller_profile", "is_active"], name="phone_seller_active"),
+        ]
 
     def __str__(self) -> str:  # noqa: DunderStr
         owner = self.buyer_profile or self.seller_profile
         return f"{self.number} ({owner})"
 
+    def save(self, *args, **kwargs):
+        self.number_e164 = normalize_phone(self.number)
+        update_fields = kwargs.get("update_fields")
+        if update_fields:
+            # auto_now only applies to saved fields; settings fragments validate against updated_at.
+            update_fields = {*update_fields, "updated_at"}
+            if "number" in update_fields:
+                update_fields.add("number_e164")
+            kwargs["update_fields"] = update_fields
+        super().save(*args, **kwargs)
+
+
+class UsernameSequence(models.Model):
+    """Last numeric suffix handed out for a username base.
+
+    Usernames are derived from phone numbers (``48123123123``, ``48123123123_1``…).
+    Keeping a counter per base lets registration pick the next free name with a
+    bounded number of queries instead of probing every ``_<n>`` candidate.
+    """
+
+    base = models.CharField(max_length=150, unique=True)
+    # -1 only inside UsernameAllocator.allocate_many: a row created before any suffix is taken.
+    last_suffix = models.IntegerField(default=0)
+
+    def __str__(self) -> str:  # noqa: DunderStr
+        return f"{self.base} (#{self.last_suffix})"
+
 
 class Company(models.Model):
     """Normalized legal & invoicing data for a seller company (Poland default)."""
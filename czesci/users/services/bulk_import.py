@@ -0,0 +1,229 @@
+"""Bulk onboarding of buyers and sellers from partner lists.
+
+Rows are validated with the same form rules as the web registration and
+written chunk by chunk with ``bulk_create``: one transaction and a constant
+number of queries per chunk, independent of the chunk size. Passwords are
+hashed in a process pool because PBKDF2 dominates the per-row cost.
+Invalid rows (including JSONL lines that are not a JSON object, see
+``core.datafiles.read_rows``) are passed to the ``on_error`` callback as they
+are found and only counted, so memory does not grow with the size of the file.
+
+Expected row keys (CSV header or JSONL object): ``role`` (buyer/seller),
+``first_name``, ``last_name``, ``phone``, ``email``, ``password``,
+``consent_marketing`` and the role-specific fields of
+``BuyerRegistrationForm`` / ``SellerRegistrationForm``.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Tuple
+
+import django
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from users.forms import BuyerRegistrationForm, SellerRegistrationForm
+from users.models import BuyerProfile, Consent, PhoneNumber, SellerProfile, normalize_phone
+from users.services.usernames import UsernameAllocator
+from users.signals import sellers_imported
+
+User = get_user_model()
+
+TRUE_VALUES = {"1", "true", "yes", "y", "on"}
+
+
+def _init_hash_worker() -> None:
+    """Make Django settings usable in spawned hashing processes."""
+    if not apps.ready:
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "czesci.settings")
+        django.setup()
+
+
+class UserImporter:
+    """Validate and insert rows in chunks; see module docstring for the row format."""
+
+    def __init__(
+        self,
+        chunk_size: int = 500,
+        hash_workers: int | None = None,
+        mark_verified: bool = False,
+        on_error: Callable[[int, str], None] | None = None,
+    ):
+        self.chunk_size = chunk_size
+        self.mark_verified = mark_verified
+        self.hash_workers = hash_workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.hash_workers, initializer=_init_hash_worker)
+        self.created = 0
+        self.skipped = 0
+        self.invalid = 0
+        self.on_error = on_error
+
+    def close(self) -> None:
+        self.pool.shutdown()
+
+    def error(self, line_no: int, message: str) -> None:
+        """Count an invalid row and report it to ``on_error``."""
+        self.invalid += 1
+        if self.on_error is not None:
+            self.on_error(line_no, message)
+
+    # ---------------------------------------------------
+    # Validation
+    # ---------------------------------------------------
+
+    def validate(self, line_no: int, row: dict) -> dict | None:
+        """Return cleaned data for *row* or record an error and return ``None``."""
+        # JSONL values may be numbers or null; the checks below expect text.
+        row = {key: "" if value is None else str(value) for key, value in row.items() if key is not None}
+        role = row.get("role", "").strip().lower()
+        form_class = {"buyer": BuyerRegistrationForm, "seller": SellerRegistrationForm}.get(role)
+        if form_class is None:
+            self.error(line_no, f"Unknown role {role!r}")
+            return None
+
+        form = form_class(data=row)
+        problems = [f"{field}: {' '.join(msgs)}" for field, msgs in form.errors.items()]
+
+        phone = normalize_phone(row.get("phone", ""))
+        if not phone:
+            problems.append("phone: Enter a valid phone number in E.164 format.")
+        for field in ("first_name", "last_name", "password"):
+            if not (row.get(field) or "").strip():
+                problems.append(f"{field}: This field is required.")
+        email = (row.get("email") or "").strip()
+        if email:
+            try:
+                validate_email(email)
+            except ValidationError as exc:
+                problems.append(f"email: {' '.join(exc.messages)}")
+
+        if problems:
+            self.error(line_no, "; ".join(problems))
+            return None
+
+        return {
+            **form.cleaned_data,
+            "role": role,
+            "phone": phone,
+            "email": email,
+            "first_name": row["first_name"].strip(),
+            "last_name": row["last_name"].strip(),
+            "password": row["password"],
+            "consent_marketing": row.get("consent_marketing", "").strip().lower() in TRUE_VALUES,
+        }
+
+    # ---------------------------------------------------
+    # Import
+    # ---------------------------------------------------
+
+    def run(self, rows: Iterable[Tuple[int, dict]]) -> Iterator[int]:
+        """Import *rows*, yielding the last line number of every committed chunk."""
+        rows = iter(rows)
+        while chunk := list(islice(rows, self.chunk_size)):
+            cleaned = [(line_no, data) for line_no, row in chunk if (data := self.validate(line_no, row))]
+            if cleaned:
+                self.import_chunk([data for _, data in cleaned])
+            yield chunk[-1][0]
+
+    def import_chunk(self, rows: list[dict]) -> None:
+        # Rows whose number is already in use are skipped rather than duplicated.
+        in_use = set(
+            PhoneNumber.objects.filter(number_e164__in=[r["phone"] for r in rows], is_active=True).values_list(
+                "number_e164", flat=True
+            )
+        )
+        fresh = []
+        for row in rows:
+            if row["phone"] in in_use:
+                self.skipped += 1
+            else:
+                in_use.add(row["phone"])
+                fresh.append(row)
+        if not fresh:
+            return
+
+        chunksize = max(1, len(fresh) // (self.hash_workers * 4))
+        hashes = list(self.pool.map(make_password, [r["password"] for r in fresh], chunksize=chunksize))
+
+        with transaction.atomic():
+            usernames = UsernameAllocator.allocate_many([r["phone"].lstrip("+") for r in fresh])
+            User.objects.bulk_create(
+                User(
+                    username=username,
+                    first_name=row["first_name"],
+                    last_name=row["last_name"],
+                    email=row["email"],
+                    password=password_hash,
+                    is_active=True,
+                )
+                for row, username, password_hash in zip(fresh, usernames, hashes)
+            )
+            # Re-read ids by username: bulk_create cannot return pks on MySQL.
+            user_ids = dict(User.objects.filter(username__in=usernames).values_list("username", "pk"))
+
+            buyers = [(row, user_ids[name]) for row, name in zip(fresh, usernames) if row["role"] == "buyer"]
+            sellers = [(row, user_ids[name]) for row, name in zip(fresh, usernames) if row["role"] == "seller"]
+
+            BuyerProfile.objects.bulk_create(
+                BuyerProfile(user_id=user_id, delivery_address=row["delivery_address"]) for row, user_id in buyers
+            )
+            SellerProfile.objects.bulk_create(
+                SellerProfile(
+                    user_id=user_id,
+                    business_name=row["business_name"],
+                    business_address=row["business_address"],
+                    nip=row["nip"],
+                    regon=row.get("regon", ""),
+                    krs=row.get("krs", ""),
+                )
+                for row, user_id in sellers
+            )
+            buyer_profiles = dict(
+                BuyerProfile.objects.filter(user_id__in=[u for _, u in buyers]).values_list("user_id", "pk")
+            )
+            seller_profiles = dict(
+                SellerProfile.objects.filter(user_id__in=[u for _, u in sellers]).values_list("user_id", "pk")
+            )
+            # bulk_create sends no post_save; receivers (orders.signals) get the chunk instead.
+            sellers_imported.send(sender=SellerProfile, seller_ids=list(seller_profiles.values()))
+
+            # bulk_create skips PhoneNumber.save(), so number_e164 is set explicitly.
+            PhoneNumber.objects.bulk_create(
+                [
+                    PhoneNumber(
+                        buyer_profile_id=buyer_profiles[user_id],
+                        profile_type=PhoneNumber.ProfileType.BUYER,
+                        number=row["phone"],
+                        number_e164=row["phone"],
+                        is_verified=self.mark_verified,
+                    )
+                    for row, user_id in buyers
+                ]
+                + [
+                    PhoneNumber(
+                        seller_profile_id=seller_profiles[user_id],
+                        profile_type=PhoneNumber.ProfileType.SELLER,
+                        number=row["phone"],
+                        number_e164=row["phone"],
+                        is_verified=self.mark_verified,
+                    )
+                    for row, user_id in sellers
+                ]
+            )
+
+            consents = []
+            for row, username in zip(fresh, usernames):
+                types = [Consent.ConsentType.TERMS, Consent.ConsentType.PRIVACY, Consent.ConsentType.AGE]
+                if row["consent_marketing"]:
+                    types.append(Consent.ConsentType.MARKETING)
+                consents.extend(Consent(user_id=user_ids[username], type=consent_type) for consent_type in types)
+            Consent.objects.bulk_create(consents)
+
+        self.created += len(fresh)
@@ -0,0 +1,132 @@
+"""One-time password storage on Django's cache framework.
+
+Codes are stored as keyed HMACs with a TTL, never in clear text, and attempts
+are counted with an atomic ``cache.incr`` per (user, number) pair instead of in
+the session. A failed verification therefore touches only the cache – the
+database is written once, when the code finally matches.
+
+A code is derived from a random nonce with ``SECRET_KEY`` (``derive_code``).
+The SMS job is queued with the nonce only, so the job table never holds a
+code and the worker recomputes it right before sending.
+
+The attempt counter is only as atomic as the cache backend's ``incr``:
+local-memory, Memcached and Redis are; use one of the latter two when several
+worker processes serve OTP verification.
+"""
+
+from __future__ import annotations
+
+import secrets
+from typing import Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from users.models import normalize_phone
+
+
+class OtpStore:  # pylint: disable=too-few-public-methods
+    """Issue, verify and invalidate OTP codes for a (user, phone number) pair."""
+
+    VERIFIED = "verified"
+    INVALID = "invalid"
+    EXPIRED = "expired"
+    LOCKED = "locked"
+
+    KEY_PREFIX = "otp"
+
+    @staticmethod
+    def _keys(user_id: int, number: str) -> Tuple[str, str]:
+        base = f"{OtpStore.KEY_PREFIX}:{user_id}:{normalize_phone(number) or number}"
+        return f"{base}:code", f"{base}:attempts"
+
+    @staticmethod
+    def _digest(user_id: int, number: str, code: str) -> str:
+        return salted_hmac(
+            "users.services.otp.OtpStore", f"{user_id}:{normalize_phone(number) or number}:{code}"
+        ).hexdigest()
+
+    @staticmethod
+    def generate_code() -> str:
+        """Return 6-digit zero-padded OTP string."""
+        return f"{secrets.randbelow(1_000_000):06d}"
+
+    @staticmethod
+    def derive_code(user_id: int, number: str, nonce: str) -> str:
+        """Return the 6-digit code of *nonce*; recomputing it needs ``SECRET_KEY``."""
+        digest = salted_hmac(
+            "users.services.otp.OtpStore.derive_code", f"{user_id}:{normalize_phone(number) or number}:{nonce}"
+        ).digest()
+        return f"{int.from_bytes(digest[:8], 'big') % 1_000_000:06d}"
+
+    @staticmethod
+    def issue(user_id: int, number: str) -> Tuple[str, str]:
+        """Generate a new code for *number*, store its hash and reset attempts.
+
+        Returns ``(code, nonce)``: the clear-text code for the caller and the
+        nonce to queue the SMS with (see ``SmsGateway.queue_otp``).
+        """
+        nonce = secrets.token_urlsafe(16)
+        code = OtpStore.derive_code(user_id, number, nonce)
+        code_key, attempts_key = OtpStore._keys(user_id, number)
+        cache.set_many(
+            {code_key: OtpStore._digest(user_id, number, code), attempts_key: 0},
+            timeout=settings.OTP_TTL_SECONDS,
+        )
+        return code, nonce
+
+    @staticmethod
+    def _status(matches: bool, attempts: int) -> Tuple[str, int]:
+        """Outcome of attempt number *attempts* for a code that is still stored."""
+        attempts_left = max(settings.MAX_SMS_ATTEMPTS - attempts, 0)
+        if attempts > settings.MAX_SMS_ATTEMPTS:
+            return OtpStore.LOCKED, 0
+        return OtpStore.VERIFIED if matches else OtpStore.INVALID, attempts_left
+
+    @staticmethod
+    def verify(user_id: int, number: str, code: str) -> Tuple[str, int]:
+        """Check *code* and return ``(status, attempts_left)``.
+
+        ``status`` is one of ``VERIFIED``, ``INVALID``, ``EXPIRED`` or ``LOCKED``.
+        A verified code is invalidated so it cannot be replayed.
+        """
+        code_key, attempts_key = OtpStore._keys(user_id, number)
+        expected = cache.get(code_key)
+        if expected is None:
+            return OtpStore.EXPIRED, 0
+
+        try:
+            attempts = cache.incr(attempts_key)
+        except ValueError:  # counter expired between the two calls
+            return OtpStore.EXPIRED, 0
+
+        matches = constant_time_compare(OtpStore._digest(user_id, number, code), expected)
+        status, attempts_left = OtpStore._status(matches, attempts)
+        if status == OtpStore.VERIFIED:
+            OtpStore.invalidate(user_id, number)
+        return status, attempts_left
+
+    @staticmethod
+    async def averify(user_id: int, number: str, code: str) -> Tuple[str, int]:
+        """Async ``verify`` using the cache's async API."""
+        code_key, attempts_key = OtpStore._keys(user_id, number)
+        expected = await cache.aget(code_key)
+        if expected is None:
+            return OtpStore.EXPIRED, 0
+
+        try:
+            attempts = await cache.aincr(attempts_key)
+        except ValueError:
+            return OtpStore.EXPIRED, 0
+
+        matches = constant_time_compare(OtpStore._digest(user_id, number, code), expected)
+        status, attempts_left = OtpStore._status(matches, attempts)
+        if status == OtpStore.VERIFIED:
+            await cache.adelete_many(OtpStore._keys(user_id, number))
+        return status, attempts_left
+
+    @staticmethod
+    def invalidate(user_id: int, number: str) -> None:
+        """Forget any pending code and attempt counter for the pair."""
+        cache.delete_many(OtpStore._keys(user_id, number))
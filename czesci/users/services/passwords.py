@@ -0,0 +1,44 @@
+"""Password hashing helpers that keep the ASGI event loop responsive.
+
+PBKDF2 is CPU-bound and takes hundreds of milliseconds by design. Called from
+an ``async def`` view it would stall every other coroutine on the worker, so
+the async helpers run the hasher on a dedicated thread pool (hashlib releases
+the GIL while hashing). ``PASSWORD_HASH_THREADS`` sizes the pool; when it is
+unset the event loop's default executor is used.
+
+``acheck_password`` may also save a re-hashed password, so it runs through
+``sync_to_async`` and closes the connection it opened on the pool thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+from core.db import closing_connections
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_executor() -> ThreadPoolExecutor | None:
+    """Return the shared hashing pool, or ``None`` for the loop's default executor."""
+    global _executor  # pylint: disable=global-statement
+    workers = getattr(settings, "PASSWORD_HASH_THREADS", None)
+    if workers and _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+    return _executor
+
+
+async def amake_password(raw_password: str) -> str:
+    """``make_password`` off the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), make_password, raw_password)
+
+
+async def acheck_password(user, raw_password: str) -> bool:
+    """``user.check_password`` off the event loop (may re-hash and save on success)."""
+    check = sync_to_async(closing_connections(user.check_password), thread_sensitive=False, executor=get_executor())
+    return await check(raw_password)
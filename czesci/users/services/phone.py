@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-import random
 from typing import Tuple
 
+from asgiref.sync import sync_to_async
 from django.db import transaction
 
+from core.db import closing_connections, retry_on_lock
 from users.models import PhoneNumber, BuyerProfile, SellerProfile
+from users.services.otp import OtpStore
 from users.services.sms import SmsGateway
 
 
@@ -17,13 +19,14 @@ class PhoneService:  # pylint: disable=too-few-public-methods
     @staticmethod
     def generate_otp() -> str:
         """Return 6-digit zero-padded OTP string."""
-        return f"{random.randint(0, 999999):06d}"
+        return OtpStore.generate_code()
 
     # ---------------------------------------------------
     # Public helpers
     # ---------------------------------------------------
 
     @staticmethod
+    @retry_on_lock
     @transaction.atomic
     def add_number_and_send_otp(profile, number: str) -> Tuple[PhoneNumber, str]:
         """Persist new inactive PhoneNumber linked to *profile* and send OTP.
@@ -53,13 +56,50 @@ class PhoneService:  # pylint: disable=too-few-public-methods
         else:
             raise ValueError("Profile must be BuyerProfile or SellerProfile")
 
-        otp_code = PhoneService.generate_otp()
-        SmsGateway.send_otp(number, otp_code)
+        otp_code, otp_nonce = OtpStore.issue(profile.user_id, number)
+        SmsGateway.queue_otp(profile.user_id, number, otp_nonce)
         return phone_obj, otp_code
 
     @staticmethod
+    async def aadd_number_and_send_otp(profile, number: str) -> Tuple[PhoneNumber, str]:
+        """Async ``add_number_and_send_otp``.
+
+        The number and its SMS job must commit together, so the transactional
+        part runs in a worker thread.
+        """
+        add_number = sync_to_async(closing_connections(PhoneService.add_number_and_send_otp), thread_sensitive=False)
+        return await add_number(profile, number)
+
+    @staticmethod
+    def verify_number(user, phone_obj: PhoneNumber, otp_entered: str) -> Tuple[str, int]:
+        """Check *otp_entered* for *phone_obj* and mark it verified on success.
+
+        Returns ``(status, attempts_left)`` as reported by ``OtpStore.verify``;
+        the database is only written when the code matches.
+        """
+        status, attempts_left = OtpStore.verify(user.pk, phone_obj.number, otp_entered)
+        if status == OtpStore.VERIFIED:
+            PhoneService.mark_verified(phone_obj)
+        return status, attempts_left
+
+    @staticmethod
+    async def averify_number(user, phone_obj: PhoneNumber, otp_entered: str) -> Tuple[str, int]:
+        """Async ``verify_number``."""
+        status, attempts_left = await OtpStore.averify(user.pk, phone_obj.number, otp_entered)
+        if status == OtpStore.VERIFIED:
+            await PhoneService.amark_verified(phone_obj)
+        return status, attempts_left
+
+    @staticmethod
+    @retry_on_lock
     @transaction.atomic
     def mark_verified(phone_obj: PhoneNumber) -> None:  # noqa: D401
         """Mark phone number as verified."""
         phone_obj.is_verified = True
-        phone_obj.save(update_fields=["is_verified"]) 
\ No newline at end of file
+        phone_obj.save(update_fields=["is_verified"])
+
+    @staticmethod
+    async def amark_verified(phone_obj: PhoneNumber) -> None:
+        """Async ``mark_verified``; a single UPDATE needs no transaction."""
+        phone_obj.is_verified = True
+        await phone_obj.asave(update_fields=["is_verified"])
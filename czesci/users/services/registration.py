@@ -8,15 +8,20 @@ from __future__ import annotations
 
 from typing import Tuple
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import make_password
 from django.db import transaction
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
-from users.models import BuyerProfile, SellerProfile, PhoneNumber
+from core.db import closing_connections, retry_on_lock
+from users.models import BuyerProfile, SellerProfile, PhoneNumber, normalize_phone
 from users.services.sms import SmsGateway
+from users.services.otp import OtpStore
+from users.services.passwords import amake_password
 from users.services.phone import PhoneService
+from users.services.usernames import UsernameAllocator
 
 User = get_user_model()
 
@@ -25,36 +30,55 @@ class RegistrationService:  # pylint: disable=too-few-public-methods
     """Encapsulates the registration and onboarding flow."""
 
     @staticmethod
-    @transaction.atomic
     def register_basic(data: dict, ip_address: str | None = None) -> Tuple[User, str]:
         """Create *User* and inactive *PhoneNumber*.
 
+        The password is hashed before the transaction is opened so the write
+        transaction never spans the (deliberately slow) hasher.
+
         Returns tuple (user, otp_code).
         """
         required = {"first_name", "last_name", "phone", "password1"}
         if not required.issubset(data):
             raise ValidationError("Missing required fields for basic registration.")
 
+        password_hash = make_password(data["password1"])
+        return RegistrationService.create_basic(data, password_hash, ip_address)
+
+    @staticmethod
+    async def aregister_basic(data: dict, ip_address: str | None = None) -> Tuple[User, str]:
+        """Async ``register_basic`` for the ASGI views.
+
+        The password is hashed on the hashing pool; ``create_basic`` then runs in
+        a worker thread because transactions are not available in the async ORM.
+        Not thread-sensitive: concurrent signups must not queue behind one thread.
+        """
+        required = {"first_name", "last_name", "phone", "password1"}
+        if not required.issubset(data):
+            raise ValidationError("Missing required fields for basic registration.")
+
+        password_hash = await amake_password(data["password1"])
+        create_basic = sync_to_async(closing_connections(RegistrationService.create_basic), thread_sensitive=False)
+        return await create_basic(data, password_hash, ip_address)
+
+    @staticmethod
+    @retry_on_lock
+    @transaction.atomic
+    def create_basic(data: dict, password_hash: str, ip_address: str | None = None) -> Tuple[User, str]:
+        """DB part of ``register_basic`` taking an already hashed password."""
         phone = data["phone"].strip()
         first_name = data["first_name"].strip()
         last_name = data["last_name"].strip()
         email = data.get("email", "").strip()
-        raw_pwd = data["password1"]
 
         # Generate unique username from phone or timestamp
         username_base = phone.lstrip("+") or str(int(timezone.now().timestamp()))
-        username = username_base
-        counter = 1
-        while User.objects.filter(username=username).exists():
-            username = f"{username_base}_{counter}"
-            counter += 1
-
-        user = User.objects.create(
-            username=username,
+        user = UsernameAllocator.create_user(
+            username_base,
             first_name=first_name,
             last_name=last_name,
             email=email,
-            password=make_password(raw_pwd),
+            password=password_hash,
             is_active=True,
         )
 
@@ -68,11 +92,11 @@ class RegistrationService:  # pylint: disable=too-few-public-methods
             is_verified=False,
         )
 
-        # Generate OTP (6-digits)
-        otp_code = PhoneService.generate_otp()
+        # Generate OTP (6-digits); only its hash is kept, see OtpStore
+        otp_code, otp_nonce = OtpStore.issue(user.pk, phone)
 
-        # Send via SMS gateway (stub)
-        SmsGateway.send_otp(phone, otp_code)
+        # Queue SMS delivery; sent by the job worker after commit
+        SmsGateway.queue_otp(user.pk, phone, otp_nonce)
 
         # Store consents
         from users.models import Consent  # local import to avoid circular
@@ -87,24 +111,43 @@ class RegistrationService:  # pylint: disable=too-few-public-methods
 
         Consent.objects.bulk_create(consents)
 
-        # In production we would persist hashed OTP with TTL or send via provider.
         return user, otp_code
 
     @staticmethod
-    @transaction.atomic
-    def verify_phone(phone_number: str, otp_entered: str, expected_otp: str) -> bool:  # noqa: D401
-        """Validate OTP and mark phone as verified by delegating to PhoneService."""
-        if otp_entered != expected_otp:
-            return False
+    def verify_phone(user_id: int, phone_number: str, otp_entered: str) -> Tuple[str, int]:  # noqa: D401
+        """Validate OTP and mark phone as verified by delegating to PhoneService.
 
-        phone_entry = PhoneNumber.objects.filter(number=phone_number, is_verified=False).first()
+        Returns ``(status, attempts_left)`` as reported by ``OtpStore.verify``.
+        """
+        status, attempts_left = OtpStore.verify(user_id, phone_number, otp_entered)
+        if status != OtpStore.VERIFIED:
+            return status, attempts_left
+
+        phone_entry = PhoneNumber.objects.filter(
+            number_e164=normalize_phone(phone_number), is_verified=False, is_active=True
+        ).first()
         if phone_entry:
             PhoneService.mark_verified(phone_entry)
 
-        # Return True if OTP matches, consistent with original behaviour
-        return True
+        return status, attempts_left
+
+    @staticmethod
+    async def averify_phone(user_id: int, phone_number: str, otp_entered: str) -> Tuple[str, int]:
+        """Async ``verify_phone``."""
+        status, attempts_left = await OtpStore.averify(user_id, phone_number, otp_entered)
+        if status != OtpStore.VERIFIED:
+            return status, attempts_left
+
+        phone_entry = await PhoneNumber.objects.filter(
+            number_e164=normalize_phone(phone_number), is_verified=False, is_active=True
+        ).afirst()
+        if phone_entry:
+            await PhoneService.amark_verified(phone_entry)
+
+        return status, attempts_left
 
     @staticmethod
+    @retry_on_lock
     @transaction.atomic
     def register_buyer(user: User, data: dict, phone_number: str) -> BuyerProfile:
         """Persist BuyerProfile and associate the verified phone number."""
@@ -118,7 +161,7 @@ class RegistrationService:  # pylint: disable=too-few-public-methods
 
         # Associate phone number
         phone_entry = PhoneNumber.objects.filter(
-            number=phone_number, profile_type=PhoneNumber.ProfileType.BUYER, buyer_profile__isnull=True
+            number_e164=normalize_phone(phone_number), profile_type=PhoneNumber.ProfileType.BUYER, buyer_profile__isnull=True
         ).first()
         if phone_entry:
             phone_entry.buyer_profile = profile
@@ -127,6 +170,7 @@ class RegistrationService:  # pylint: disable=too-few-public-methods
         return profile
 
     @staticmethod
+    @retry_on_lock
     @transaction.atomic
     def register_seller(user: User, data: dict, phone_number: str) -> SellerProfile:
         """Persist SellerProfile and associate the verified phone number."""
@@ -144,7 +188,7 @@ class RegistrationService:  # pylint: disable=too-few-public-methods
 
         # Associate phone number
         phone_entry = PhoneNumber.objects.filter(
-            number=phone_number, profile_type=PhoneNumber.ProfileType.SELLER, seller_profile__isnull=True
+            number_e164=normalize_phone(phone_number), profile_type=PhoneNumber.ProfileType.SELLER, seller_profile__isnull=True
         ).first()
         if phone_entry:
             phone_entry.seller_profile = profile
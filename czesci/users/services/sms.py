@@ -4,13 +4,31 @@ Currently logs OTP to console — replace with real provider (e.g., Twilio) in p
 
 import logging
 
+from core.jobs import enqueue
+from users.services.otp import OtpStore
+
 logger = logging.getLogger(__name__)
 
 
 class SmsGateway:  # pylint: disable=too-few-public-methods
     """Simple SMS gateway stub."""
 
+    @staticmethod
+    def queue_otp(user_id: int, number: str, nonce: str) -> None:
+        """Schedule OTP delivery as a background job.
+
+        Only writes a job row, so it is safe to call inside ``transaction.atomic``:
+        the SMS goes out after commit and a slow provider never holds the request.
+        The row holds the nonce from ``OtpStore.issue``, never the code itself.
+        """
+        enqueue("users.send_otp_sms", user_id=user_id, number=number, nonce=nonce)
+
+    @staticmethod
+    def send_queued_otp(user_id: int, number: str, nonce: str) -> None:
+        """Recompute the code queued by ``queue_otp`` and send it."""
+        SmsGateway.send_otp(number, OtpStore.derive_code(user_id, number, nonce))
+
     @staticmethod
     def send_otp(number: str, code: str) -> None:  # noqa: D401
-        """Send OTP via SMS (stub)."""
-        logger.info("[SMS] Sending OTP %s to %s", code, number) 
\ No newline at end of file
+        """Send OTP via SMS (stub). Runs in the job worker, see ``users.tasks``."""
+        logger.info("[SMS] Sending OTP %s to %s", code, number)
@@ -0,0 +1,102 @@
+"""Username allocation backed by a per-base counter table.
+
+``register_basic`` derives usernames from the phone number. Probing
+``<base>``, ``<base>_1``, ``<base>_2``… costs one query per existing account and
+races under concurrent signups. Instead ``UsernameSequence`` hands out the next
+suffix with an atomic ``UPDATE … SET last_suffix = last_suffix + 1`` so the
+number of queries does not depend on how many accounts share the base.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from users.models import UsernameSequence
+
+User = get_user_model()
+
+
+class UsernameAllocator:  # pylint: disable=too-few-public-methods
+    """Allocate unique usernames of the form ``<base>`` / ``<base>_<n>``."""
+
+    # Extra suffixes tried when a candidate is taken by an account that was not
+    # allocated through the counter (e.g. ``createsuperuser``).
+    MAX_ATTEMPTS = 5
+
+    @staticmethod
+    def format(base: str, suffix: int) -> str:
+        """Return the username for *suffix*; suffix 0 is the bare base."""
+        return base if suffix == 0 else f"{base}_{suffix}"
+
+    @staticmethod
+    def next_suffix(base: str) -> int:
+        """Reserve and return the next suffix for *base* (2–3 queries)."""
+        with transaction.atomic():
+            bumped = UsernameSequence.objects.filter(base=base).update(last_suffix=F("last_suffix") + 1)
+            if not bumped:
+                try:
+                    with transaction.atomic():
+                        UsernameSequence.objects.create(base=base, last_suffix=0)
+                    return 0
+                except IntegrityError:
+                    # A concurrent signup created the counter first.
+                    UsernameSequence.objects.filter(base=base).update(last_suffix=F("last_suffix") + 1)
+            return UsernameSequence.objects.values_list("last_suffix", flat=True).get(base=base)
+
+    @staticmethod
+    def create_user(base: str, **fields) -> User:
+        """Create a *User* with the next free username derived from *base*.
+
+        The counter row stays locked until the surrounding transaction commits,
+        so concurrent signups on the same base are serialized while different
+        bases proceed in parallel.
+        """
+        for _ in range(UsernameAllocator.MAX_ATTEMPTS):
+            username = UsernameAllocator.format(base, UsernameAllocator.next_suffix(base))
+            try:
+                with transaction.atomic():
+                    return User.objects.create(username=username, **fields)
+            except IntegrityError:
+                continue
+        raise IntegrityError(f"Could not allocate a free username for base {base!r}.")
+
+    @staticmethod
+    def allocate_many(bases: list[str]) -> list[str]:
+        """Reserve one username per entry of *bases* (repeats allowed) for bulk inserts.
+
+        Counters for all bases are created, read, advanced and written back with a
+        constant number of queries; the returned names are free at the time of the
+        call and are meant to be inserted in the same transaction.
+        """
+        wanted = Counter(bases)
+        with transaction.atomic():
+            # Create the missing counters first; a concurrent signup or import may
+            # create the same ones, so conflicts are ignored and every counter is
+            # then read back locked and advanced the same way.
+            UsernameSequence.objects.bulk_create(
+                [UsernameSequence(base=base, last_suffix=-1) for base in wanted], ignore_conflicts=True
+            )
+            sequences = list(UsernameSequence.objects.select_for_update().filter(base__in=list(wanted)))
+            next_suffix = {}
+            for seq in sequences:
+                next_suffix[seq.base] = seq.last_suffix + 1
+                seq.last_suffix += wanted[seq.base]
+            UsernameSequence.objects.bulk_update(sequences, ["last_suffix"])
+
+        usernames = []
+        for base in bases:
+            usernames.append(UsernameAllocator.format(base, next_suffix[base]))
+            next_suffix[base] += 1
+
+        # Names taken outside the counter (e.g. createsuperuser) are re-allocated one by one.
+        taken = set(User.objects.filter(username__in=usernames).values_list("username", flat=True))
+        for index, (base, username) in enumerate(zip(bases, usernames)):
+            while username in taken:
+                username = UsernameAllocator.format(base, UsernameAllocator.next_suffix(base))
+                taken.update(User.objects.filter(username=username).values_list("username", flat=True))
+            usernames[index] = username
+        return usernames
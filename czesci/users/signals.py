@@ -0,0 +1,46 @@
+"""Signal handlers keeping cached settings fragments in sync with the database.
+
+Also defines ``sellers_imported``, the bulk counterpart of ``post_save`` for
+``SellerProfile``: ``users.services.bulk_import`` sends it inside the import
+transaction with the ``seller_ids`` of every chunk, since ``bulk_create``
+sends no ``post_save``.
+"""
+
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from users import fragments
+from users.models import BuyerProfile, PhoneNumber, SellerProfile
+
+sellers_imported = Signal()
+
+
+@receiver([post_save, post_delete], sender=BuyerProfile)
+@receiver([post_save, post_delete], sender=SellerProfile)
+def invalidate_profile_fragments(sender, instance, **kwargs):
+    fragments.invalidate(instance.user_id)
+
+
+def owner_id(phone: PhoneNumber) -> int | None:
+    """User id of *phone*'s profile, read without loading the profile.
+
+    ``None`` when the number has no profile or it was removed in the same cascade.
+    """
+    for descriptor in (PhoneNumber.buyer_profile, PhoneNumber.seller_profile):
+        field = descriptor.field
+        profile_id = getattr(phone, field.attname)
+        if profile_id is None:
+            continue
+        if descriptor.is_cached(phone):
+            return getattr(phone, field.name).user_id
+        return field.related_model.objects.filter(pk=profile_id).values_list("user_id", flat=True).first()
+    return None
+
+
+@receiver([post_save, post_delete], sender=PhoneNumber)
+def invalidate_phone_fragments(sender, instance, **kwargs):
+    user_id = owner_id(instance)
+    if user_id is not None:
+        fragments.invalidate(user_id)
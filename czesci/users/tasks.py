@@ -0,0 +1,9 @@
+"""Background job handlers for the users app (see ``core.jobs``)."""
+
+from core.jobs import job
+from users.services.sms import SmsGateway
+
+
+@job("users.send_otp_sms")
+def send_otp_sms(user_id: int, number: str, nonce: str) -> None:
+    SmsGateway.send_queued_otp(user_id, number, nonce)
@@ -0,0 +1,52 @@
+"""Bulk account import (``users.services.bulk_import``, ``manage.py import_users``)."""
+
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from users.models import BuyerProfile
+
+HEADER = "role,first_name,last_name,phone,email,password,delivery_address\n"
+
+
+class ImportUsersCommandTests(TestCase):
+    def import_file(self, content: str, name: str = "accounts.csv") -> tuple[str, str]:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, name)
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write(content)
+            stdout, stderr = StringIO(), StringIO()
+            call_command("import_users", path, hash_workers=1, stdout=stdout, stderr=stderr)
+            self.assertFalse(os.path.exists(f"{path}.checkpoint"))
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_header_only_file(self):
+        stdout, _ = self.import_file(HEADER)
+        self.assertIn("0 created, 0 skipped, 0 invalid.", stdout)
+
+    def test_invalid_rows_are_reported_and_counted(self):
+        stdout, stderr = self.import_file(
+            HEADER
+            + "buyer,Jan,Kowalski,+48600100200,,Pa55word!,Street 1\n"
+            + "courier,Anna,Nowak,+48600100201,,Pa55word!,Street 2\n"
+        )
+        self.assertIn("line 2: Unknown role 'courier'", stderr)
+        self.assertIn("1 created, 0 skipped, 1 invalid.", stdout)
+        self.assertEqual(BuyerProfile.objects.count(), 1)
+
+    def test_jsonl_numbers_and_malformed_lines(self):
+        stdout, stderr = self.import_file(
+            '{"role": "buyer", "first_name": "Jan", "last_name": "Kowalski", "phone": 48600100200, '
+            '"email": null, "password": "Pa55word!", "delivery_address": "Street 1"}\n'
+            '{"role": "buyer", "first_name": "Anna"\n'
+            "[1, 2]\n",
+            name="accounts.jsonl",
+        )
+        self.assertIn("line 2: Invalid JSON", stderr)
+        self.assertIn("line 3: Invalid JSON: Expected a JSON object, got list.", stderr)
+        self.assertIn("1 created, 0 skipped, 2 invalid.", stdout)
+        self.assertTrue(BuyerProfile.objects.filter(phone_numbers__number_e164="+48600100200").exists())
+
@@ -0,0 +1,43 @@
+"""Cached settings fragments (``users.fragments``) follow the database."""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from users.models import BuyerProfile, PhoneNumber
+from users.signals import owner_id
+
+User = get_user_model()
+
+
+class SettingsFragmentCacheTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("jan", password="Pa55word!")
+        self.profile = BuyerProfile.objects.create(user=self.user, delivery_address="Street 1")
+        self.phone = PhoneNumber.objects.create(
+            buyer_profile=self.profile, profile_type=PhoneNumber.ProfileType.BUYER, number="+48600100200"
+        )
+        self.client.force_login(self.user)
+        self.client.get(reverse("settings"))  # sets the CSRF cookie the cache key needs
+
+    def test_change_made_by_another_process_is_not_served_stale(self):
+        self.assertContains(self.client.get(reverse("settings_buyer")), "+48600100200")
+        cached = self.client.get(reverse("settings_buyer"))
+        self.assertContains(cached, "+48600100200")
+
+        # Another worker saved the number: its signal bumped only its own cache.
+        PhoneNumber.objects.filter(pk=self.phone.pk).update(number="+48600100299", updated_at=timezone.now())
+
+        self.assertContains(self.client.get(reverse("settings_buyer")), "+48600100299")
+
+    def test_phone_signal_reads_only_the_owner_id(self):
+        phone = PhoneNumber.objects.get(pk=self.phone.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(owner_id(phone), self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(owner_id(self.phone), self.user.pk)  # profile already loaded
+
+    def test_deleting_the_profile_cascades_without_errors(self):
+        self.profile.delete()
+        self.assertFalse(PhoneNumber.objects.exists())
@@ -0,0 +1,24 @@
+"""The login and settings lookups are served by the indexes added for them."""
+
+from django.test import TestCase
+
+from users.backends import IdentifierBackend
+from users.models import PhoneNumber
+
+
+class LookupIndexTests(TestCase):
+    """``QuerySet.explain()`` names the index each lookup relies on."""
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, f"{index_name} is not used by:\n{plan}")
+
+    def test_phone_login_uses_e164_index(self):
+        self.assertUsesIndex(IdentifierBackend.candidates("+48 600 100 200"), "phone_e164_verified_active")
+
+    def test_email_login_uses_lower_email_index(self):
+        self.assertUsesIndex(IdentifierBackend.candidates("Jan@Example.com"), "users_auth_user_email_lower")
+
+    def test_settings_phone_lists_use_profile_indexes(self):
+        self.assertUsesIndex(PhoneNumber.objects.filter(buyer_profile_id=1, is_active=True), "phone_buyer_active")
+        self.assertUsesIndex(PhoneNumber.objects.filter(seller_profile_id=1, is_active=True), "phone_seller_active")
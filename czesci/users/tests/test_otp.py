@@ -0,0 +1,51 @@
+"""OTP delivery through the job queue and phone verification in the settings."""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from core.models import Job
+from users.models import BuyerProfile, PhoneNumber
+from users.services.otp import OtpStore
+from users.services.registration import RegistrationService
+from users.services.sms import SmsGateway
+from users.tasks import send_otp_sms
+
+
+class QueuedOtpTests(TestCase):
+    def test_job_payload_holds_no_code_and_the_worker_sends_the_issued_one(self):
+        user, code = RegistrationService.create_basic(
+            {"first_name": "Jan", "last_name": "Kowalski", "phone": "+48600100200", "role": "buyer"}, "!"
+        )
+
+        job_obj = Job.objects.get(name="users.send_otp_sms")
+        self.assertEqual(set(job_obj.payload), {"user_id", "number", "nonce"})
+        self.assertNotIn(code, str(job_obj.payload))
+        self.assertEqual(job_obj.payload["user_id"], user.pk)
+
+        with mock.patch.object(SmsGateway, "send_otp") as send_otp:
+            send_otp_sms(**job_obj.payload)
+        send_otp.assert_called_once_with("+48600100200", code)
+
+
+class VerifyPhoneSettingsTests(TestCase):
+    def phone(self, username: str) -> PhoneNumber:
+        user = get_user_model().objects.create_user(username, password="!")
+        profile = BuyerProfile.objects.create(user=user, delivery_address="-")
+        return PhoneNumber.objects.create(
+            buyer_profile=profile, profile_type=PhoneNumber.ProfileType.BUYER, number="+48600100200"
+        )
+
+    def test_code_for_own_number_does_not_verify_another_users_row(self):
+        victim_phone = self.phone("victim")
+        attacker = self.phone("attacker").buyer_profile.user
+        code, _nonce = OtpStore.issue(attacker.pk, "+48600100200")
+        self.client.force_login(attacker)
+
+        response = self.client.post(reverse("phone_verify", args=[victim_phone.pk, "buyer"]), {"otp": code})
+
+        self.assertEqual(response.status_code, 404)
+        victim_phone.refresh_from_db()
+        self.assertFalse(victim_phone.is_verified)
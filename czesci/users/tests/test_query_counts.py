@@ -0,0 +1,102 @@
+"""Queries per request of the benchmarked flows (see ``manage.py benchmark``).
+
+The counts include ``BEGIN``/``SAVEPOINT`` statements, like the benchmark's.
+``TransactionTestCase`` keeps the views' transactions real, so the
+instrumentation middleware sees the production counts and, with
+``QUERY_BUDGET_STRICT`` on, fails a view over its ``QUERY_BUDGETS`` entry.
+"""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+
+from users.models import BuyerProfile, PhoneNumber
+from users.services.otp import OtpStore
+
+User = get_user_model()
+
+OTP = "123456"
+PASSWORD = "Pa55word!-query"
+PHONE = "+48600100200"
+
+
+@override_settings(QUERY_BUDGET_STRICT=True, PAGE_CACHE_ENABLED=False, PASSWORD_HASH_ITERATIONS=1000)
+@mock.patch.object(OtpStore, "derive_code", return_value=OTP)
+class QueryCountTests(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("jan", email="jan@example.com", password=PASSWORD)
+        self.profile = BuyerProfile.objects.create(user=self.user, delivery_address="Street 1")
+        PhoneNumber.objects.create(
+            buyer_profile=self.profile,
+            profile_type=PhoneNumber.ProfileType.BUYER,
+            number=PHONE,
+            is_verified=True,
+        )
+
+    def login(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse("settings_buyer"))  # sets the CSRF cookie, like the first tab load
+
+    def test_registration(self, _derive_code):
+        data = {
+            "first_name": "Anna",
+            "last_name": "Nowak",
+            "phone": "+48600100201",
+            "email": "anna@example.com",
+            "password1": PASSWORD,
+            "password2": PASSWORD,
+            "role": "buyer",
+            "age_confirm": "on",
+            "consent_terms": "on",
+            "consent_privacy": "on",
+        }
+        with self.assertNumQueries(18):
+            self.assertEqual(self.client.post(reverse("register"), data).status_code, 302)
+
+    def test_login(self, _derive_code):
+        for identifier in (PHONE, "jan@example.com"):
+            self.client.logout()
+            with self.assertNumQueries(9):
+                response = self.client.post(reverse("login"), {"identifier": identifier, "password": PASSWORD})
+            self.assertEqual(response.status_code, 302)
+
+    def test_settings(self, _derive_code):
+        self.login()
+        with self.assertNumQueries(3):
+            self.client.get(reverse("settings"))
+        # user, ETag aggregate, profile with its numbers
+        with self.assertNumQueries(3):
+            fragment = self.client.get(reverse("settings_buyer"), HTTP_HX_REQUEST="true")
+        # cached HTML: user, ETag aggregate
+        with self.assertNumQueries(2):
+            self.client.get(reverse("settings_buyer"), HTTP_HX_REQUEST="true")
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse("settings_buyer"), HTTP_HX_REQUEST="true", HTTP_IF_NONE_MATCH=fragment["ETag"]
+            )
+        self.assertEqual(response.status_code, 304)
+        # no seller profile: its numbers and the profile itself are queried
+        with self.assertNumQueries(4):
+            self.client.get(reverse("settings_seller"), HTTP_HX_REQUEST="true")
+
+    def test_phone_settings(self, _derive_code):
+        self.login()
+        extra = "+48600100299"
+        with self.assertNumQueries(6):
+            response = self.client.post(
+                reverse("phone_add"), {"number": extra, "profile_type": "buyer"}, HTTP_HX_REQUEST="true"
+            )
+        self.assertEqual(response.status_code, 204)
+        pk = PhoneNumber.objects.values_list("pk", flat=True).get(number=extra)
+        with self.assertNumQueries(6):
+            response = self.client.post(
+                reverse("phone_verify", args=[pk, "buyer"]), {"otp": OTP}, HTTP_HX_REQUEST="true"
+            )
+        self.assertEqual(response.status_code, 204)
+        with self.assertNumQueries(5):
+            self.client.post(reverse("phone_toggle_visibility", args=[pk]), HTTP_HX_REQUEST="true")
+        with self.assertNumQueries(5):
+            response = self.client.post(reverse("phone_deactivate", args=[pk]), HTTP_HX_REQUEST="true")
+        self.assertEqual(response.status_code, 200)
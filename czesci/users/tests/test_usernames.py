@@ -0,0 +1,94 @@
+"""Concurrent username allocation (``users.services.usernames``)."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import TransactionTestCase
+
+from users.models import UsernameSequence
+from users.services.registration import RegistrationService
+from users.services.usernames import UsernameAllocator
+
+User = get_user_model()
+
+PHONES = ["+48600100200", "+48600100201", "+48600100202"]
+REGISTRATIONS = 300
+THREADS = 16
+# Hashing is not what is tested here; create_basic takes a ready hash.
+UNUSABLE_PASSWORD = "!"
+
+
+class ConcurrentRegistrationTests(TransactionTestCase):
+    """Hundreds of parallel signups on a few shared bases get distinct usernames."""
+
+    def register(self, index: int) -> str:
+        try:
+            user, _otp = RegistrationService.create_basic(
+                {
+                    "first_name": "Jan",
+                    "last_name": f"Kowalski {index}",
+                    "phone": PHONES[index % len(PHONES)],
+                    "role": "buyer",
+                },
+                UNUSABLE_PASSWORD,
+            )
+            return user.username
+        finally:
+            connection.close()
+
+    def test_parallel_registrations_get_unique_usernames(self):
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            usernames = list(pool.map(self.register, range(REGISTRATIONS)))
+
+        self.assertEqual(len(set(usernames)), REGISTRATIONS)
+        self.assertEqual(User.objects.count(), REGISTRATIONS)
+        per_base = REGISTRATIONS // len(PHONES)
+        for phone in PHONES:
+            base = phone.lstrip("+")
+            expected = {UsernameAllocator.format(base, suffix) for suffix in range(per_base)}
+            usernames = set(User.objects.filter(username__startswith=base).values_list("username", flat=True))
+            self.assertEqual(usernames, expected)
+            self.assertEqual(UsernameSequence.objects.get(base=base).last_suffix, per_base - 1)
+
+    def test_names_taken_outside_the_counter_are_skipped(self):
+        base = PHONES[0].lstrip("+")
+        User.objects.create(username=UsernameAllocator.format(base, 1))
+
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            usernames = list(pool.map(lambda _: self.allocate(base), range(50)))
+
+        self.assertEqual(len(set(usernames)), 50)
+        self.assertNotIn(UsernameAllocator.format(base, 1), usernames)
+
+    @staticmethod
+    def allocate(base: str) -> str:
+        try:
+            return RegistrationService.create_basic(
+                {"first_name": "Anna", "last_name": "Nowak", "phone": f"+{base}"}, UNUSABLE_PASSWORD
+            )[0].username
+        finally:
+            connection.close()
+
+    @staticmethod
+    def import_chunk(_index: int) -> list[str]:
+        """What ``UserImporter.import_chunk`` does: allocate and insert in one transaction."""
+        bases = [phone.lstrip("+") for phone in PHONES] * 2
+        try:
+            with transaction.atomic():
+                usernames = UsernameAllocator.allocate_many(bases)
+                User.objects.bulk_create(User(username=username) for username in usernames)
+            return usernames
+        finally:
+            connection.close()
+
+    def test_parallel_imports_and_registrations_share_new_counters(self):
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            imported = pool.map(self.import_chunk, range(20))
+            registered = pool.map(self.register, range(60))
+            usernames = [name for chunk in imported for name in chunk] + list(registered)
+
+        self.assertEqual(len(set(usernames)), 20 * 2 * len(PHONES) + 60)
+        self.assertEqual(User.objects.count(), len(usernames))
+        for phone in PHONES:
+            self.assertEqual(UsernameSequence.objects.get(base=phone.lstrip("+")).last_suffix, 20 * 2 + 20 - 1)
@@ -6,6 +6,7 @@ from django.shortcuts import redirect, render
 from django.urls import reverse
 from django.utils.translation import gettext as _
 from django.contrib.auth.decorators import login_required
+from django.db.models import Q
 from django.urls import reverse_lazy
 from django.http import HttpResponse
 from .forms import (
@@ -17,7 +18,11 @@ from .forms import (
     SellerProfileForm,
 )
 
+from core.rendering import render_page
+
+from . import fragments
 from .models import PhoneNumber, BuyerProfile, SellerProfile
+from users.services.otp import OtpStore
 from users.services.registration import RegistrationService
 
 
@@ -33,34 +38,8 @@ def login_view(request):
             identifier = form.cleaned_data["identifier"].strip()
             password = form.cleaned_data["password"]
 
-            # Basic authentication logic: try email, then username.
-            # 1. Try by email
-            try:
-                user_obj = User.objects.get(email__iexact=identifier)
-                user = authenticate(request, username=user_obj.username, password=password)
-            except User.DoesNotExist:
-                user = None
-
-            # 2. Try by verified phone number
-            if user is None:
-                phone_entry = (
-                    PhoneNumber.objects.select_related("buyer_profile__user", "seller_profile__user")
-                    .filter(number=identifier, is_verified=True, is_active=True)
-                    .first()
-                )
-                if phone_entry:
-                    related_user = None
-                    if phone_entry.buyer_profile:
-                        related_user = phone_entry.buyer_profile.user
-                    elif phone_entry.seller_profile:
-                        related_user = phone_entry.seller_profile.user
-
-                    if related_user is not None:
-                        user = authenticate(request, username=related_user.username, password=password)
-
-            # 3. Fall back to username login (for superusers etc.)
-            if user is None:
-                user = authenticate(request, username=identifier, password=password)
+            # Email, phone or username – resolved by users.backends.IdentifierBackend
+            user = authenticate(request, identifier=identifier, password=password)
 
             if user is not None:
                 login(request, user)
@@ -76,9 +55,8 @@ def login_view(request):
     else:
         form = LoginForm()
 
-    # If request via HTMX, return partial template only.
-    template = "users/login_form_partial.html" if request.headers.get("HX-Request") else "users/login.html"
-    return render(request, template, {"form": form})
+    # HTMX requests only get the form block back.
+    return render_page(request, "users/login.html", {"form": form}, block="form")
 
 
 def logout_view(request):
@@ -109,9 +87,9 @@ def switch_to_buyer(request):
 def register_view(request):
     """Render and process the basic registration form (Step 1).
 
-    After a successful POST the user object is created and an OTP is generated.
-    The OTP is **temporarily** stored in the session for demo purposes only.
-    The user is then redirected to the phone-verification screen.
+    After a successful POST the user object is created and an OTP is generated
+    (its hash is kept in ``OtpStore``). The user is then redirected to the
+    phone-verification screen.
     """
 
     # Determine initial dropdown selection from query-param (GET only)
@@ -131,7 +109,6 @@ def register_view(request):
             request.session["pending_user_id"] = user.id
             request.session["pending_phone"] = cd["phone"]
             request.session["pending_role"] = cd["role"]
-            request.session["pending_otp"] = otp_code
 
             messages.info(
                 request,
@@ -148,8 +125,7 @@ def register_view(request):
     else:
         form = BasicRegistrationForm(initial={"role": initial_role})
 
-    template = "users/register_form_partial.html" if request.headers.get("HX-Request") else "users/register.html"
-    return render(request, template, {"form": form, "role": initial_role})
+    return render_page(request, "users/register.html", {"form": form, "role": initial_role}, block="form")
 
 
 def verify_phone_view(request):
@@ -161,29 +137,28 @@ def verify_phone_view(request):
 
     if request.method == "POST":
         otp_entered = request.POST.get("otp", "").strip()
-        expected_otp = request.session.get("pending_otp")
+        user_id = request.session["pending_user_id"]
+        phone_number = request.session["pending_phone"]
+
+        # Attempts are rate-limited per (user, number) by OtpStore; failed
+        # attempts write nothing to the session or database.
+        status, attempts_left = RegistrationService.verify_phone(user_id, phone_number, otp_entered)
 
-        # Rate-limiting: allow max 5 attempts per session
-        attempt_key = "otp_attempts"
-        attempts = request.session.get(attempt_key, 0) + 1
-        request.session[attempt_key] = attempts
-        if attempts > settings.MAX_SMS_ATTEMPTS:
+        if status == OtpStore.LOCKED:
             messages.error(request, _("Too many failed attempts. Please restart registration."))
             return redirect(reverse("register"))
 
-        if otp_entered == expected_otp:
-            user_id = request.session["pending_user_id"]
-            phone_number = request.session["pending_phone"]
-            role = request.session["pending_role"]
+        if status == OtpStore.EXPIRED:
+            messages.error(request, _("OTP expired. Please restart registration."))
+            return redirect(reverse("register"))
 
-            # Mark phone verified via service
-            RegistrationService.verify_phone(phone_number, otp_entered, expected_otp)
+        if status == OtpStore.VERIFIED:
+            role = request.session["pending_role"]
 
             # Log the user in and clean up session
             user = User.objects.get(id=user_id)
             login(request, user)
-            for key in ["pending_user_id", "pending_otp", "otp_attempts"]:
-                request.session.pop(key, None)
+            request.session.pop("pending_user_id", None)
 
             # Decide next step based on chosen role
             next_url = reverse("register_buyer") if role == "buyer" else reverse("register_seller")
@@ -195,7 +170,7 @@ def verify_phone_view(request):
 
             return redirect(next_url)
 
-        messages.error(request, _(f"Invalid OTP. Attempts left: {settings.MAX_SMS_ATTEMPTS - attempts}"))
+        messages.error(request, _(f"Invalid OTP. Attempts left: {attempts_left}"))
 
     template = "users/verify_phone.html"
     return render(request, template)
@@ -235,8 +210,7 @@ def register_buyer_view(request):
     else:
         form = BuyerRegistrationForm()
 
-    template = "users/buyer_register_form_partial.html" if request.headers.get("HX-Request") else "users/buyer_register.html"
-    return render(request, template, {"form": form})
+    return render_page(request, "users/buyer_register.html", {"form": form}, block="form")
 
 
 def register_seller_view(request):
@@ -270,8 +244,7 @@ def register_seller_view(request):
     else:
         form = SellerRegistrationForm()
 
-    template = "users/seller_register_form_partial.html" if request.headers.get("HX-Request") else "users/seller_register.html"
-    return render(request, template, {"form": form})
+    return render_page(request, "users/seller_register.html", {"form": form}, block="form")
 
 
 # ---------------- Settings Page Views -----------------
@@ -285,6 +258,7 @@ def settings_view(request):
 
 
 @login_required
+@fragments.conditional("buyer")
 def buyer_settings_partial(request):
     """HTMX fragment for Buyer settings.
 
@@ -292,70 +266,49 @@ def buyer_settings_partial(request):
     Supports POST updates with HX-Refresh.
     """
 
-    profile = getattr(request.user, "buyer_profile", None)
+    if request.method != "POST":
+        return fragments.render_fragment(request, "buyer")
 
+    profile = getattr(request.user, "buyer_profile", None)
     if not profile:
         # No profile yet – show CTA
-        return render(request, "users/buyer_settings_partial.html", {"profile_exists": False})
+        return fragments.render_fragment(request, "buyer")
 
-    if request.method == "POST":
-        form = BuyerProfileForm(request.POST, instance=profile)
-        if form.is_valid():
-            form.save()
-            if request.headers.get("HX-Request"):
-                resp = HttpResponse(status=204)
-                resp["HX-Refresh"] = "true"
-                return resp
-    else:
-        form = BuyerProfileForm(instance=profile)
+    form = BuyerProfileForm(request.POST, instance=profile)
+    if form.is_valid():
+        form.save()
+        if request.headers.get("HX-Request"):
+            resp = HttpResponse(status=204)
+            resp["HX-Refresh"] = "true"
+            return resp
 
-    numbers = profile.phone_numbers.filter(is_active=True)
-    return render(
-        request,
-        "users/buyer_settings_partial.html",
-        {
-            "profile_exists": True,
-            "form": form,
-            "phone_numbers": numbers,
-            "phone_numbers_count": numbers.count(),
-        },
-    )
+    return fragments.render_fragment(request, "buyer", profile=profile, form=form)
 
 
 @login_required
+@fragments.conditional("seller")
 def seller_settings_partial(request):
     """HTMX fragment for Seller settings.
 
     Similar logic to buyer.
     """
 
-    profile = getattr(request.user, "seller_profile", None)
+    if request.method != "POST":
+        return fragments.render_fragment(request, "seller")
 
+    profile = getattr(request.user, "seller_profile", None)
     if not profile:
-        return render(request, "users/seller_settings_partial.html", {"profile_exists": False})
+        return fragments.render_fragment(request, "seller")
 
-    if request.method == "POST":
-        form = SellerProfileForm(request.POST, instance=profile)
-        if form.is_valid():
-            form.save()
-            if request.headers.get("HX-Request"):
-                resp = HttpResponse(status=204)
-                resp["HX-Refresh"] = "true"
-                return resp
-    else:
-        form = SellerProfileForm(instance=profile)
+    form = SellerProfileForm(request.POST, instance=profile)
+    if form.is_valid():
+        form.save()
+        if request.headers.get("HX-Request"):
+            resp = HttpResponse(status=204)
+            resp["HX-Refresh"] = "true"
+            return resp
 
-    numbers = profile.phone_numbers.filter(is_active=True)
-    return render(
-        request,
-        "users/seller_settings_partial.html",
-        {
-            "profile_exists": True,
-            "form": form,
-            "phone_numbers": numbers,
-            "phone_numbers_count": numbers.count(),
-        },
-    )
+    return fragments.render_fragment(request, "seller", profile=profile, form=form)
 
 
 @login_required
@@ -393,9 +346,11 @@ def add_phone_view(request):
     except Exception as exc:  # pylint: disable=broad-except
         return HttpResponse(f"Error: {exc}", status=400)
 
-    # Store expected OTP in session keyed by phone id (demo only)
-    otp_session_key = f"settings_phone_otp_{phone_obj.id}"
-    request.session[otp_session_key] = otp_code
+    if settings.DEBUG:
+        messages.info(
+            request,
+            _(f"For demo purposes, your OTP is {otp_code}. It would normally be sent via SMS."),
+        )
 
     verify_url = reverse("phone_verify", args=[phone_obj.id, profile_type])
 
@@ -411,37 +366,31 @@ def add_phone_view(request):
 def verify_phone_settings_view(request, pk, profile_type):
     """Verify phone number (Settings flow). Displays same template & handles OTP POST.
 
-    OTP code is stored in the session under key ``settings_phone_otp_<pk>`` during addition.
+    The OTP hash is kept in ``OtpStore`` for (current user, number) during addition.
     After successful verification marks the number as verified and redirects back to settings.
     """
 
     from users.models import PhoneNumber  # local import avoid top circular
     try:
-        phone_obj = PhoneNumber.objects.get(id=pk, is_active=True)
+        # OTPs are keyed by (user, number): only the user's own row may be verified.
+        phone_obj = PhoneNumber.objects.get(
+            Q(buyer_profile__user=request.user) | Q(seller_profile__user=request.user), id=pk, is_active=True
+        )
     except PhoneNumber.DoesNotExist:
         return HttpResponse("Phone not found", status=404)
 
-    session_key = f"settings_phone_otp_{pk}"
-    expected_otp = request.session.get(session_key)
-
-    if settings.DEBUG and expected_otp:
-        messages.info(
-            request,
-            _(f"For demo purposes, your OTP is {expected_otp}. It would normally be sent via SMS."),
-        )
-
     if request.method == "POST":
         otp_entered = request.POST.get("otp", "").strip()
 
-        if not expected_otp:
-            messages.error(request, _("OTP expired. Please resend or add number again."))
-        elif otp_entered == expected_otp:
-            from users.services.phone import PhoneService  # avoid cycles
+        from users.services.phone import PhoneService  # avoid cycles
 
-            PhoneService.mark_verified(phone_obj)
-            # Clean session key
-            request.session.pop(session_key, None)
+        status, attempts_left = PhoneService.verify_number(request.user, phone_obj, otp_entered)
 
+        if status == OtpStore.EXPIRED:
+            messages.error(request, _("OTP expired. Please resend or add number again."))
+        elif status == OtpStore.LOCKED:
+            messages.error(request, _("Too many failed attempts. Please add the number again."))
+        elif status == OtpStore.VERIFIED:
             messages.success(request, _("Phone number verified."))
 
             # For HTMX flow we can trigger refresh of partial
@@ -459,7 +408,7 @@ def verify_phone_settings_view(request, pk, profile_type):
 
             return redirect(redirect_url)
         else:
-            messages.error(request, _("Invalid OTP. Please try again."))
+            messages.error(request, _(f"Invalid OTP. Attempts left: {attempts_left}"))
 
     # GET or failed POST renders template
     return render(request, "users/verify_phone.html")
@@ -495,41 +444,19 @@ def deactivate_phone_view(request, pk):
         return HttpResponse("Forbidden", status=403)
 
     # Check if this is the last active number for the profile
-    if profile.phone_numbers.filter(is_active=True).count() <= 1:
+    numbers = list(profile.phone_numbers.filter(is_active=True).order_by("pk"))
+    if len(numbers) <= 1:
         messages.error(request, _("You cannot remove the last phone number."))
     else:
         phone_obj.is_active = False
         phone_obj.save(update_fields=["is_active"])
+        numbers = [num for num in numbers if num.pk != phone_obj.pk]
         messages.success(request, _("Phone number deactivated."))
 
     # return the updated partial template
     if request.headers.get("HX-Request"):
-        if isinstance(profile, BuyerProfile):
-            form = BuyerProfileForm(instance=profile)
-            numbers = profile.phone_numbers.filter(is_active=True)
-            return render(
-                request,
-                "users/buyer_settings_partial.html",
-                {
-                    "profile_exists": True,
-                    "form": form,
-                    "phone_numbers": numbers,
-                    "phone_numbers_count": numbers.count(),
-                },
-            )
-        elif isinstance(profile, SellerProfile):
-            form = SellerProfileForm(instance=profile)
-            numbers = profile.phone_numbers.filter(is_active=True)
-            return render(
-                request,
-                "users/seller_settings_partial.html",
-                {
-                    "profile_exists": True,
-                    "form": form,
-                    "phone_numbers": numbers,
-                    "phone_numbers_count": numbers.count(),
-                },
-            )
+        profile_type = "buyer" if isinstance(profile, BuyerProfile) else "seller"
+        return fragments.render_fragment(request, profile_type, profile=profile, numbers=numbers)
 
     return redirect(reverse("settings"))
 
@@ -574,20 +501,7 @@ def toggle_phone_visibility_view(request, pk):
 
     # Return updated fragment for HTMX
     if request.headers.get("HX-Request"):
-        from users.forms import BuyerProfileForm  # local import
-
-        form = BuyerProfileForm(instance=buyer_profile)
-        numbers = buyer_profile.phone_numbers.filter(is_active=True)
-        return render(
-            request,
-            "users/buyer_settings_partial.html",
-            {
-                "profile_exists": True,
-                "form": form,
-                "phone_numbers": numbers,
-                "phone_numbers_count": numbers.count(),
-            },
-        )
+        return fragments.render_fragment(request, "buyer", profile=buyer_profile)
 
     # Fallback redirect
     return redirect(reverse("settings"))
@@ -0,0 +1,280 @@
+"""Native async counterparts of the login, onboarding and phone-settings views.
+
+Behaviour and templates are the same as in ``users.views``; ``czesci.urls``
+routes to this module when ``USERS_ASYNC_VIEWS`` is enabled (ASGI deployment).
+ORM and cache calls use Django's async API and password hashing runs on the
+pool of ``users.services.passwords``, so a slow hash or query never occupies
+the worker's event loop. Transactional service code still runs in a worker
+thread (see the ``a*`` service methods).
+
+``request.user`` is resolved asynchronously before rendering, which also loads
+the session, so templates and context processors never hit the database.
+"""
+
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth import aauthenticate, alogin, get_user_model
+from django.contrib.auth.decorators import login_required
+from django.db.models import Q
+from django.http import HttpResponse
+from django.shortcuts import redirect
+from django.urls import reverse
+from django.utils.translation import gettext as _
+
+from core.rendering import render_page
+
+from . import fragments
+from .forms import BasicRegistrationForm, LoginForm
+from .models import BuyerProfile, PhoneNumber, SellerProfile
+from users.services.otp import OtpStore
+from users.services.phone import PhoneService
+from users.services.registration import RegistrationService
+
+User = get_user_model()
+
+
+async def _arender(request, template: str, context: dict | None = None, block: str = "content"):
+    """``render_page`` after loading the session and user without blocking."""
+    request.user = await request.auser()
+    return render_page(request, template, context, block=block)
+
+
+def _hx_redirect(request, url: str) -> HttpResponse:
+    if request.headers.get("HX-Request"):
+        response = HttpResponse(status=204)
+        response["HX-Redirect"] = url
+        return response
+    return redirect(url)
+
+
+async def login_view(request):
+    """Render and process the login form accepting phone/email and password."""
+
+    if request.method == "POST":
+        form = LoginForm(request.POST)
+        if form.is_valid():
+            identifier = form.cleaned_data["identifier"].strip()
+            password = form.cleaned_data["password"]
+
+            user = await aauthenticate(request, identifier=identifier, password=password)
+            if user is not None:
+                await alogin(request, user)
+                return _hx_redirect(request, request.GET.get("next") or reverse("home"))
+            messages.error(request, _("Invalid credentials. Please try again."))
+    else:
+        form = LoginForm()
+
+    return await _arender(request, "users/login.html", {"form": form}, block="form")
+
+
+# ---------------- Registration Views -----------------
+
+
+async def register_view(request):
+    """Render and process the basic registration form (Step 1)."""
+
+    initial_role = request.GET.get("type", "buyer")
+    if initial_role not in {"buyer", "seller"}:
+        initial_role = "buyer"
+
+    if request.method == "POST":
+        form = BasicRegistrationForm(request.POST)
+        if form.is_valid():
+            cd = form.cleaned_data
+            user, otp_code = await RegistrationService.aregister_basic(cd, request.META.get("REMOTE_ADDR"))
+
+            await request.session.aupdate(
+                {"pending_user_id": user.id, "pending_phone": cd["phone"], "pending_role": cd["role"]}
+            )
+            messages.info(
+                request,
+                _(f"For demo purposes, your OTP is {otp_code}. It would normally be sent via SMS."),
+            )
+            return _hx_redirect(request, reverse("verify_phone"))
+    else:
+        form = BasicRegistrationForm(initial={"role": initial_role})
+
+    return await _arender(request, "users/register.html", {"form": form, "role": initial_role}, block="form")
+
+
+async def verify_phone_view(request):
+    """Simple OTP verification screen (Step 1b)."""
+
+    user_id = await request.session.aget("pending_user_id")
+    if not user_id:
+        return redirect(reverse("register"))
+
+    if request.method == "POST":
+        otp_entered = request.POST.get("otp", "").strip()
+        phone_number = await request.session.aget("pending_phone")
+
+        status, attempts_left = await RegistrationService.averify_phone(user_id, phone_number, otp_entered)
+
+        if status == OtpStore.LOCKED:
+            messages.error(request, _("Too many failed attempts. Please restart registration."))
+            return redirect(reverse("register"))
+
+        if status == OtpStore.EXPIRED:
+            messages.error(request, _("OTP expired. Please restart registration."))
+            return redirect(reverse("register"))
+
+        if status == OtpStore.VERIFIED:
+            role = await request.session.aget("pending_role")
+            user = await User.objects.aget(id=user_id)
+            await alogin(request, user)
+            await request.session.apop("pending_user_id", None)
+
+            next_url = reverse("register_buyer") if role == "buyer" else reverse("register_seller")
+            return _hx_redirect(request, next_url)
+
+        messages.error(request, _(f"Invalid OTP. Attempts left: {attempts_left}"))
+
+    return await _arender(request, "users/verify_phone.html")
+
+
+# ---------------- Phone Settings Views -----------------
+
+
+@login_required
+async def add_phone_view(request):
+    """Handle phone addition form (POST) – create PhoneNumber and send OTP."""
+
+    if request.method != "POST":
+        return HttpResponse(status=405)
+
+    number_raw = request.POST.get("number", "").strip()
+    profile_type = request.POST.get("profile_type")
+
+    if not number_raw:
+        return HttpResponse("Missing phone number", status=400)
+
+    profile_model = {"buyer": BuyerProfile, "seller": SellerProfile}.get(profile_type)
+    if profile_model is None:
+        return HttpResponse("Invalid profile type", status=400)
+
+    user = await request.auser()
+    profile = await profile_model.objects.filter(user=user).afirst()
+    if not profile:
+        return HttpResponse("Profile not found", status=400)
+
+    try:
+        phone_obj, otp_code = await PhoneService.aadd_number_and_send_otp(profile, number_raw)
+    except Exception as exc:  # pylint: disable=broad-except
+        return HttpResponse(f"Error: {exc}", status=400)
+
+    if settings.DEBUG:
+        messages.info(
+            request,
+            _(f"For demo purposes, your OTP is {otp_code}. It would normally be sent via SMS."),
+        )
+
+    return _hx_redirect(request, reverse("phone_verify", args=[phone_obj.id, profile_type]))
+
+
+@login_required
+async def verify_phone_settings_view(request, pk, profile_type):
+    """Verify phone number (Settings flow). Displays same template & handles OTP POST."""
+
+    user = await request.auser()
+    # OTPs are keyed by (user, number): only the user's own row may be verified.
+    phone_obj = await PhoneNumber.objects.filter(
+        Q(buyer_profile__user=user) | Q(seller_profile__user=user), id=pk, is_active=True
+    ).afirst()
+    if phone_obj is None:
+        return HttpResponse("Phone not found", status=404)
+
+    if request.method == "POST":
+        otp_entered = request.POST.get("otp", "").strip()
+        status, attempts_left = await PhoneService.averify_number(user, phone_obj, otp_entered)
+
+        if status == OtpStore.EXPIRED:
+            messages.error(request, _("OTP expired. Please resend or add number again."))
+        elif status == OtpStore.LOCKED:
+            messages.error(request, _("Too many failed attempts. Please add the number again."))
+        elif status == OtpStore.VERIFIED:
+            messages.success(request, _("Phone number verified."))
+            redirect_url = reverse("settings")
+            if request.headers.get("HX-Request"):
+                redirect_url += "#buyer" if profile_type == "buyer" else "#seller"
+            elif profile_type == "seller":
+                redirect_url += "#seller"
+            return _hx_redirect(request, redirect_url)
+        else:
+            messages.error(request, _(f"Invalid OTP. Attempts left: {attempts_left}"))
+
+    return await _arender(request, "users/verify_phone.html")
+
+
+@login_required
+async def deactivate_phone_view(request, pk):
+    """Soft-deactivate (is_active=False) selected phone number. Supports HTMX."""
+
+    if request.method != "POST":
+        return HttpResponse(status=405)
+
+    phone_obj = (
+        await PhoneNumber.objects.select_related("buyer_profile", "seller_profile")
+        .filter(id=pk, is_active=True)
+        .afirst()
+    )
+    if phone_obj is None:
+        return HttpResponse("Phone not found", status=404)
+
+    user = await request.auser()
+    profile = None
+    if phone_obj.buyer_profile and phone_obj.buyer_profile.user_id == user.pk:
+        profile = phone_obj.buyer_profile
+    elif phone_obj.seller_profile and phone_obj.seller_profile.user_id == user.pk:
+        profile = phone_obj.seller_profile
+
+    if not profile:
+        return HttpResponse("Forbidden", status=403)
+
+    numbers = [number async for number in profile.phone_numbers.filter(is_active=True).order_by("pk")]
+    if len(numbers) <= 1:
+        messages.error(request, _("You cannot remove the last phone number."))
+    else:
+        phone_obj.is_active = False
+        await phone_obj.asave(update_fields=["is_active"])
+        numbers = [num for num in numbers if num.pk != phone_obj.pk]
+        messages.success(request, _("Phone number deactivated."))
+
+    if request.headers.get("HX-Request"):
+        request.user = user
+        profile_type = "buyer" if isinstance(profile, BuyerProfile) else "seller"
+        return fragments.render_fragment(request, profile_type, profile=profile, numbers=numbers)
+
+    return redirect(reverse("settings"))
+
+
+@login_required
+async def toggle_phone_visibility_view(request, pk):
+    """Toggle the ``show_to_sellers`` flag for a buyer-owned phone number."""
+
+    if request.method != "POST":
+        return HttpResponse(status=405)
+
+    phone_obj = await PhoneNumber.objects.select_related("buyer_profile").filter(id=pk, is_active=True).afirst()
+    if phone_obj is None:
+        return HttpResponse("Phone not found", status=404)
+
+    user = await request.auser()
+    buyer_profile = phone_obj.buyer_profile
+    if buyer_profile is None or buyer_profile.user_id != user.pk:
+        return HttpResponse("Forbidden", status=403)
+
+    phone_obj.show_to_sellers = not phone_obj.show_to_sellers
+    await phone_obj.asave(update_fields=["show_to_sellers"])
+
+    messages.success(
+        request,
+        _("Phone number visibility updated: now %(state)s sellers.")
+        % {"state": _("visible to") if phone_obj.show_to_sellers else _("hidden from")},
+    )
+
+    if request.headers.get("HX-Request"):
+        request.user = user
+        numbers = [number async for number in buyer_profile.phone_numbers.filter(is_active=True).order_by("pk")]
+        return fragments.render_fragment(request, "buyer", profile=buyer_profile, numbers=numbers)
+
+    return redirect(reverse("settings"))